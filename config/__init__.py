@@ -8,6 +8,7 @@ This module provides config registration for RoboVLA without modifying openpi so
 from .robot_config import (
     RobotConfig,
     GripperConfig,
+    PruneConfig,
     get_robot_config,
     create_custom_config,
     ROBOT_CONFIGS,
@@ -29,6 +30,7 @@ __all__ = [
     "register_config",
     "RobotConfig",
     "GripperConfig",
+    "PruneConfig",
     "get_robot_config",
     "create_custom_config",
     "ROBOT_CONFIGS",
@@ -0,0 +1,231 @@
+"""
+Compiled column layout for building whole-episode state/action arrays.
+
+RobotConfig.compile() resolves everything that does not change between frames (unit
+conversion, dummy/gripper columns, gripper extraction method) once, so converters can
+turn an episode's columns (from JSON frames or the columnar format) into
+(T, state_dim) / (T, action_dim) arrays with NumPy operations instead of assembling
+every frame with Python lists.
+
+The arithmetic mirrors the per-frame path exactly (including `deg * pi / 180`
+evaluation order and float64 → float32 rounding), so outputs are bit-identical.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+
+def stack_rows(rows: list[list[float]], width: int) -> np.ndarray:
+    """Stack per-frame lists into a (T, width) float64 array.
+
+    Rows are truncated to `width`; short rows are padded with zeros.
+    """
+    try:
+        array = np.array(rows, dtype=np.float64)
+    except ValueError:
+        # Ragged rows
+        array = None
+
+    if array is not None and array.ndim == 2:
+        if array.shape[1] >= width:
+            return array[:, :width]
+        padded = np.zeros((len(rows), width), dtype=np.float64)
+        padded[:, :array.shape[1]] = array
+        return padded
+
+    padded = np.zeros((len(rows), width), dtype=np.float64)
+    for i, row in enumerate(rows):
+        n = min(len(row), width)
+        padded[i, :n] = row[:n]
+    return padded
+
+
+@dataclass
+class EpisodeColumns:
+    """Column view of an episode's low-dimensional data.
+
+    Vector fields are zero-padded to their widest row with the per-frame lengths kept
+    alongside; scalar fields are float64 with NaN where a frame lacks the field. The
+    arrays may be memory-mapped (see pipeline/columnar.py).
+    """
+    joint_angles: np.ndarray  # (T, J) float64
+    joint_counts: np.ndarray  # (T,) joints recorded per frame
+    actions: np.ndarray  # (T, A) float64
+    action_counts: np.ndarray  # (T,) action values recorded per frame
+    fields: dict[str, np.ndarray]  # name -> (T,) float64
+
+    def __len__(self) -> int:
+        return len(self.joint_counts)
+
+    @classmethod
+    def from_frames(cls, frames: list[dict[str, Any]], scalar_fields: list[str] | tuple[str, ...]) -> "EpisodeColumns":
+        """Build columns from JSON frame dicts."""
+        joint_rows = [f.get('joint_angles', []) for f in frames]
+        action_rows = [f.get('actions', []) for f in frames]
+        joint_counts = np.fromiter((len(r) for r in joint_rows), dtype=np.int64, count=len(frames))
+        action_counts = np.fromiter((len(r) for r in action_rows), dtype=np.int64, count=len(frames))
+        return cls(
+            joint_angles=stack_rows(joint_rows, int(joint_counts.max(initial=0))),
+            joint_counts=joint_counts,
+            actions=stack_rows(action_rows, int(action_counts.max(initial=0))),
+            action_counts=action_counts,
+            fields={
+                name: np.array([f.get(name, np.nan) for f in frames], dtype=np.float64)
+                for name in scalar_fields
+            },
+        )
+
+    def field(self, name: str) -> np.ndarray:
+        """Scalar field column, all-NaN if the episode never recorded it."""
+        if name in self.fields:
+            return self.fields[name]
+        return np.full(len(self), np.nan)
+
+    def select(self, index: slice | np.ndarray) -> "EpisodeColumns":
+        """Rows selected by a slice (zero-copy view) or a mask / index array."""
+        return EpisodeColumns(
+            joint_angles=self.joint_angles[index],
+            joint_counts=self.joint_counts[index],
+            actions=self.actions[index],
+            action_counts=self.action_counts[index],
+            fields={name: values[index] for name, values in self.fields.items()},
+        )
+
+
+def _pad_columns(array: np.ndarray, width: int) -> np.ndarray:
+    """Truncate or zero-pad the columns of a 2D array to `width`."""
+    if array.shape[1] >= width:
+        return array[:, :width]
+    padded = np.zeros((len(array), width), dtype=np.float64)
+    padded[:, :array.shape[1]] = array
+    return padded
+
+
+@dataclass(frozen=True)
+class GripperExtractor:
+    """GripperConfig with its extraction method resolved, applied to whole episodes."""
+    field_name: str
+    source_fields: tuple[str, ...]
+    extraction_method: str
+    threshold: float
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        """Frame fields the extractor reads."""
+        return (self.field_name, *self.source_fields)
+
+    def __call__(self, columns: EpisodeColumns) -> np.ndarray:
+        """Gripper value per frame as float64, NaN where no gripper field is present.
+
+        The configured field wins if present; otherwise the first present source field
+        is converted with the extraction method.
+        """
+        values = columns.field(self.field_name).copy()
+        resolved = ~np.isnan(values)
+
+        if self.extraction_method == "max":
+            # max() over all source fields, missing fields count as 0
+            source_max = np.max(
+                np.stack([np.nan_to_num(columns.field(field), nan=0.0) for field in self.source_fields]),
+                axis=0,
+            )
+
+        for source_field in self.source_fields:
+            raw = columns.field(source_field)
+            take = ~np.isnan(raw) & ~resolved
+            if not take.any():
+                continue
+            if self.extraction_method == "threshold":
+                converted = np.where(raw > self.threshold, 1.0, 0.0)
+            elif self.extraction_method == "direct":
+                converted = raw
+            else:
+                converted = source_max
+            values[take] = converted[take]
+            resolved |= take
+
+        return values
+
+
+@dataclass(frozen=True)
+class ColumnLayout:
+    """Column layout of state/action vectors: [joints..., (dummy), (gripper)]."""
+    num_joints: int
+    convert_deg_to_rad: bool
+    use_dummy_dim: bool
+    gripper: GripperExtractor | None
+
+    @property
+    def width(self) -> int:
+        return self.num_joints + int(self.use_dummy_dim) + int(self.gripper is not None)
+
+    @property
+    def gripper_column(self) -> int | None:
+        return self.width - 1 if self.gripper is not None else None
+
+    @property
+    def scalar_fields(self) -> tuple[str, ...]:
+        """Scalar frame fields needed to build states/actions."""
+        return self.gripper.fields if self.gripper is not None else ()
+
+    def columns(self, frames: list[dict[str, Any]]) -> EpisodeColumns:
+        """Column view of JSON frames with the fields this layout reads."""
+        return EpisodeColumns.from_frames(frames, self.scalar_fields)
+
+    def joint_positions(self, columns: EpisodeColumns) -> np.ndarray:
+        """(T, num_joints) raw joint angles; missing joints are zero-filled."""
+        for i in np.flatnonzero(columns.joint_counts < self.num_joints):
+            print(f"  Warning: Frame {i} has {columns.joint_counts[i]} joints, expected {self.num_joints}")
+        return _pad_columns(columns.joint_angles, self.num_joints)
+
+    def gripper_values(self, columns: EpisodeColumns) -> np.ndarray | None:
+        """(T,) gripper values with missing values as 0.0, or None without a gripper."""
+        if self.gripper is None:
+            return None
+        return np.nan_to_num(self.gripper(columns), nan=0.0)
+
+    def assemble(self, joints: np.ndarray, gripper: np.ndarray | None) -> np.ndarray:
+        """Build (T, width) float32 vectors from raw-unit joint columns and gripper values."""
+        out = np.zeros((len(joints), self.width), dtype=np.float64)
+        if self.convert_deg_to_rad:
+            out[:, :self.num_joints] = joints * np.pi / 180.0
+        else:
+            out[:, :self.num_joints] = joints
+        if self.gripper is not None:
+            out[:, self.gripper_column] = gripper
+        return out.astype(np.float32)
+
+    def actions(
+        self,
+        columns: EpisodeColumns,
+        joints: np.ndarray,
+        gripper: np.ndarray | None,
+    ) -> np.ndarray:
+        """(T, width) actions from each frame's `actions`, falling back to frame deltas.
+
+        Frames with an empty `actions` list get the joint (and gripper) delta from the
+        previous frame, or zeros for the first frame.
+        """
+        raw_width = self.num_joints + int(self.gripper is not None)
+        raw = _pad_columns(columns.actions, raw_width)
+
+        has_actions = columns.action_counts > 0
+        if not has_actions.all():
+            deltas = np.zeros((len(columns), raw_width), dtype=np.float64)
+            deltas[1:, :self.num_joints] = np.diff(joints, axis=0)
+            if self.gripper is not None:
+                deltas[1:, self.num_joints] = np.diff(gripper)
+            raw = np.where(has_actions[:, None], raw, deltas)
+
+        return self.assemble(
+            raw[:, :self.num_joints],
+            raw[:, self.num_joints] if self.gripper is not None else None,
+        )
+
+    def episode_arrays(self, columns: EpisodeColumns) -> tuple[np.ndarray, np.ndarray]:
+        """(states, actions) float32 arrays for a whole episode."""
+        joints = self.joint_positions(columns)
+        gripper = self.gripper_values(columns)
+        return self.assemble(joints, gripper), self.actions(columns, joints, gripper)
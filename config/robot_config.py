@@ -6,9 +6,12 @@ Supports different DOF, gripper formats, and action spaces.
 """
 
 from dataclasses import dataclass
-from typing import Literal, Optional
+from typing import TYPE_CHECKING, Literal, Optional
 from pathlib import Path
 
+if TYPE_CHECKING:
+    from .layout import ColumnLayout, GripperExtractor
+
 
 @dataclass
 class GripperConfig:
@@ -34,6 +37,40 @@ class GripperConfig:
     def __post_init__(self):
         if self.source_fields is None:
             self.source_fields = [self.field_name]
+    
+    def compile(self) -> "GripperExtractor":
+        """Resolve the extraction method once into a whole-episode extractor."""
+        # Lazy import to keep config importable without numpy
+        from .layout import GripperExtractor
+        
+        if self.extraction_method not in ("direct", "threshold", "max"):
+            raise ValueError(f"Unknown gripper extraction method: {self.extraction_method}")
+        return GripperExtractor(
+            field_name=self.field_name,
+            source_fields=tuple(self.source_fields),
+            extraction_method=self.extraction_method,
+            threshold=self.threshold,
+        )
+
+
+@dataclass
+class PruneConfig:
+    """Idle/duplicate frame pruning (see pipeline/pruning.py)."""
+    # Max |joint change| from the start of a still stretch, in joint_units
+    joint_threshold: float = 0.05
+    
+    # Max Hamming distance (of 64 bits) between perceptual image hashes
+    hash_threshold: int = 4
+    
+    # Still stretches shorter than this are natural pauses and kept
+    min_idle_frames: int = 10
+    
+    # "drop": keep only the last frame of a stretch; "subsample": keep every keep_every-th
+    mode: Literal["drop", "subsample"] = "drop"
+    keep_every: int = 5
+    
+    # Frames kept on each side of a gripper transition
+    transition_margin: int = 2
 
 
 @dataclass
@@ -59,6 +96,9 @@ class RobotConfig:
     # Unit conversions
     joint_units: Literal["deg", "rad"] = "deg"  # Input joint units
     joint_output_units: Literal["deg", "rad"] = "rad"  # Output joint units
+
+    # Per-joint (min, max) in joint_units, checked by validation (None = ±360 deg / ±2π rad)
+    joint_limits: Optional[list[tuple[float, float]]] = None
     
     # Position units (for TCP pose, if used)
     position_units: Literal["mm", "m"] = "mm"
@@ -70,10 +110,14 @@ class RobotConfig:
     
     # Filter settings
     filter_robot_mode: Optional[int] = None  # Filter by robot_mode (None = no filter)
+    prune: Optional[PruneConfig] = None  # Idle/duplicate frame pruning (None = keep all frames)
+    resample_fps: Optional[int] = None  # Resample to this rate using frame timestamps (see pipeline/resample.py)
     
     # Dataset settings
     default_fps: int = 10
     image_size: tuple[int, int] = (224, 224)
+    image_resize_filter: Literal["nearest", "box", "bilinear", "hamming", "bicubic", "lanczos"] = "lanczos"
+    image_fast_decode: bool = False  # JPEG DCT-domain downscale before resize (see pipeline/image_io.py)
     
     def __post_init__(self):
         """Calculate dimensions if not specified."""
@@ -92,6 +136,17 @@ class RobotConfig:
                 self.action_dim += 1
             if self.gripper is not None:
                 self.action_dim += 1
+    
+    def compile(self) -> "ColumnLayout":
+        """Compile into the state/action column layout used to build episode arrays."""
+        from .layout import ColumnLayout
+        
+        return ColumnLayout(
+            num_joints=self.num_joints,
+            convert_deg_to_rad=self.joint_units == "deg" and self.joint_output_units == "rad",
+            use_dummy_dim=self.use_dummy_dim,
+            gripper=self.gripper.compile() if self.gripper is not None else None,
+        )
 
 
 # Predefined robot configurations
@@ -20,130 +20,158 @@ Dobot-Arm-DataCollect 저장소에서 생성된 VLA 데이터셋을 openpi 학
             robot_data.csv
             dataset.npy
             metadata.txt
+
+    robot_data.csv / dataset.npy는 pipeline/dobot_data.py의 컬럼 단위 로더로 에피소드 전체를
+    한 번에 배열로 읽습니다. dataset.npy는 migrate_dobot_npy.py로 구조화 배열(structured dtype)로
+    변환해 두면 allow_pickle 없이 메모리 맵으로 로드됩니다.
 """
 
+import dataclasses
 import json
 import pathlib
-from typing import Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import sys
 
 import numpy as np
-from PIL import Image
 import tyro
 from lerobot.common.datasets.lerobot_dataset import LeRobotDataset
 
+# RoboVLA 루트를 path에 추가 (pipeline 모듈 사용)
+robo_vla_root = pathlib.Path(__file__).parent.parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from pipeline.dobot_data import DobotEpisode, load_dobot_csv, load_dobot_npy
+from pipeline.frame_cache import FrameCache
+from pipeline.image_io import ImageIndex, decode_image
+from pipeline.pools import PoolConfig, available_cpus, measure_frame_costs, ordered_map, plan_pools
+from pipeline.manifest import (
+    SourceFingerprintCache,
+    config_fingerprint,
+    default_fingerprint_cache_path,
+    default_manifest_path,
+    lerobot_home,
+    prepare_incremental_run,
+    source_fingerprint,
+)
+from pipeline.profiling import Profiler, profile_episode, profile_stage
+from pipeline.progress import ProgressWriter, default_progress_path
+from pipeline.resample import resample_grid, source_fps
+
 # E6 로봇은 7DOF (6개 관절 + 1개 gripper)
 # Dobot-Arm-DataCollect는 gripper_tooldo1, gripper_tooldo2를 사용
 E6_ACTION_DIM = 7
 E6_STATE_DIM = 7
 
 
-def load_dobot_csv(csv_path: pathlib.Path) -> list[dict[str, Any]]:
-    """Dobot-Arm-DataCollect의 CSV 파일을 로드합니다.
+def load_image(
+    image_path: pathlib.Path,
+    images_dir: pathlib.Path,
+    resize_filter: str = "lanczos",
+    fast_decode: bool = False,
+    cache: FrameCache | None = None,
+    index: ImageIndex | None = None,
+    profiler: Profiler | None = None,
+) -> np.ndarray:
+    """이미지를 로드하고 224x224로 리사이즈합니다.
     
-    CSV 형식:
-        frame_id,timestamp,image_path,j1,j2,j3,j4,j5,j6,x,y,z,rx,ry,rz,
-        gripper_tooldo1,gripper_tooldo2,robot_mode
+    fast_decode=True면 JPEG 디코더가 DCT 단계에서 먼저 축소한 뒤 리사이즈합니다.
+    cache가 주어지면 리사이즈된 프레임을 캐시에서 먼저 찾습니다.
+    index가 주어지면 파일마다 stat하지 않고 디렉토리 목록으로 존재 여부를 판단합니다
+    (누락 이미지는 호출 측에서 에피소드 단위로 미리 보고).
+    profiler가 주어지면 디코딩/리사이즈 단계 시간을 기록합니다.
     """
-    import csv
-    
-    data = []
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # 관절 각도 (j1-j6)
-            joints = [float(row[f'j{i}']) for i in range(1, 7)]
-            
-            # Gripper: gripper_tooldo2는 석션 그리퍼로 0,1로만 작동
-            # gripper_tooldo2를 그대로 사용 (이미 0 또는 1)
-            gripper2 = float(row.get('gripper_tooldo2', 0))
-            gripper = 1.0 if gripper2 > 0.5 else 0.0
-            
-            # Action: 관절 각도 + gripper (7DOF)
-            action = np.array(joints + [gripper], dtype=np.float32)
-            
-            # State: 관절 각도 + gripper (7DOF)
-            state = np.array(joints + [gripper], dtype=np.float32)
-            
-            data.append({
-                'action': action,
-                'state': state,
-                'image_path': row['image_path'],
-                'timestamp': float(row['timestamp']),
-                'frame_id': int(row['frame_id']),
-            })
-    
-    return data
-
-
-def load_dobot_npy(npy_path: pathlib.Path) -> list[dict[str, Any]]:
-    """Dobot-Arm-DataCollect의 NPY 파일을 로드합니다.
-    
-    NPY 형식:
-        각 항목은 dict:
-        {
-            'frame_id': int,
-            'timestamp': float,
-            'image_path': str,
-            'joint_angles': [j1, j2, j3, j4, j5, j6],
-            'tcp_pose': [x, y, z, rx, ry, rz],
-            'gripper_tooldo1': int,
-            'gripper_tooldo2': int,
-            'robot_mode': int
-        }
-    """
-    data = np.load(npy_path, allow_pickle=True)
-    
-    episodes = []
-    for item in data:
-        joints = item['joint_angles'][:6]  # 6개 관절
-        
-        # Gripper 처리: gripper_tooldo2는 석션 그리퍼로 0,1로만 작동
-        gripper2 = float(item.get('gripper_tooldo2', 0))
-        gripper = 1.0 if gripper2 > 0.5 else 0.0
-        
-        # Action과 State
-        action = np.array(list(joints) + [gripper], dtype=np.float32)
-        state = np.array(list(joints) + [gripper], dtype=np.float32)
-        
-        episodes.append({
-            'action': action,
-            'state': state,
-            'image_path': item['image_path'],
-            'timestamp': float(item['timestamp']),
-            'frame_id': int(item['frame_id']),
-        })
-    
-    return episodes
-
-
-def load_image(image_path: pathlib.Path, images_dir: pathlib.Path) -> np.ndarray:
-    """이미지를 로드하고 224x224로 리사이즈합니다."""
     full_path = images_dir / image_path
     
-    if not full_path.exists():
+    if index is not None and not index.exists(full_path):
+        return np.random.randint(0, 255, (224, 224, 3), dtype=np.uint8)
+    if index is None and not full_path.exists():
         # 이미지가 없으면 더미 이미지 생성
         print(f"  Warning: Image not found: {full_path}, using dummy image")
         return np.random.randint(0, 255, (224, 224, 3), dtype=np.uint8)
     
     try:
-        img = Image.open(full_path)
-        # RGB로 변환
-        if img.mode != 'RGB':
-            img = img.convert('RGB')
-        # 224x224로 리사이즈
-        img = img.resize((224, 224), Image.Resampling.LANCZOS)
-        return np.array(img, dtype=np.uint8)
+        if cache is not None:
+            return cache.get_or_decode(full_path, (224, 224), resize_filter, fast_decode, profiler)
+        return decode_image(full_path, (224, 224), resize_filter, fast_decode, profiler)
     except Exception as e:
         print(f"  Error loading image {full_path}: {e}")
         return np.random.randint(0, 255, (224, 224, 3), dtype=np.uint8)
 
 
+def sample_image_paths(episode_dirs: list[pathlib.Path], count: int = 16) -> list[pathlib.Path]:
+    """풀 크기 측정용 샘플 프레임 (이미지가 있는 첫 에피소드에서 고르게 count개)"""
+    for episode_dir in episode_dirs:
+        images_dir = episode_dir / "images"
+        names = sorted(n for n in ImageIndex().listing(images_dir) if n.lower().endswith((".jpg", ".jpeg", ".png")))
+        if names:
+            return [images_dir / n for n in names[::max(len(names) // count, 1)][:count]]
+    return []
+
+
+def plan_conversion_pools(
+    episode_dirs: list[pathlib.Path],
+    resize_filter: str,
+    fast_decode: bool,
+    **overrides: int | None,
+) -> PoolConfig:
+    """사용 가능한 코어 수와 샘플 프레임의 디코딩/PNG 저장 시간으로 풀 크기 결정
+
+    overrides 중 None이 아닌 값(decode_threads, writer_processes, ...)은 그대로 사용합니다.
+    """
+    cpus = available_cpus()
+    costs = measure_frame_costs(
+        sample_image_paths(episode_dirs),
+        lambda path: decode_image(path, (224, 224), resize_filter, fast_decode),
+    )
+    pools = plan_pools(cpus, costs)
+    pools = dataclasses.replace(pools, **{k: v for k, v in overrides.items() if v is not None})
+    measured = (
+        f"decode {costs.decode_s * 1000:.1f} ms/frame, PNG write {costs.write_s * 1000:.1f} ms/frame "
+        f"({costs.samples} samples)" if costs is not None else "no sample frames"
+    )
+    print(f"Pools: {pools.describe()} ({cpus} CPUs; {measured})")
+    return pools
+
+
+def wait_for_image_writer(dataset: LeRobotDataset, max_backlog: int) -> float:
+    """이미지 라이터 큐가 max_backlog 프레임 미만이 될 때까지 대기하고 대기 시간(초)을 반환
+
+    LeRobot 이미지 라이터의 큐 크기를 알 수 없으면 (macOS 멀티프로세스 큐 등) 기다리지 않습니다.
+    """
+    queue = getattr(getattr(dataset, "image_writer", None), "queue", None)
+    if queue is None:
+        return 0.0
+    start = time.perf_counter()
+    try:
+        while queue.qsize() >= max_backlog:
+            time.sleep(0.002)
+    except NotImplementedError:
+        pass
+    return time.perf_counter() - start
+
+
 def main(
     data_dir: str,
     output_repo_id: str = "your_hf_username/dobot_e6_dataset",
     fps: int = 10,
     task_description: str = "pick and place",
     use_npy: bool = True,  # True면 dataset.npy 사용, False면 robot_data.csv 사용
+    resize_filter: str = "lanczos",
+    fast_decode: bool = False,
+    cache_dir: str | None = None,
+    manifest_path: str | None = None,
+    rebuild: bool = False,
+    video: bool = False,
+    resample: bool = False,
+    profile: bool = False,
+    profile_report: str | None = None,
+    progress_file: str | None = None,
+    decode_threads: int | None = None,
+    writer_processes: int | None = None,
+    writer_threads: int | None = None,
+    queue_frames: int | None = None,
 ):
     """
     Dobot-Arm-DataCollect 형식의 데이터를 LeRobot 형식으로 변환합니다.
@@ -154,37 +182,37 @@ def main(
         fps: 데이터셋의 프레임레이트
         task_description: 작업 설명 (프롬프트로 사용)
         use_npy: True면 dataset.npy 사용, False면 robot_data.csv 사용
+        resize_filter: 리사이즈 필터 (nearest, box, bilinear, hamming, bicubic, lanczos)
+        fast_decode: True면 JPEG DCT 단계 축소 후 리사이즈 (디코딩 속도 향상)
+        cache_dir: 리사이즈된 프레임 캐시 디렉토리 (재실행 시 디코딩 생략)
+        manifest_path: 에피소드 매니페스트 경로 (기본값: <lerobot_home>/<output_repo_id>.manifest.json)
+        rebuild: True면 기존 데이터셋과 매니페스트를 지우고 처음부터 변환
+        video: True면 프레임별 이미지 대신 에피소드별 압축 비디오로 저장 (디스크 사용량 감소,
+            학습/평가 시 LeRobotDataset이 타임스탬프로 임의 접근 디코딩)
+        resample: True면 프레임 timestamp를 이용해 fps보다 빠르게 기록된 에피소드를 fps로
+            리샘플링 (관절 각도는 선형 보간, 그리퍼/이미지는 가장 가까운 프레임)
+        profile: True면 단계별(데이터 로드, 이미지 디코딩/리사이즈, add_frame, save_episode 등)
+            시간·호출 수·바이트와 에피소드별 최대 RSS를 기록
+        profile_report: 프로파일 리포트(JSON) 경로. Chrome trace는 같은 위치에 .trace.json으로 저장
+            (기본값: <lerobot_home>/<output_repo_id>.profile.json)
+        progress_file: 진행 상황 로그 경로 (JSON lines: 단계, 완료 에피소드/프레임 수, 처리 속도, ETA).
+            check_lerobot_conversion_status.py가 읽음 (기본값: <lerobot_home>/<output_repo_id>.progress.jsonl)
+        decode_threads: 이미지 디코딩 스레드 수 (기본값: 사용 가능한 코어 수와 측정된 디코딩/저장 시간으로 결정)
+        writer_processes: LeRobot 이미지 라이터 프로세스 수 (0이면 변환 프로세스 안의 스레드만 사용, 기본값: 자동)
+        writer_threads: 이미지 라이터 프로세스당 스레드 수 (기본값: 자동)
+        queue_frames: 디코딩 후 저장을 기다리는 최대 프레임 수. 절반은 디코딩 결과, 절반은 이미지 라이터
+            큐에 쓰이며, 저장이 밀리면 디코딩도 멈춤 (기본값: 자동, 최대 512MB)
     """
     data_path = pathlib.Path(data_dir)
     
     if not data_path.exists():
         raise ValueError(f"Data directory not found: {data_dir}")
     
-    # LeRobot 데이터셋 생성
-    dataset = LeRobotDataset.create(
-        repo_id=output_repo_id,
-        robot_type="dobot_e6",
-        fps=fps,
-        features={
-            "image": {
-                "dtype": "image",
-                "shape": (224, 224, 3),
-                "names": ["height", "width", "channel"],
-            },
-            "state": {
-                "dtype": "float32",
-                "shape": (E6_STATE_DIM,),
-                "names": ["state"],
-            },
-            "actions": {
-                "dtype": "float32",
-                "shape": (E6_ACTION_DIM,),
-                "names": ["actions"],
-            },
-        },
-        image_writer_threads=10,
-        image_writer_processes=5,
-    )
+    # 단계별 프로파일링 (선택)
+    profiler = Profiler() if profile else None
+    
+    # 프레임 캐시 (선택)
+    cache = FrameCache(cache_dir) if cache_dir is not None else None
     
     # vla_auto_* 디렉토리 찾기
     episode_dirs = sorted([d for d in data_path.iterdir() if d.is_dir() and d.name.startswith("vla_auto_")])
@@ -194,61 +222,213 @@ def main(
     
     print(f"Found {len(episode_dirs)} episodes")
     
-    # 각 에피소드 처리
-    for episode_dir in episode_dirs:
-        print(f"\nProcessing {episode_dir.name}...")
+    # 매니페스트: 이미 변환된 에피소드는 건너뜀 (중단 후 재개 / 새 에피소드만 추가)
+    # 크기/수정 시각이 바뀐 파일만 다시 읽음
+    manifest_path = pathlib.Path(manifest_path) if manifest_path else default_manifest_path(output_repo_id)
+    fingerprint_cache = SourceFingerprintCache(default_fingerprint_cache_path(manifest_path))
+    fingerprints = {
+        d.name: source_fingerprint(d / "dataset.npy", d / "robot_data.csv", d / "images", cache=fingerprint_cache)
+        for d in episode_dirs
+    }
+    fingerprint_cache.save()
+    dataset_root = lerobot_home() / output_repo_id
+    options = {
+        "fps": fps,
+        "task_description": task_description,
+        "use_npy": use_npy,
+        "resize_filter": resize_filter,
+        "fast_decode": fast_decode,
+    }
+    if video:
+        options["video"] = True
+    if resample:
+        options["resample"] = True
+    manifest, pending = prepare_incremental_run(
+        manifest_path=manifest_path,
+        dataset_root=dataset_root,
+        config_fp=config_fingerprint(options),
+        sources=list(fingerprints.items()),
+        rebuild=rebuild,
+    )
+    pending = set(pending)
+    episode_dirs = [d for d in episode_dirs if d.name in pending]
+    
+    # 디코딩/이미지 라이터 풀 크기
+    pools = plan_conversion_pools(
+        episode_dirs,
+        resize_filter,
+        fast_decode,
+        decode_threads=decode_threads,
+        writer_processes=writer_processes,
+        writer_threads=writer_threads,
+        queue_frames=queue_frames,
+    )
+    
+    # LeRobot 데이터셋 생성 (이어서 변환하는 경우 기존 데이터셋 열기)
+    with profile_stage(profiler, "dataset_open"):
+        if manifest.num_written_episodes > 0 and dataset_root.exists():
+            dataset = LeRobotDataset(output_repo_id)
+            if dataset.num_episodes != manifest.num_written_episodes:
+                raise ValueError(
+                    f"Dataset has {dataset.num_episodes} episodes but the manifest records "
+                    f"{manifest.num_written_episodes}; re-run with --rebuild"
+                )
+            dataset.start_image_writer(num_processes=pools.writer_processes, num_threads=pools.writer_threads)
+        else:
+            dataset = LeRobotDataset.create(
+                repo_id=output_repo_id,
+                robot_type="dobot_e6",
+                fps=fps,
+                features={
+                    "image": {
+                        "dtype": "video" if video else "image",
+                        "shape": (224, 224, 3),
+                        "names": ["height", "width", "channel"],
+                    },
+                    "state": {
+                        "dtype": "float32",
+                        "shape": (E6_STATE_DIM,),
+                        "names": ["state"],
+                    },
+                    "actions": {
+                        "dtype": "float32",
+                        "shape": (E6_ACTION_DIM,),
+                        "names": ["actions"],
+                    },
+                },
+                use_videos=video,
+                image_writer_threads=pools.writer_threads,
+                image_writer_processes=pools.writer_processes,
+            )
+    
+    progress = ProgressWriter(
+        pathlib.Path(progress_file) if progress_file else default_progress_path(output_repo_id),
+        job="conversion",
+        episodes_total=len(episode_dirs),
+        repo_id=output_repo_id,
+    )
+    writer_wait = 0.0
+    decoder = ThreadPoolExecutor(max_workers=pools.decode_threads)
+    with progress, decoder:
+        progress.set_phase("converting")
+        convert_start = time.perf_counter()
         
-        images_dir = episode_dir / "images"
+        # 각 에피소드 처리
+        for episode_dir in episode_dirs:
+            with profile_episode(profiler, episode_dir.name, "convert") as record:
+                print(f"\nProcessing {episode_dir.name}...")
         
-        # 데이터 로드
-        if use_npy:
-            npy_path = episode_dir / "dataset.npy"
-            if npy_path.exists():
-                try:
-                    episode_data = load_dobot_npy(npy_path)
-                    print(f"  Loaded {len(episode_data)} frames from dataset.npy")
-                except Exception as e:
-                    print(f"  Error loading NPY: {e}, trying CSV...")
-                    use_npy = False
+                images_dir = episode_dir / "images"
         
-        if not use_npy:
-            csv_path = episode_dir / "robot_data.csv"
-            if csv_path.exists():
-                try:
-                    episode_data = load_dobot_csv(csv_path)
-                    print(f"  Loaded {len(episode_data)} frames from robot_data.csv")
-                except Exception as e:
-                    print(f"  Error loading CSV: {e}, skipping episode")
+                # 데이터 로드 (에피소드 단위 배열)
+                episode_data: DobotEpisode | None = None
+                if use_npy:
+                    npy_path = episode_dir / "dataset.npy"
+                    if npy_path.exists():
+                        try:
+                            with profile_stage(profiler, "load_npy") as span:
+                                episode_data = load_dobot_npy(npy_path)
+                                span.bytes = npy_path.stat().st_size
+                            print(f"  Loaded {len(episode_data)} frames from dataset.npy")
+                        except Exception as e:
+                            print(f"  Error loading NPY: {e}, trying CSV...")
+                            use_npy = False
+        
+                if episode_data is None:
+                    csv_path = episode_dir / "robot_data.csv"
+                    if csv_path.exists():
+                        try:
+                            with profile_stage(profiler, "load_csv") as span:
+                                episode_data = load_dobot_csv(csv_path)
+                                span.bytes = csv_path.stat().st_size
+                            print(f"  Loaded {len(episode_data)} frames from robot_data.csv")
+                        except Exception as e:
+                            print(f"  Error loading CSV: {e}, skipping episode")
+                            progress.update(episodes=1)
+                            continue
+                    else:
+                        print(f"  No robot_data.csv found, skipping episode")
+                        progress.update(episodes=1)
+                        continue
+        
+                if len(episode_data) == 0:
+                    print(f"  Skipping empty episode")
+                    manifest.record(episode_dir.name, fingerprints[episode_dir.name], 0)
+                    progress.update(episodes=1)
                     continue
-            else:
-                print(f"  No robot_data.csv found, skipping episode")
-                continue
         
-        if len(episode_data) == 0:
-            print(f"  Skipping empty episode")
-            continue
+                # 리샘플링: timestamp 기준으로 fps 격자에 맞춤
+                if resample:
+                    with profile_stage(profiler, "resample"):
+                        grid = resample_grid(np.asarray(episode_data.timestamp, dtype=np.float64), fps)
+                        if grid is not None:
+                            print(f"  Resampled: {len(episode_data)} → {len(grid)} frames "
+                                  f"({source_fps(np.asarray(episode_data.timestamp)):.1f} → {fps} Hz)")
+                            episode_data = episode_data.resampled(grid)
         
-        # 각 프레임 추가
-        for frame_data in episode_data:
-            # 이미지 로드
-            image = load_image(frame_data['image_path'], images_dir)
-            
-            # LeRobot 데이터셋에 추가
-            dataset.add_frame(
-                {
-                    "image": image,
-                    "state": frame_data["state"],
-                    "actions": frame_data["action"],
-                    "task": task_description,
-                }
-            )
+                with profile_stage(profiler, "build_arrays") as span:
+                    states = episode_data.states
+                    actions = episode_data.actions
+                    span.bytes = states.nbytes + actions.nbytes
+        
+                # 누락 이미지: images/ 디렉토리를 한 번만 읽어 디코딩 전에 확인
+                with profile_stage(profiler, "check_images"):
+                    index = ImageIndex()
+                    missing = [str(p) for p in episode_data.image_path if not index.exists(images_dir / str(p))]
+                if missing:
+                    print(f"  Missing images: {len(missing)}/{len(episode_data)} ({', '.join(missing[:3])}"
+                          f"{', ...' if len(missing) > 3 else ''}), using dummy images")
+        
+                # 각 프레임 추가: 디코딩 스레드 풀이 순서대로 최대 decode_ahead 프레임까지 미리 디코딩
+                images = ordered_map(
+                    decoder,
+                    lambda path: load_image(str(path), images_dir, resize_filter, fast_decode, cache, index, profiler),
+                    episode_data.image_path,
+                    pools.decode_ahead,
+                )
+                for i, image in enumerate(images):
+                    # 이미지 라이터가 밀리면 대기 (디코딩도 decode_ahead에서 멈춤)
+                    writer_wait += wait_for_image_writer(dataset, pools.writer_backlog)
+        
+                    # LeRobot 데이터셋에 추가
+                    with profile_stage(profiler, "dataset_add_frame") as span:
+                        dataset.add_frame(
+                            {
+                                "image": image,
+                                "state": states[i],
+                                "actions": actions[i],
+                                "task": task_description,
+                            }
+                        )
+                        span.bytes = image.nbytes + states[i].nbytes + actions[i].nbytes
+                
+                # 캐시 사용 시각을 에피소드마다 한 번에 기록
+                if cache is not None:
+                    cache.flush()
         
-        # 에피소드 저장
-        dataset.save_episode()
-        print(f"  Saved episode with {len(episode_data)} frames")
+                # 에피소드 저장 (저장 중 중단되면 다음 실행에서 매니페스트에 기록)
+                manifest.begin(episode_dir.name, fingerprints[episode_dir.name], len(episode_data))
+                with profile_stage(profiler, "dataset_save_episode"):
+                    dataset.save_episode()
+                record["frames"] = len(episode_data)
+                manifest.record(episode_dir.name, fingerprints[episode_dir.name], len(episode_data))
+                progress.update(episodes=1, frames=len(episode_data))
+                print(f"  Saved episode with {len(episode_data)} frames")
+        progress.finish()
+        convert_seconds = time.perf_counter() - convert_start
     
     print(f"\n✅ Dataset conversion complete!")
+    print(f"Throughput: {progress.frames_done / max(convert_seconds, 1e-9):.1f} frames/s "
+          f"({progress.frames_done} frames in {convert_seconds:.1f}s; {pools.describe()}; "
+          f"waited {writer_wait:.1f}s for the image writer)")
     print(f"Dataset saved to: {dataset.repo_path}")
+    if profiler is not None:
+        profile_path = (
+            pathlib.Path(profile_report) if profile_report else lerobot_home() / f"{output_repo_id}.profile.json"
+        )
+        profiler.write(profile_path, profile_path.with_suffix(".trace.json"))
+        profiler.print_summary()
+        print(f"Profile: {profile_path} (trace: {profile_path.with_suffix('.trace.json')})")
     print(f"\nTo push to HuggingFace Hub, run:")
     print(f"  from lerobot.common.datasets.lerobot_dataset import LeRobotDataset")
     print(f"  dataset = LeRobotDataset('{output_repo_id}')")
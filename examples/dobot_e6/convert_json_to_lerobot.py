@@ -20,15 +20,24 @@ openpi 학습용 LeRobot 데이터셋으로 변환합니다.
         --filter_mode 7
 """
 
-import json
 import pathlib
 from typing import Any
 
+import sys
+
 import numpy as np
-from PIL import Image
 import tyro
 from lerobot.common.datasets.lerobot_dataset import LeRobotDataset
 
+# RoboVLA 루트를 path에 추가 (pipeline 모듈 사용)
+robo_vla_root = pathlib.Path(__file__).parent.parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from pipeline.columnar import ColumnarEpisode, EPISODE_SUFFIX, is_columnar_episode
+from pipeline.frame_cache import FrameCache
+from pipeline.image_io import ImageIndex, decode_image
+from pipeline.json_stream import load_json_without_images
+
 # 단위 변환 상수
 DEG_TO_RAD = np.pi / 180.0
 MM_TO_M = 0.001
@@ -48,18 +57,30 @@ def mm_to_m(mm: float) -> float:
     return mm * MM_TO_M
 
 
-def load_image(image_path: pathlib.Path) -> np.ndarray:
-    """이미지를 로드하고 224x224로 리사이즈합니다."""
-    if not image_path.exists():
+def load_image(
+    image_path: pathlib.Path,
+    resize_filter: str = "lanczos",
+    fast_decode: bool = False,
+    cache: FrameCache | None = None,
+    index: ImageIndex | None = None,
+) -> np.ndarray:
+    """이미지를 로드하고 224x224로 리사이즈합니다.
+    
+    fast_decode=True면 JPEG 디코더가 DCT 단계에서 먼저 축소한 뒤 리사이즈합니다.
+    cache가 주어지면 리사이즈된 프레임을 캐시에서 먼저 찾습니다.
+    index가 주어지면 파일마다 stat하지 않고 디렉토리 목록으로 존재 여부를 판단합니다
+    (누락 이미지는 호출 측에서 에피소드 단위로 미리 보고).
+    """
+    if index is not None and not index.exists(image_path):
+        return np.random.randint(0, 255, (224, 224, 3), dtype=np.uint8)
+    if index is None and not image_path.exists():
         print(f"  Warning: Image not found: {image_path}, using dummy image")
         return np.random.randint(0, 255, (224, 224, 3), dtype=np.uint8)
     
     try:
-        img = Image.open(image_path)
-        if img.mode != 'RGB':
-            img = img.convert('RGB')
-        img = img.resize((224, 224), Image.Resampling.LANCZOS)
-        return np.array(img, dtype=np.uint8)
+        if cache is not None:
+            return cache.get_or_decode(image_path, (224, 224), resize_filter, fast_decode)
+        return decode_image(image_path, (224, 224), resize_filter, fast_decode)
     except Exception as e:
         print(f"  Error loading image {image_path}: {e}")
         return np.random.randint(0, 255, (224, 224, 3), dtype=np.uint8)
@@ -106,8 +127,8 @@ def load_json_episode(
     Returns:
         (frames, prompt) 튜플
     """
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # 프레임 단위로 파싱하며 임베딩된 이미지 payload는 버림 (이미지는 images_base_dir에서 읽음)
+    data = load_json_without_images(json_path)
     
     episode_name = data['episode_name']
     prompt = data.get('prompt', 'pick and place')
@@ -130,6 +151,45 @@ def load_json_episode(
     return frames, prompt
 
 
+def load_columnar_episode(
+    episode_dir: pathlib.Path,
+    images_base_dir: pathlib.Path,
+    filter_mode: int | None = 7,
+) -> tuple[list[dict[str, Any]], str]:
+    """
+    컬럼 형식(pipeline/columnar.py) 에피소드를 로드합니다.
+    
+    load_json_episode와 같은 frames 구조를 반환하지만, 각 값은 메모리 맵 배열의
+    행 슬라이스(복사 없음)입니다.
+    """
+    episode = ColumnarEpisode.load(episode_dir)
+    prompt = episode.prompt or 'pick and place'
+    
+    # robot_mode 필터링
+    if filter_mode is not None:
+        original_count = len(episode)
+        episode = episode.select(episode.columns.field('robot_mode') == filter_mode)
+        print(f"  Filtered: {original_count} → {len(episode)} frames (mode=={filter_mode})")
+    
+    columns = episode.columns
+    gripper = columns.field('gripper')
+    # gripper가 없는 프레임은 NaN으로 저장됨: JSON 경로(frame['gripper'])처럼 KeyError로 실패
+    missing = np.flatnonzero(np.isnan(gripper))
+    if len(missing):
+        raise KeyError(f"'gripper' missing in {len(missing)}/{len(episode)} frames (first row {missing[0]})")
+    images_dir = images_base_dir / episode.episode_name / "images"
+    frames = [
+        {
+            'joint_angles': columns.joint_angles[i, :columns.joint_counts[i]],
+            'gripper': float(gripper[i]),
+            'actions': columns.actions[i, :columns.action_counts[i]],
+            '_image_path': images_dir / name,
+        }
+        for i, name in enumerate(episode.image_file_names())
+    ]
+    return frames, prompt
+
+
 def main(
     json_dir: str,
     images_base_dir: str,
@@ -137,17 +197,25 @@ def main(
     fps: int = 10,
     filter_mode: int | None = 7,
     robot_type: str = "dobot_e6",
+    resize_filter: str = "lanczos",
+    fast_decode: bool = False,
+    cache_dir: str | None = None,
+    video: bool = False,
 ):
     """
     JSON 파일들을 DROID 스타일 LeRobot 형식으로 변환합니다.
     
     Args:
-        json_dir: JSON 파일들이 있는 디렉토리
+        json_dir: JSON 파일들이 있는 디렉토리 (컬럼 형식 <n>.episode 디렉토리가 있으면 우선 사용)
         images_base_dir: 이미지가 있는 base 디렉토리 (vla_dataset)
         output_repo_id: 출력 데이터셋의 HuggingFace repo ID
         fps: 데이터셋의 프레임레이트
         filter_mode: robot_mode 필터 (None이면 필터링 안 함, 기본값: 7)
         robot_type: 로봇 타입 (기본값: dobot_e6)
+        resize_filter: 리사이즈 필터 (nearest, box, bilinear, hamming, bicubic, lanczos)
+        fast_decode: True면 JPEG DCT 단계 축소 후 리사이즈 (디코딩 속도 향상)
+        cache_dir: 리사이즈된 프레임 캐시 디렉토리 (재실행 시 디코딩 생략)
+        video: True면 프레임별 이미지 대신 에피소드별 압축 비디오로 저장
     """
     json_path = pathlib.Path(json_dir)
     images_base = pathlib.Path(images_base_dir)
@@ -155,16 +223,21 @@ def main(
     if not json_path.exists():
         raise ValueError(f"JSON directory not found: {json_dir}")
     
-    # JSON 파일 찾기
-    json_files = sorted(json_path.glob("*.json"))
+    # JSON 파일 (또는 컬럼 형식 에피소드) 찾기
+    json_files = sorted(p for p in json_path.glob(f"*{EPISODE_SUFFIX}") if is_columnar_episode(p))
+    if len(json_files) == 0:
+        json_files = sorted(json_path.glob("*.json"))
     
     if len(json_files) == 0:
         raise ValueError(f"No JSON files found in {json_dir}")
     
-    print(f"Found {len(json_files)} JSON files")
+    print(f"Found {len(json_files)} {'columnar' if is_columnar_episode(json_files[0]) else 'JSON'} episodes")
     print(f"Filter mode: {filter_mode}")
     print(f"Output repo: {output_repo_id}")
     
+    # 프레임 캐시 (선택)
+    cache = FrameCache(cache_dir) if cache_dir is not None else None
+    
     # LeRobot 데이터셋 생성 (DROID 스타일)
     dataset = LeRobotDataset.create(
         repo_id=output_repo_id,
@@ -172,12 +245,12 @@ def main(
         fps=fps,
         features={
             "exterior_image_1_left": {
-                "dtype": "image",
+                "dtype": "video" if video else "image",
                 "shape": (224, 224, 3),
                 "names": ["height", "width", "channel"],
             },
             "wrist_image_left": {
-                "dtype": "image",
+                "dtype": "video" if video else "image",
                 "shape": (224, 224, 3),
                 "names": ["height", "width", "channel"],
             },
@@ -197,6 +270,7 @@ def main(
                 "names": ["actions"],
             },
         },
+        use_videos=video,
         image_writer_threads=10,
         image_writer_processes=5,
     )
@@ -208,16 +282,26 @@ def main(
         print(f"\nProcessing {json_file.name}...")
         
         try:
-            frames, prompt = load_json_episode(json_file, images_base, filter_mode=filter_mode)
+            if is_columnar_episode(json_file):
+                frames, prompt = load_columnar_episode(json_file, images_base, filter_mode=filter_mode)
+            else:
+                frames, prompt = load_json_episode(json_file, images_base, filter_mode=filter_mode)
             
             if len(frames) == 0:
                 print(f"  Skipping (no frames after filtering)")
                 continue
             
+            # 누락 이미지: images/ 디렉토리를 한 번만 읽어 디코딩 전에 확인
+            index = ImageIndex()
+            missing = [f['_image_path'].name for f in frames if not index.exists(f['_image_path'])]
+            if missing:
+                print(f"  Missing images: {len(missing)}/{len(frames)} ({', '.join(missing[:3])}"
+                      f"{', ...' if len(missing) > 3 else ''}), using dummy images")
+            
             # 각 프레임을 LeRobot 형식으로 변환하여 추가
             for frame in frames:
                 # 이미지 로드
-                base_image = load_image(frame['_image_path'])
+                base_image = load_image(frame['_image_path'], resize_filter, fast_decode, cache, index)
                 wrist_image = base_image  # 동일 이미지 사용 (wrist 카메라 없음)
                 
                 # State: 8D로 패딩 (deg → rad 변환)
@@ -242,6 +326,10 @@ def main(
                 )
                 total_frames += 1
             
+            # 캐시 사용 시각을 에피소드마다 한 번에 기록
+            if cache is not None:
+                cache.flush()
+            
             # 에피소드 저장
             dataset.save_episode()
             print(f"  ✓ Saved episode with {len(frames)} frames")
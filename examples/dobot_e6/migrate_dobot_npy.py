@@ -0,0 +1,56 @@
+"""
+Dobot-Arm-DataCollect의 dataset.npy(프레임별 dict를 pickle한 object 배열)를
+구조화 배열(structured dtype)로 변환하는 스크립트.
+
+변환된 dataset.npy는 allow_pickle 없이 메모리 맵으로 로드되며, 변환 스크립트가
+에피소드 전체를 컬럼 단위로 바로 읽습니다. 원본은 dataset.npy.pickle.bak으로 보관됩니다.
+
+주의: dataset.npy 내용이 바뀌므로 이미 변환된 LeRobot 데이터셋의 매니페스트와 지문이
+달라집니다. 변환 전에 마이그레이션하거나, 이후 변환 시 --rebuild를 사용하세요.
+
+사용법:
+    python examples/dobot_e6/migrate_dobot_npy.py \
+        --data_dir /path/to/Dobot-Arm-DataCollect/vla_dataset
+"""
+
+import pathlib
+import sys
+
+import tyro
+
+# RoboVLA 루트를 path에 추가 (pipeline 모듈 사용)
+robo_vla_root = pathlib.Path(__file__).parent.parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from pipeline.dobot_data import load_dobot_npy, migrate_dobot_npy
+
+
+def main(data_dir: str, keep_backup: bool = True):
+    """
+    vla_auto_* 에피소드의 dataset.npy를 구조화 배열 형식으로 변환합니다.
+
+    Args:
+        data_dir: Dobot-Arm-DataCollect의 vla_dataset 디렉토리 경로
+        keep_backup: True면 원본을 dataset.npy.pickle.bak으로 보관
+    """
+    data_path = pathlib.Path(data_dir)
+    npy_paths = sorted(data_path.glob("vla_auto_*/dataset.npy"))
+
+    if len(npy_paths) == 0:
+        raise ValueError(f"No dataset.npy files found in {data_dir}")
+
+    print(f"Found {len(npy_paths)} dataset.npy files")
+
+    migrated = 0
+    for npy_path in npy_paths:
+        if migrate_dobot_npy(npy_path, keep_backup=keep_backup):
+            migrated += 1
+            print(f"  {npy_path.parent.name}: migrated ({len(load_dobot_npy(npy_path))} frames)")
+        else:
+            print(f"  {npy_path.parent.name}: already structured, skipped")
+
+    print(f"\n✅ Migrated {migrated}/{len(npy_paths)} files")
+
+
+if __name__ == "__main__":
+    tyro.cli(main)
@@ -0,0 +1,127 @@
+"""
+RoboVLA Data Pipeline Module
+
+Shared helpers used by the dataset conversion scripts in scripts/data and examples/.
+"""
+
+from .image_io import (
+    RESIZE_FILTERS,
+    ImageIndex,
+    decode_image,
+)
+from .frame_cache import FrameCache
+from .columnar import (
+    EPISODE_SUFFIX,
+    ColumnarEpisode,
+    is_columnar_episode,
+    write_columnar_episode,
+)
+from .dobot_data import (
+    DobotEpisode,
+    load_dobot_csv,
+    load_dobot_npy,
+    migrate_dobot_npy,
+)
+from .ingest import (
+    CollectorWatcher,
+    directory_signature,
+)
+from .json_stream import (
+    JsonEpisodeReader,
+    decode_embedded_image,
+    load_json_without_images,
+    pop_embedded_image,
+)
+from .manifest import (
+    EpisodeManifest,
+    SourceFingerprintCache,
+    config_fingerprint,
+    default_fingerprint_cache_path,
+    default_manifest_path,
+    lerobot_home,
+    prepare_incremental_run,
+    source_fingerprint,
+)
+from .norm_stats import (
+    EpisodeStatsCache,
+    FrameColumns,
+    VectorStats,
+    action_chunk_indices,
+    episode_fingerprint,
+    episode_stats_key,
+    frame_batches,
+    read_episode_lengths,
+    read_frame_columns,
+)
+from .progress import (
+    ProgressWriter,
+    default_progress_path,
+    read_progress,
+    watch_progress,
+)
+from .profiling import (
+    Profiler,
+    profile_episode,
+    profile_stage,
+)
+from .sharding import (
+    merge_datasets,
+    parse_shard,
+    select_shard,
+    shard_repo_id,
+)
+from .validation import (
+    ValidationStats,
+    validate_episode,
+)
+
+__all__ = [
+    "RESIZE_FILTERS",
+    "ImageIndex",
+    "decode_image",
+    "FrameCache",
+    "EPISODE_SUFFIX",
+    "ColumnarEpisode",
+    "is_columnar_episode",
+    "write_columnar_episode",
+    "DobotEpisode",
+    "load_dobot_csv",
+    "load_dobot_npy",
+    "migrate_dobot_npy",
+    "CollectorWatcher",
+    "directory_signature",
+    "JsonEpisodeReader",
+    "decode_embedded_image",
+    "load_json_without_images",
+    "pop_embedded_image",
+    "EpisodeManifest",
+    "SourceFingerprintCache",
+    "config_fingerprint",
+    "default_fingerprint_cache_path",
+    "default_manifest_path",
+    "lerobot_home",
+    "prepare_incremental_run",
+    "source_fingerprint",
+    "EpisodeStatsCache",
+    "FrameColumns",
+    "VectorStats",
+    "action_chunk_indices",
+    "episode_fingerprint",
+    "episode_stats_key",
+    "frame_batches",
+    "read_episode_lengths",
+    "read_frame_columns",
+    "ProgressWriter",
+    "default_progress_path",
+    "read_progress",
+    "watch_progress",
+    "Profiler",
+    "profile_episode",
+    "profile_stage",
+    "merge_datasets",
+    "parse_shard",
+    "select_shard",
+    "shard_repo_id",
+    "ValidationStats",
+    "validate_episode",
+]
@@ -0,0 +1,151 @@
+"""
+Binary columnar intermediate format for episodes.
+
+The per-episode JSON written by convert_to_json.py is dominated by text floats:
+parsing it is most of the non-image conversion time and the files are many times
+larger than the numbers they hold. The columnar format stores the same episode as
+one directory of plain .npy files that can be memory-mapped (no pickle):
+
+    <stem>.episode/
+        meta.json            episode_name, prompt, num_frames, scalar field names
+        joint_angles.npy     (T, J) float64, zero-padded
+        joint_counts.npy     (T,) int64, joints recorded per frame
+        actions.npy          (T, A) float64, zero-padded
+        action_counts.npy    (T,) int64, action values recorded per frame
+        frame_id.npy         (T,) int64 (-1 where missing)
+        image_path.npy       (T,) unicode image file names ("" where missing)
+        field_<name>.npy     (T,) float64 scalar fields (robot_mode, gripper, ...), NaN where missing
+
+Readers get an EpisodeColumns view over the memory maps, so selecting a frame range
+is a zero-copy slice.
+"""
+
+import json
+import pathlib
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from config.layout import EpisodeColumns
+
+
+FORMAT_VERSION = 1
+EPISODE_SUFFIX = ".episode"
+
+# Frame keys stored as dedicated columns rather than as scalar fields
+_VECTOR_KEYS = ("joint_angles", "actions")
+_SPECIAL_KEYS = ("frame_id", "image_path")
+
+
+def is_columnar_episode(path: pathlib.Path) -> bool:
+    """True if path is a columnar episode directory."""
+    return path.suffix == EPISODE_SUFFIX and (path / "meta.json").is_file()
+
+
+def _scalar_field_names(frames: list[dict[str, Any]]) -> list[str]:
+    """Numeric scalar keys present in any frame, in first-seen order."""
+    names: dict[str, None] = {}
+    for frame in frames:
+        for key, value in frame.items():
+            if key in _VECTOR_KEYS or key in _SPECIAL_KEYS or key in names:
+                continue
+            if isinstance(value, (int, float)) or value is None:
+                names[key] = None
+    return list(names)
+
+
+def write_columnar_episode(output_dir: pathlib.Path, stem: str, data: dict[str, Any]) -> pathlib.Path:
+    """Write a JSON episode dict ({episode_name, prompt, frames}) in columnar format."""
+    frames = data['frames']
+    episode_dir = output_dir / f"{stem}{EPISODE_SUFFIX}"
+    episode_dir.mkdir(parents=True, exist_ok=True)
+
+    scalar_fields = _scalar_field_names(frames)
+    columns = EpisodeColumns.from_frames(frames, scalar_fields)
+
+    np.save(episode_dir / "joint_angles.npy", columns.joint_angles)
+    np.save(episode_dir / "joint_counts.npy", columns.joint_counts)
+    np.save(episode_dir / "actions.npy", columns.actions)
+    np.save(episode_dir / "action_counts.npy", columns.action_counts)
+    np.save(
+        episode_dir / "frame_id.npy",
+        np.array([f.get('frame_id', -1) for f in frames], dtype=np.int64),
+    )
+    np.save(
+        episode_dir / "image_path.npy",
+        np.array([f.get('image_path') or "" for f in frames], dtype=np.str_),
+    )
+    for name, values in columns.fields.items():
+        np.save(episode_dir / f"field_{name}.npy", values)
+
+    # meta.json last: its presence marks a complete episode
+    with open(episode_dir / "meta.json", 'w', encoding='utf-8') as f:
+        json.dump(
+            {
+                "version": FORMAT_VERSION,
+                "episode_name": data['episode_name'],
+                "prompt": data.get('prompt'),
+                "num_frames": len(frames),
+                "scalar_fields": scalar_fields,
+            },
+            f,
+            indent=2,
+        )
+    return episode_dir
+
+
+@dataclass
+class ColumnarEpisode:
+    """A columnar episode opened with memory-mapped columns."""
+    episode_name: str
+    prompt: str | None
+    columns: EpisodeColumns
+    frame_id: np.ndarray
+    image_path: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    @classmethod
+    def load(cls, episode_dir: pathlib.Path, mmap: bool = True) -> "ColumnarEpisode":
+        with open(episode_dir / "meta.json", 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar episode version in {episode_dir}: {meta.get('version')}")
+
+        mmap_mode = "r" if mmap else None
+
+        def load_column(name: str) -> np.ndarray:
+            return np.load(episode_dir / f"{name}.npy", mmap_mode=mmap_mode)
+
+        return cls(
+            episode_name=meta["episode_name"],
+            prompt=meta.get("prompt"),
+            columns=EpisodeColumns(
+                joint_angles=load_column("joint_angles"),
+                joint_counts=load_column("joint_counts"),
+                actions=load_column("actions"),
+                action_counts=load_column("action_counts"),
+                fields={name: load_column(f"field_{name}") for name in meta["scalar_fields"]},
+            ),
+            frame_id=load_column("frame_id"),
+            image_path=load_column("image_path"),
+        )
+
+    def select(self, index: slice | np.ndarray) -> "ColumnarEpisode":
+        """Rows selected by a slice (zero-copy) or a mask / index array."""
+        return ColumnarEpisode(
+            episode_name=self.episode_name,
+            prompt=self.prompt,
+            columns=self.columns.select(index),
+            frame_id=self.frame_id[index],
+            image_path=self.image_path[index],
+        )
+
+    def image_file_names(self) -> list[str]:
+        """Image file name per frame, defaulting to frame_{frame_id:06d}.jpg."""
+        return [
+            str(name) if name else f"frame_{int(frame_id):06d}.jpg"
+            for name, frame_id in zip(self.image_path, self.frame_id)
+        ]
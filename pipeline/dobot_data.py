@@ -0,0 +1,263 @@
+"""
+Column-oriented loaders for Dobot-Arm-DataCollect episodes.
+
+Each vla_auto_*/ episode directory holds the same frames twice:
+
+    robot_data.csv   frame_id,timestamp,image_path,j1..j6,x,y,z,rx,ry,rz,
+                     gripper_tooldo1,gripper_tooldo2,robot_mode
+    dataset.npy      one dict per frame (pickled object array), or, after
+                     migrate_dobot_npy(), a structured array (DOBOT_NPY_FIELDS)
+
+Both loaders return a DobotEpisode of whole-episode arrays. The CSV is parsed in a
+single np.loadtxt pass into a structured array; a structured dataset.npy is
+memory-mapped and needs no allow_pickle. Legacy pickled dataset.npy files are still
+read (with allow_pickle) and can be rewritten in place with migrate_dobot_npy().
+"""
+
+import pathlib
+import shutil
+import warnings
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from config.layout import stack_rows
+
+from .resample import ResampleGrid
+
+
+NUM_JOINTS = 6
+JOINT_COLUMNS = tuple(f"j{i}" for i in range(1, NUM_JOINTS + 1))
+TCP_COLUMNS = ("x", "y", "z", "rx", "ry", "rz")
+
+# Structured dataset.npy layout (image_path width is set per file)
+DOBOT_NPY_FIELDS = (
+    ("frame_id", np.int64),
+    ("timestamp", np.float64),
+    ("image_path", np.str_),
+    ("joint_angles", np.float64, (NUM_JOINTS,)),
+    ("tcp_pose", np.float64, (6,)),
+    ("gripper_tooldo1", np.float64),
+    ("gripper_tooldo2", np.float64),
+    ("robot_mode", np.int64),
+)
+
+
+def dobot_npy_dtype(path_width: int) -> np.dtype:
+    """Structured dtype of a migrated dataset.npy with image paths up to path_width chars."""
+    fields = []
+    for name, *spec in DOBOT_NPY_FIELDS:
+        if name == "image_path":
+            fields.append((name, f"U{max(path_width, 1)}"))
+        else:
+            fields.append((name, *spec))
+    return np.dtype(fields)
+
+
+@dataclass
+class DobotEpisode:
+    """Per-frame columns of one Dobot-Arm-DataCollect episode."""
+    frame_id: np.ndarray  # (T,) int64
+    timestamp: np.ndarray  # (T,) float64
+    image_path: np.ndarray  # (T,) str
+    joint_angles: np.ndarray  # (T, 6) float64, degrees
+    tcp_pose: np.ndarray  # (T, 6) float64
+    gripper_tooldo1: np.ndarray  # (T,) float64
+    gripper_tooldo2: np.ndarray  # (T,) float64
+    robot_mode: np.ndarray  # (T,) int64
+
+    def __len__(self) -> int:
+        return len(self.frame_id)
+
+    @property
+    def gripper(self) -> np.ndarray:
+        """(T,) float64 gripper state: gripper_tooldo2 (suction, 0/1) thresholded at 0.5."""
+        return np.where(self.gripper_tooldo2 > 0.5, 1.0, 0.0)
+
+    @property
+    def states(self) -> np.ndarray:
+        """(T, 7) float32 [j1..j6, gripper]."""
+        return np.column_stack([self.joint_angles, self.gripper]).astype(np.float32)
+
+    @property
+    def actions(self) -> np.ndarray:
+        """(T, 7) float32 [j1..j6, gripper] (absolute joint targets, same as states)."""
+        return self.states
+
+    @classmethod
+    def from_structured(cls, records: np.ndarray) -> "DobotEpisode":
+        """Episode view over a structured array (DOBOT_NPY_FIELDS); no copies for mmaps."""
+        return cls(
+            frame_id=records["frame_id"],
+            timestamp=records["timestamp"],
+            image_path=records["image_path"],
+            joint_angles=records["joint_angles"],
+            tcp_pose=records["tcp_pose"],
+            gripper_tooldo1=records["gripper_tooldo1"],
+            gripper_tooldo2=records["gripper_tooldo2"],
+            robot_mode=records["robot_mode"],
+        )
+
+    @classmethod
+    def from_dicts(cls, items: Any) -> "DobotEpisode":
+        """Episode from legacy per-frame dicts (pickled dataset.npy)."""
+        items = list(items)
+        count = len(items)
+
+        def scalar(name: str, dtype: type, default: float) -> np.ndarray:
+            return np.fromiter((item.get(name, default) for item in items), dtype=dtype, count=count)
+
+        return cls(
+            frame_id=scalar("frame_id", np.int64, -1),
+            timestamp=scalar("timestamp", np.float64, np.nan),
+            image_path=np.array([str(item.get("image_path", "")) for item in items], dtype=np.str_),
+            joint_angles=stack_rows([list(item.get("joint_angles", [])) for item in items], NUM_JOINTS),
+            tcp_pose=stack_rows([list(item.get("tcp_pose", [])) for item in items], 6),
+            gripper_tooldo1=scalar("gripper_tooldo1", np.float64, 0),
+            gripper_tooldo2=scalar("gripper_tooldo2", np.float64, 0),
+            robot_mode=scalar("robot_mode", np.int64, -1),
+        )
+
+    def resampled(self, grid: ResampleGrid) -> "DobotEpisode":
+        """Episode on a resample grid: poses interpolated, other columns from the nearest frame."""
+        return DobotEpisode(
+            frame_id=grid.take(self.frame_id),
+            timestamp=grid.times,
+            image_path=grid.take(self.image_path),
+            joint_angles=grid.interpolate(np.asarray(self.joint_angles, dtype=np.float64)),
+            tcp_pose=grid.interpolate(np.asarray(self.tcp_pose, dtype=np.float64)),
+            gripper_tooldo1=grid.take(self.gripper_tooldo1),
+            gripper_tooldo2=grid.take(self.gripper_tooldo2),
+            robot_mode=grid.take(self.robot_mode),
+        )
+
+    def to_frames(self) -> list[dict[str, Any]]:
+        """Per-frame dicts in the convert_to_json.py layout.
+
+        `actions` are the per-frame deltas of [j1..j6, gripper] over the whole episode
+        (zeros for the first frame), taken before any robot_mode filtering.
+        """
+        gripper = self.gripper
+        states = np.column_stack([self.joint_angles, gripper]).astype(np.float64)
+        actions = np.zeros_like(states)
+        actions[1:] = np.diff(states, axis=0)
+        return [
+            {
+                "frame_id": int(self.frame_id[i]),
+                "timestamp": float(self.timestamp[i]),
+                "image_path": str(self.image_path[i]),
+                "joint_angles": [float(v) for v in self.joint_angles[i]],
+                "tcp_pose": [float(v) for v in self.tcp_pose[i]],
+                "gripper_tooldo1": float(self.gripper_tooldo1[i]),
+                "gripper_tooldo2": float(self.gripper_tooldo2[i]),
+                "gripper": float(gripper[i]),
+                "robot_mode": int(self.robot_mode[i]),
+                "actions": [float(v) for v in actions[i]],
+            }
+            for i in range(len(self))
+        ]
+
+    def to_structured(self) -> np.ndarray:
+        """Pack the episode into a structured array for a migrated dataset.npy."""
+        path_width = int(np.char.str_len(self.image_path).max(initial=1))
+        records = np.zeros(len(self), dtype=dobot_npy_dtype(path_width))
+        for name, *_ in DOBOT_NPY_FIELDS:
+            records[name] = getattr(self, name)
+        return records
+
+
+def load_dobot_csv(csv_path: pathlib.Path) -> DobotEpisode:
+    """Parse robot_data.csv in one vectorized pass.
+
+    Required columns: frame_id, timestamp, image_path, j1..j6. TCP pose and gripper
+    columns default to 0 and robot_mode to -1 when absent.
+    """
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        header = f.readline().strip().split(',')
+        rows = f.readlines()
+    index = {name: i for i, name in enumerate(header)}
+
+    missing = [name for name in ("frame_id", "timestamp", "image_path", *JOINT_COLUMNS) if name not in index]
+    if missing:
+        raise ValueError(f"{csv_path} is missing columns: {missing}")
+
+    optional = [name for name in (*TCP_COLUMNS, "gripper_tooldo1", "gripper_tooldo2", "robot_mode") if name in index]
+    columns = ["frame_id", "timestamp", "image_path", *JOINT_COLUMNS, *optional]
+    # No field is longer than its line, so the image_path field cannot truncate a path
+    line_width = max(map(len, rows), default=1)
+    dtype = [(name, f"U{line_width}" if name == "image_path" else np.float64) for name in columns]
+
+    with warnings.catch_warnings():
+        # Header-only files are valid empty episodes
+        warnings.filterwarnings("ignore", message=".*input contained no data.*")
+        table = np.loadtxt(
+            rows,
+            delimiter=',',
+            usecols=[index[name] for name in columns],
+            dtype=dtype,
+            ndmin=1,
+            encoding='utf-8',
+        )
+
+    count = len(table)
+
+    def column(name: str, default: float) -> np.ndarray:
+        return table[name] if name in index else np.full(count, default, dtype=np.float64)
+
+    path_width = int(np.char.str_len(table["image_path"]).max(initial=1))
+    return DobotEpisode(
+        frame_id=table["frame_id"].astype(np.int64),
+        timestamp=table["timestamp"],
+        image_path=table["image_path"].astype(f"U{path_width}"),
+        joint_angles=np.column_stack([table[name] for name in JOINT_COLUMNS]) if count else np.zeros((0, NUM_JOINTS)),
+        tcp_pose=np.column_stack([column(name, 0.0) for name in TCP_COLUMNS]) if count else np.zeros((0, 6)),
+        gripper_tooldo1=column("gripper_tooldo1", 0.0),
+        gripper_tooldo2=column("gripper_tooldo2", 0.0),
+        robot_mode=column("robot_mode", -1).astype(np.int64),
+    )
+
+
+def _load_npy(npy_path: pathlib.Path) -> tuple[np.ndarray, bool]:
+    """(array, is_structured): memory-map a migrated file, else unpickle the legacy format."""
+    try:
+        records = np.load(npy_path, mmap_mode="r")
+    except ValueError:
+        # Object arrays cannot be memory-mapped or loaded without allow_pickle
+        return np.load(npy_path, allow_pickle=True), False
+    if records.dtype.names is None:
+        raise ValueError(f"Unsupported dataset.npy layout in {npy_path}: dtype {records.dtype}")
+    return records, True
+
+
+def load_dobot_npy(npy_path: pathlib.Path) -> DobotEpisode:
+    """Load dataset.npy as whole-episode arrays.
+
+    Migrated (structured) files are memory-mapped; legacy pickled files of per-frame
+    dicts are unpickled and converted column by column.
+    """
+    records, structured = _load_npy(npy_path)
+    if structured:
+        return DobotEpisode.from_structured(records)
+    return DobotEpisode.from_dicts(records)
+
+
+def migrate_dobot_npy(npy_path: pathlib.Path, keep_backup: bool = True) -> bool:
+    """Rewrite a legacy pickled dataset.npy as a structured, memory-mappable array.
+
+    The original is kept as dataset.npy.pickle.bak when keep_backup is set. Returns
+    False if the file is already migrated.
+    """
+    records, structured = _load_npy(npy_path)
+    if structured:
+        return False
+
+    migrated = DobotEpisode.from_dicts(records).to_structured()
+    if keep_backup:
+        shutil.copy2(npy_path, npy_path.with_name(npy_path.name + ".pickle.bak"))
+
+    # np.save appends .npy to names without it, so write to a .tmp.npy and rename
+    tmp_path = npy_path.with_name(npy_path.stem + ".tmp.npy")
+    np.save(tmp_path, migrated, allow_pickle=False)
+    tmp_path.replace(npy_path)
+    return True
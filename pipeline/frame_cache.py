@@ -0,0 +1,276 @@
+"""
+Persistent on-disk cache of decoded and resized frames.
+
+Re-running a conversion after a RobotConfig tweak (gripper extraction, filtering, ...)
+decodes and resizes every JPEG again even though the images did not change. FrameCache
+stores the resized uint8 frames so later runs only pay for a memory-mapped read.
+
+Layout (cache_dir/):
+    index.sqlite          key → (shard, slot) plus per-shard bookkeeping
+    shard_000001.npy      (slots_per_shard, height, width, 3) uint8, memory-mapped
+    ...
+
+Keys hash the source (path under its resolved directory + mtime + size, or file
+contents with content_hash=True) together with the target size, resize filter and
+fast_decode flag, so changing any of those is a cache miss rather than a stale hit.
+Each images/ directory is resolved once (not every frame path), and mtime and size
+come from the file's os.scandir entry (ImageIndex); that is still one stat call per
+frame on Linux, but no per-frame realpath walk.
+
+The size cap is enforced with LRU eviction at shard granularity: the least recently
+read/written shard file is deleted together with its index entries. Read times are
+kept in memory and written to the index by flush(), which converters call once per
+episode, so a hit costs one SELECT rather than an UPDATE as well. The index is a
+SQLite database, so several converter worker processes can share one cache; within a
+process each thread (e.g. of a decode pool) uses its own connection, and the in-memory
+state (open shards, pending read times, listings, counters) is guarded by a lock.
+"""
+
+import hashlib
+import pathlib
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from .image_io import ImageIndex, decode_image
+from .profiling import Profiler, profile_stage
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shards (
+    shard_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    height INTEGER NOT NULL,
+    width INTEGER NOT NULL,
+    used INTEGER NOT NULL,
+    nbytes INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    shard_id INTEGER NOT NULL,
+    slot INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_shard ON entries (shard_id);
+"""
+
+
+class FrameCache:
+    """Content-addressed cache of resized frames backed by memory-mapped shard files."""
+
+    def __init__(
+        self,
+        cache_dir: str | pathlib.Path,
+        max_bytes: int = 50 * 1024 ** 3,
+        slots_per_shard: int = 512,
+        content_hash: bool = False,
+    ):
+        self.cache_dir = pathlib.Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.slots_per_shard = slots_per_shard
+        self.content_hash = content_hash
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: dict[int, np.memmap] = {}
+        self._index = ImageIndex()
+        self._resolved_dirs: dict[pathlib.Path, pathlib.Path] = {}
+        self._last_used: dict[int, float] = {}  # shard_id -> last read, not yet in the index
+
+    def __getstate__(self) -> dict:
+        # Connections, memory maps and directory listings are per process; reopen lazily after pickling
+        state = self.__dict__.copy()
+        del state["_local"]
+        del state["_lock"]
+        state["_shards"] = {}
+        state["_index"] = ImageIndex()
+        state["_resolved_dirs"] = {}
+        state["_last_used"] = {}
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # SQLite connections cannot be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.cache_dir / "index.sqlite", timeout=60.0, isolation_level=None)
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _shard_path(self, shard_id: int) -> pathlib.Path:
+        return self.cache_dir / f"shard_{shard_id:06d}.npy"
+
+    def _open_shard(self, shard_id: int) -> np.memmap:
+        with self._lock:
+            if shard_id not in self._shards:
+                self._shards[shard_id] = np.load(self._shard_path(shard_id), mmap_mode="r+")
+            return self._shards[shard_id]
+
+    def make_key(
+        self,
+        image_path: pathlib.Path,
+        target_size: tuple[int, int],
+        resize_filter: str,
+        fast_decode: bool,
+    ) -> str:
+        """Cache key for a source image and the decode settings applied to it."""
+        if self.content_hash:
+            source = hashlib.sha1(image_path.read_bytes()).hexdigest()
+        else:
+            with self._lock:
+                st = self._index.stat(image_path)
+                directory = self._resolved_dirs.get(image_path.parent)
+                if directory is None:
+                    directory = self._resolved_dirs[image_path.parent] = image_path.parent.resolve()
+            source = f"{directory / image_path.name}:{st.st_mtime_ns}:{st.st_size}"
+        width, height = target_size
+        return hashlib.sha1(f"{source}|{width}x{height}|{resize_filter}|{int(fast_decode)}".encode()).hexdigest()
+
+    def get(self, key: str) -> np.ndarray | None:
+        """Return a copy of the cached frame, or None on a miss."""
+        row = self.conn.execute("SELECT shard_id, slot FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        shard_id, slot = row
+        try:
+            shard = self._open_shard(shard_id)
+        except FileNotFoundError:
+            # Shard was evicted by another process after we looked up the key
+            self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self._last_used[shard_id] = time.time()
+            self.hits += 1
+        return np.array(shard[slot])
+
+    def _write_last_used(self) -> None:
+        """Write the last read time of each shard read since the previous write (one UPDATE per shard)."""
+        with self._lock:
+            last_used, self._last_used = self._last_used, {}
+        if last_used:
+            self.conn.executemany(
+                "UPDATE shards SET last_used = MAX(last_used, ?) WHERE shard_id = ?",
+                [(t, shard_id) for shard_id, t in last_used.items()],
+            )
+
+    def flush(self) -> None:
+        """Write the shards' last read times to the index and forget directory listings.
+
+        Call once per episode: other processes only see reads up to the last flush when
+        evicting, and listings would otherwise grow with (and miss changes to) every
+        images/ directory seen.
+        """
+        self._write_last_used()
+        with self._lock:
+            self._index.clear()
+            self._resolved_dirs.clear()
+
+    def put(self, key: str, image: np.ndarray) -> None:
+        """Store a (height, width, 3) uint8 frame under key."""
+        height, width = image.shape[:2]
+        conn = self.conn
+
+        # Reserve a slot atomically so concurrent writers never share one
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT shard_id, used FROM shards WHERE height = ? AND width = ? AND used < ? "
+                "ORDER BY shard_id DESC LIMIT 1",
+                (height, width, self.slots_per_shard),
+            ).fetchone()
+            if row is None:
+                nbytes = self.slots_per_shard * height * width * 3
+                shard_id = conn.execute(
+                    "INSERT INTO shards (height, width, used, nbytes, last_used) VALUES (?, ?, 0, ?, ?)",
+                    (height, width, nbytes, time.time()),
+                ).lastrowid
+                np.lib.format.open_memmap(
+                    self._shard_path(shard_id), mode="w+", dtype=np.uint8,
+                    shape=(self.slots_per_shard, height, width, 3),
+                )
+                slot = 0
+            else:
+                shard_id, slot = row
+            conn.execute(
+                "UPDATE shards SET used = ?, last_used = ? WHERE shard_id = ?",
+                (slot + 1, time.time(), shard_id),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        self._open_shard(shard_id)[slot] = image
+        conn.execute("INSERT OR REPLACE INTO entries (key, shard_id, slot) VALUES (?, ?, ?)", (key, shard_id, slot))
+        self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used shards until the cache fits in max_bytes."""
+        conn = self.conn
+        total = conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM shards").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Shards read since the last flush are not the least recently used
+        self._write_last_used()
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            total = conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM shards").fetchone()[0]
+            evicted = []
+            for shard_id, nbytes in conn.execute("SELECT shard_id, nbytes FROM shards ORDER BY last_used ASC").fetchall():
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM entries WHERE shard_id = ?", (shard_id,))
+                conn.execute("DELETE FROM shards WHERE shard_id = ?", (shard_id,))
+                evicted.append(shard_id)
+                total -= nbytes
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        for shard_id in evicted:
+            with self._lock:
+                self._shards.pop(shard_id, None)
+            self._shard_path(shard_id).unlink(missing_ok=True)
+
+    def get_or_decode(
+        self,
+        image_path: pathlib.Path,
+        target_size: tuple[int, int] = (224, 224),
+        resize_filter: str = "lanczos",
+        fast_decode: bool = False,
+        profiler: Profiler | None = None,
+    ) -> np.ndarray:
+        """decode_image with the result served from / stored into the cache."""
+        with profile_stage(profiler, "cache_lookup") as span:
+            key = self.make_key(image_path, target_size, resize_filter, fast_decode)
+            image = self.get(key)
+            span.bytes = image.nbytes if image is not None else 0
+        if image is None:
+            image = decode_image(image_path, target_size, resize_filter, fast_decode, profiler)
+            with profile_stage(profiler, "cache_store") as span:
+                self.put(key, image)
+                span.bytes = image.nbytes
+        return image
+
+    def summary(self) -> dict[str, int]:
+        """Entry count and on-disk size of the cache."""
+        entries = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        shards, nbytes = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM shards").fetchone()
+        return {"entries": entries, "shards": shards, "bytes": nbytes}
@@ -0,0 +1,110 @@
+"""
+Image decoding helpers for dataset conversion.
+
+Camera frames are stored as full-size JPEGs (640x480 for Dobot-Arm-DataCollect) but
+training only needs RobotConfig.image_size (224x224). Decoding the full image and then
+running LANCZOS over it dominates conversion time, so decode_image can optionally ask
+the JPEG decoder to downscale in the DCT domain (1/2, 1/4, 1/8) before the final resize.
+
+ImageIndex answers "does this frame exist?" from one listing per images/ directory,
+so converters can find missing frames before decoding without a stat per frame
+(each of which is a server round trip on NFS).
+"""
+
+import os
+import pathlib
+from typing import BinaryIO
+
+import numpy as np
+from PIL import Image
+
+from .profiling import Profiler, profile_stage
+
+
+# Resize filters selectable by name (RobotConfig.image_resize_filter, --resize_filter)
+RESIZE_FILTERS = {
+    "nearest": Image.Resampling.NEAREST,
+    "box": Image.Resampling.BOX,
+    "bilinear": Image.Resampling.BILINEAR,
+    "hamming": Image.Resampling.HAMMING,
+    "bicubic": Image.Resampling.BICUBIC,
+    "lanczos": Image.Resampling.LANCZOS,
+}
+
+
+def decode_image(
+    image_path: pathlib.Path | BinaryIO,
+    target_size: tuple[int, int] = (224, 224),
+    resize_filter: str = "lanczos",
+    fast_decode: bool = False,
+    profiler: Profiler | None = None,
+) -> np.ndarray:
+    """Decode an image file into a (height, width, 3) uint8 array of target_size.
+
+    Args:
+        image_path: Image file to decode (path or binary file object).
+        target_size: Output (width, height), as passed to PIL.
+        resize_filter: Key of RESIZE_FILTERS used for the final resize.
+        fast_decode: Let the JPEG decoder downscale in the DCT domain to the smallest
+            scale that is still >= target_size. No-op for non-JPEG files.
+        profiler: Records the "image_decode" and "image_resize" stages (decoded and
+            resized pixel bytes).
+    """
+    if resize_filter not in RESIZE_FILTERS:
+        raise ValueError(
+            f"Unknown resize filter: {resize_filter}. "
+            f"Available: {list(RESIZE_FILTERS.keys())}"
+        )
+
+    with Image.open(image_path) as img:
+        with profile_stage(profiler, "image_decode") as span:
+            if fast_decode:
+                img.draft("RGB", target_size)
+            img.load()
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            span.bytes = img.width * img.height * 3
+        with profile_stage(profiler, "image_resize") as span:
+            img = img.resize(target_size, RESIZE_FILTERS[resize_filter])
+            image = np.array(img, dtype=np.uint8)
+            span.bytes = image.nbytes
+        return image
+
+
+class ImageIndex:
+    """In-memory index of image directories, each listed once on first use."""
+
+    def __init__(self):
+        self._entries: dict[pathlib.Path, dict[str, os.DirEntry]] = {}
+        self._listings: dict[pathlib.Path, frozenset[str]] = {}
+
+    def listing(self, directory: pathlib.Path) -> frozenset[str]:
+        """Entry names in directory (empty if it does not exist)."""
+        if directory not in self._listings:
+            try:
+                with os.scandir(directory) as entries:
+                    self._entries[directory] = {entry.name: entry for entry in entries}
+            except (FileNotFoundError, NotADirectoryError):
+                self._entries[directory] = {}
+            self._listings[directory] = frozenset(self._entries[directory])
+        return self._listings[directory]
+
+    def stat(self, image_path: pathlib.Path) -> os.stat_result:
+        """stat of a listed file via its os.DirEntry (one stat call per entry on Linux, cached until clear())."""
+        self.listing(image_path.parent)
+        entry = self._entries[image_path.parent].get(image_path.name)
+        if entry is None:
+            raise FileNotFoundError(f"Image not found: {image_path}")
+        return entry.stat()
+
+    def clear(self) -> None:
+        """Forget all listings (e.g. once an episode is done)."""
+        self._entries.clear()
+        self._listings.clear()
+
+    def exists(self, image_path: pathlib.Path) -> bool:
+        return image_path.name in self.listing(image_path.parent)
+
+    def present(self, image_paths: list[pathlib.Path]) -> np.ndarray:
+        """(T,) bool mask of frames whose image file exists."""
+        return np.fromiter((self.exists(p) for p in image_paths), dtype=bool, count=len(image_paths))
@@ -0,0 +1,157 @@
+"""
+Live ingest of Dobot-Arm-DataCollect episodes while collection is running.
+
+The collector writes one vla_auto_*/ directory per episode (images/, robot_data.csv,
+dataset.npy) and metadata.txt once recording has finished. CollectorWatcher polls
+the collector's data directory and stages every finished episode as a columnar
+episode (<n>.episode, see pipeline/columnar.py) in a staging directory that the
+universal converter then converts incrementally.
+
+An episode is staged once its completion marker exists and the directory has stopped
+changing for `settle_seconds`: the (file count, bytes, newest mtime) signature of the
+episode directory and its images/ must be unchanged for that long. Files that are
+already older than that count as settled on the first poll, so a restarted watcher
+does not wait again for finished episodes.
+
+Staging is restart-safe without a separate state file: staged episodes are numbered
+in staging order (zero-padded, so file order is staging order), and their meta.json (written last) records the source directory
+name, so the set of staged episodes and the next number are recovered from the
+staging directory on startup. An episode interrupted while being staged has no
+meta.json yet and is staged again under the same number.
+"""
+
+import json
+import os
+import pathlib
+import time
+from dataclasses import dataclass
+
+from .columnar import EPISODE_SUFFIX, is_columnar_episode, write_columnar_episode
+from .dobot_data import load_dobot_csv, load_dobot_npy
+
+
+COMPLETION_MARKER = "metadata.txt"
+EPISODE_PREFIX = "vla_auto_"
+
+
+def directory_signature(episode_dir: pathlib.Path) -> tuple[int, int, int]:
+    """(files, bytes, newest mtime in ns) of an episode directory and its images/."""
+    files = size = newest = 0
+    for directory in (episode_dir, episode_dir / "images"):
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            try:
+                stat = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+            files += 1
+            size += stat.st_size
+            newest = max(newest, stat.st_mtime_ns)
+    return files, size, newest
+
+
+@dataclass
+class _Observation:
+    signature: tuple[int, int, int]
+    since: float  # time.monotonic() from which the signature is known to be unchanged
+
+
+class CollectorWatcher:
+    """Stages finished vla_auto_* episodes of a collector directory as columnar episodes."""
+
+    def __init__(
+        self,
+        data_dir: pathlib.Path,
+        staging_dir: pathlib.Path,
+        settle_seconds: float = 30.0,
+        use_npy: bool = True,
+        prompt: str | None = None,
+        marker: str = COMPLETION_MARKER,
+    ):
+        self.data_dir = pathlib.Path(data_dir)
+        self.staging_dir = pathlib.Path(staging_dir)
+        self.settle_seconds = settle_seconds
+        self.use_npy = use_npy
+        self.prompt = prompt
+        self.marker = marker
+        self.staged: dict[str, pathlib.Path] = {}
+        self._observed: dict[str, _Observation] = {}
+        self._failed: dict[str, tuple[int, int, int]] = {}
+        self._next_index = 1
+        self._recover()
+
+    def _recover(self) -> None:
+        """Rebuild the staged episodes and the next episode number from the staging directory."""
+        if not self.staging_dir.exists():
+            return
+        for path in self.staging_dir.glob(f"*{EPISODE_SUFFIX}"):
+            if not path.stem.isdigit() or not is_columnar_episode(path):
+                continue
+            with open(path / "meta.json", 'r', encoding='utf-8') as f:
+                self.staged[json.load(f)["episode_name"]] = path
+            self._next_index = max(self._next_index, int(path.stem) + 1)
+
+    def pending(self) -> list[pathlib.Path]:
+        """Episode directories not staged yet, oldest first."""
+        if not self.data_dir.exists():
+            return []
+        return sorted(
+            d for d in self.data_dir.iterdir()
+            if d.is_dir() and d.name.startswith(EPISODE_PREFIX) and d.name not in self.staged
+        )
+
+    def is_settled(self, episode_dir: pathlib.Path) -> bool:
+        """True once the episode is marked complete and unchanged for settle_seconds."""
+        if not (episode_dir / self.marker).exists():
+            return False
+        signature = directory_signature(episode_dir)
+        now = time.monotonic()
+        observation = self._observed.get(episode_dir.name)
+        if observation is None or observation.signature != signature:
+            # Credit the age of the newest file, so episodes finished before a restart settle at once
+            age = max(0.0, time.time() - signature[2] / 1e9)
+            observation = _Observation(signature, now - age)
+            self._observed[episode_dir.name] = observation
+        return now - observation.since >= self.settle_seconds
+
+    def stage(self, episode_dir: pathlib.Path) -> pathlib.Path:
+        """Write one episode as <n>.episode in the staging directory."""
+        npy_path = episode_dir / "dataset.npy"
+        if self.use_npy and npy_path.exists():
+            episode = load_dobot_npy(npy_path)
+        else:
+            episode = load_dobot_csv(episode_dir / "robot_data.csv")
+        data = {"episode_name": episode_dir.name, "prompt": self.prompt, "frames": episode.to_frames()}
+        path = write_columnar_episode(self.staging_dir, f"{self._next_index:06d}", data)
+        self._next_index += 1
+        self.staged[episode_dir.name] = path
+        self._observed.pop(episode_dir.name, None)
+        print(f"  Staged {episode_dir.name} → {path.name} ({len(episode)} frames)")
+        return path
+
+    def poll(self) -> list[pathlib.Path]:
+        """Stage every settled episode; returns the new staged episode paths.
+
+        Episodes that fail to load are reported and retried only once their
+        directory changes.
+        """
+        new = []
+        for episode_dir in self.pending():
+            if not self.is_settled(episode_dir):
+                continue
+            signature = self._observed[episode_dir.name].signature
+            if self._failed.get(episode_dir.name) == signature:
+                continue
+            try:
+                new.append(self.stage(episode_dir))
+            except (OSError, ValueError, KeyError) as e:
+                print(f"  Failed to stage {episode_dir.name}: {type(e).__name__}: {e}")
+                self._failed[episode_dir.name] = signature
+                continue
+            self._failed.pop(episode_dir.name, None)
+        return new
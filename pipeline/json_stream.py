@@ -0,0 +1,158 @@
+"""
+Incremental reader for per-episode JSON files, including embedded images.
+
+convert_to_json.py embeds every frame's JPEG as a base64 string unless run with
+--no-images, so an episode file can be several hundred MB. json.load() materializes
+the whole document (every payload string, then the frame dicts holding them) before
+the first frame can be used. JsonEpisodeReader instead parses the top-level object
+incrementally: the `frames` array is decoded one frame object at a time from a
+bounded read buffer, so memory is that of one frame plus what the caller keeps.
+Callers pop the payload with pop_embedded_image() and decode it straight into a
+target-size array with decode_embedded_image().
+
+Top-level fields other than `frames` (episode_name, prompt, ...) are collected in
+`meta`; fields written after `frames` are only available once iteration finishes.
+"""
+
+import base64
+import binascii
+import io
+import json
+import pathlib
+from typing import Any, Iterator
+
+import numpy as np
+
+from .image_io import decode_image
+from .profiling import Profiler
+
+
+# Frame keys that may hold an embedded image (base64, optionally as a data: URI)
+EMBEDDED_IMAGE_KEYS = ("image", "image_base64", "image_data")
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+class JsonEpisodeReader:
+    """Streams the frames of a {"episode_name", "prompt", "frames": [...]} JSON file."""
+
+    def __init__(self, path: pathlib.Path, chunk_size: int = 1 << 20):
+        self.path = pathlib.Path(path)
+        self.chunk_size = chunk_size
+        self.meta: dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+        self._file = None
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, min_chars: int) -> bool:
+        """Append at least min_chars more characters to the buffer; False at end of file."""
+        if self._eof:
+            return False
+        if self._pos > len(self._buffer) // 2:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        chunk = self._file.read(max(self.chunk_size, min_chars))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer += chunk
+        return True
+
+    def _skip_whitespace(self) -> str:
+        """Next non-whitespace character (not consumed), "" at end of file."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill(1):
+                return ""
+
+    def _expect(self, chars: str) -> str:
+        char = self._skip_whitespace()
+        if not char or char not in chars:
+            raise ValueError(f"{self.path}: expected one of {chars!r} at offset ~{self._pos}, got {char!r}")
+        self._pos += 1
+        return char
+
+    def _value(self) -> Any:
+        """Decode the next JSON value, reading more input until it is complete."""
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Incomplete value: read more (growing reads keep huge values linear overall)
+                if not self._fill(len(self._buffer) - self._pos):
+                    raise
+                continue
+            # A number cut off by the end of the buffer ("12", "-2.", "1e") continues in the next chunk
+            truncated = end == len(self._buffer) or (
+                type(value) in (int, float) and self._buffer[end] in _NUMBER_CHARS
+            )
+            if truncated and self._fill(1):
+                continue
+            self._pos = end
+            return value
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        with open(self.path, 'r', encoding='utf-8') as self._file:
+            self._expect("{")
+            if self._skip_whitespace() == "}":
+                return
+            while True:
+                key = self._value()
+                self._expect(":")
+                if key == "frames":
+                    self._expect("[")
+                    if self._skip_whitespace() == "]":
+                        self._pos += 1
+                    else:
+                        while True:
+                            yield self._value()
+                            if self._expect(",]") == "]":
+                                break
+                else:
+                    self.meta[key] = self._value()
+                if self._expect(",}") == "}":
+                    return
+
+
+def pop_embedded_image(frame: dict[str, Any]) -> str | None:
+    """Remove and return a frame's embedded image payload, if it has one."""
+    for key in EMBEDDED_IMAGE_KEYS:
+        payload = frame.get(key)
+        if isinstance(payload, str) and payload:
+            del frame[key]
+            return payload
+    return None
+
+
+def load_json_without_images(path: pathlib.Path) -> dict[str, Any]:
+    """The episode dict json.load() would return, minus embedded image payloads."""
+    reader = JsonEpisodeReader(path)
+    frames = []
+    for frame in reader:
+        pop_embedded_image(frame)
+        frames.append(frame)
+    return {**reader.meta, "frames": frames}
+
+
+def decode_embedded_image(
+    payload: str,
+    target_size: tuple[int, int] = (224, 224),
+    resize_filter: str = "lanczos",
+    fast_decode: bool = False,
+    profiler: Profiler | None = None,
+) -> np.ndarray:
+    """Decode a base64 (or data: URI) image payload into a target_size uint8 array."""
+    if payload.startswith("data:"):
+        payload = payload.partition(",")[2]
+    try:
+        data = base64.b64decode(payload, validate=True)
+    except binascii.Error as e:
+        raise ValueError(f"Invalid embedded image payload: {e}") from None
+    return decode_image(io.BytesIO(data), target_size, resize_filter, fast_decode, profiler)
@@ -0,0 +1,320 @@
+"""
+Episode manifest for incremental and resumable dataset conversion.
+
+LeRobot datasets are append-only, so the converters keep a small JSON manifest next
+to the dataset directory recording, for every episode already written:
+
+    source       episode identifier (JSON file name / episode directory name)
+    fingerprint  hash of the episode's source data
+    num_frames   frames written (0 = episode was empty and skipped)
+
+plus a fingerprint of the RobotConfig and conversion options. The manifest is
+rewritten atomically after each episode is fully saved, so an interrupted run can
+resume from the last complete episode and a re-run only converts new episodes.
+Each episode is noted before it is added to the dataset, so a run interrupted between
+writing and recording it leaves a dataset one episode ahead that the next run records
+(see EpisodeManifest.reconcile). Episodes whose source changed (or a changed config)
+cannot be patched in place and require a rebuild.
+
+Source files are only re-read when their size or mtime changed (SourceFingerprintCache).
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import pathlib
+import shutil
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from .norm_stats import read_episode_lengths
+
+
+MANIFEST_VERSION = 1
+
+
+def lerobot_home() -> pathlib.Path:
+    """Root directory under which LeRobot stores datasets."""
+    if "HF_LEROBOT_HOME" in os.environ:
+        return pathlib.Path(os.environ["HF_LEROBOT_HOME"]).expanduser()
+    return pathlib.Path.home() / ".cache" / "huggingface" / "lerobot"
+
+
+def default_manifest_path(repo_id: str) -> pathlib.Path:
+    """Manifest location next to the dataset: <lerobot_home>/<repo_id>.manifest.json."""
+    return lerobot_home() / f"{repo_id}.manifest.json"
+
+
+def default_fingerprint_cache_path(manifest_path: pathlib.Path) -> pathlib.Path:
+    """Source fingerprint cache next to a manifest: <name>.manifest.fingerprints.json."""
+    return manifest_path.with_suffix(".fingerprints.json")
+
+
+def _fingerprint_value(value: Any) -> str:
+    """JSON fallback for config values: functions/classes by qualified name, others by str().
+
+    Raises TypeError for values whose str() is a per-process memory address, which would
+    make the fingerprint differ on every run.
+    """
+    if callable(value) and hasattr(value, "__qualname__"):
+        return f"{value.__module__}.{value.__qualname__}"
+    text = str(value)
+    if " at 0x" in text:
+        raise TypeError(f"Cannot fingerprint {text}: make it a dataclass or plain value")
+    return text
+
+
+def config_fingerprint(*parts: Any) -> str:
+    """Stable hash of configuration objects (dataclasses, dicts, scalars)."""
+    normalized = [dataclasses.asdict(p) if dataclasses.is_dataclass(p) else p for p in parts]
+    payload = json.dumps(normalized, sort_keys=True, default=_fingerprint_value)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def _path_stat(path: pathlib.Path) -> list[Any]:
+    """[kind, size, mtime_ns] of a path, which changes whenever its fingerprint may."""
+    if path.is_file():
+        stat = path.stat()
+        return ["file", stat.st_size, stat.st_mtime_ns]
+    if path.is_dir():
+        return ["dir", 0, path.stat().st_mtime_ns]
+    return ["missing", 0, 0]
+
+
+def source_fingerprint(*paths: pathlib.Path, cache: "SourceFingerprintCache | None" = None) -> str:
+    """Hash of episode source data.
+
+    Files are hashed by content; directories (e.g. images/) by their mtime, which
+    changes whenever frames are added or removed. Missing paths hash as absent.
+    With a cache, the content is only re-read when a path's size or mtime changed.
+    """
+    if cache is not None:
+        return cache.fingerprint(*paths)
+    digest = hashlib.sha1()
+    for path in paths:
+        digest.update(str(path.name).encode())
+        if path.is_file():
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        elif path.is_dir():
+            digest.update(str(path.stat().st_mtime_ns).encode())
+        else:
+            digest.update(b"<missing>")
+    return digest.hexdigest()
+
+
+class SourceFingerprintCache:
+    """source_fingerprint() results keyed by the (size, mtime_ns) of their paths.
+
+    Persisted as JSON (by default next to the manifest, see default_fingerprint_cache_path),
+    so re-runs do not re-read unchanged episode files. value() caches other facts read
+    from a source file (e.g. its episode_name) the same way. Entries of sources not
+    used by a run are dropped when it saves.
+    """
+
+    def __init__(self, path: pathlib.Path):
+        self.path = pathlib.Path(path)
+        self.entries: dict[str, dict[str, Any]] = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        self._used: set[str] = set()
+
+    def fingerprint(self, *paths: pathlib.Path) -> str:
+        key = "\0".join(str(path) for path in paths)
+        stats = [_path_stat(path) for path in paths]
+        self._used.add(key)
+        entry = self.entries.get(key)
+        if entry is None or entry["stats"] != stats:
+            entry = {"stats": stats, "fingerprint": source_fingerprint(*paths)}
+            self.entries[key] = entry
+        return entry["fingerprint"]
+
+    def value(self, path: pathlib.Path, name: str, compute: Callable[[], Any]) -> Any:
+        """compute() (JSON-serializable) for path, re-run only when its size or mtime changed."""
+        key = f"{name}\0{path}"
+        stats = [_path_stat(path)]
+        self._used.add(key)
+        entry = self.entries.get(key)
+        if entry is None or entry["stats"] != stats:
+            entry = {"stats": stats, "value": compute()}
+            self.entries[key] = entry
+        return entry["value"]
+
+    def save(self) -> None:
+        """Write the cache atomically (tmp file + rename)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({key: self.entries[key] for key in sorted(self._used)}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+@dataclass
+class EpisodeRecord:
+    """One fully written episode."""
+    source: str
+    fingerprint: str
+    num_frames: int
+
+
+@dataclass
+class ConversionPlan:
+    """What a (re-)run has to do, relative to the manifest."""
+    pending: list[str]  # sources not yet written, in input order
+    changed: list[str]  # written sources whose fingerprint no longer matches
+    removed: list[str]  # written sources that no longer exist
+    config_changed: bool
+
+    @property
+    def needs_rebuild(self) -> bool:
+        return self.config_changed or bool(self.changed) or bool(self.removed)
+
+
+@dataclass
+class EpisodeManifest:
+    """Append-only record of converted episodes, persisted as JSON."""
+    path: pathlib.Path
+    config_fingerprint: str
+    episodes: list[EpisodeRecord] = field(default_factory=list)
+    writing: EpisodeRecord | None = None  # Being added to the dataset, not yet recorded
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> "EpisodeManifest | None":
+        """Load a manifest, or return None if none exists yet."""
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported manifest version in {path}: {data.get('version')}")
+        return cls(
+            path=path,
+            config_fingerprint=data["config_fingerprint"],
+            episodes=[EpisodeRecord(**e) for e in data["episodes"]],
+            writing=EpisodeRecord(**data["writing"]) if data.get("writing") else None,
+        )
+
+    def save(self) -> None:
+        """Write the manifest atomically (tmp file + rename)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {
+                    "version": MANIFEST_VERSION,
+                    "config_fingerprint": self.config_fingerprint,
+                    "episodes": [dataclasses.asdict(e) for e in self.episodes],
+                    "writing": dataclasses.asdict(self.writing) if self.writing is not None else None,
+                },
+                f,
+                indent=2,
+            )
+        os.replace(tmp_path, self.path)
+
+    @property
+    def num_written_episodes(self) -> int:
+        """Episodes present in the dataset (empty episodes are recorded but not written)."""
+        return sum(1 for e in self.episodes if e.num_frames > 0)
+
+    def plan(
+        self,
+        sources: list[tuple[str, str]],
+        config_fingerprint: str,
+        available: set[str] | None = None,
+    ) -> ConversionPlan:
+        """Compare (source, fingerprint) pairs against the recorded episodes.
+
+        Args:
+            sources: Episodes selected for this run, in conversion order.
+            config_fingerprint: Fingerprint of the current config/options.
+            available: All sources that still exist, for removal detection when
+                `sources` is only a sub-range. Defaults to the names in `sources`.
+        """
+        written = {e.source: e for e in self.episodes}
+        if available is None:
+            available = {name for name, _ in sources}
+        return ConversionPlan(
+            pending=[name for name, _ in sources if name not in written],
+            changed=[name for name, fp in sources if name in written and written[name].fingerprint != fp],
+            removed=[e.source for e in self.episodes if e.source not in available],
+            config_changed=config_fingerprint != self.config_fingerprint,
+        )
+
+    def begin(self, source: str, fingerprint: str, num_frames: int) -> None:
+        """Note an episode about to be added to the dataset (see reconcile) and persist."""
+        self.writing = EpisodeRecord(source, fingerprint, num_frames)
+        self.save()
+
+    def record(self, source: str, fingerprint: str, num_frames: int) -> None:
+        """Record a fully written episode and persist immediately."""
+        self.episodes.append(EpisodeRecord(source, fingerprint, num_frames))
+        self.writing = None
+        self.save()
+
+    def reconcile(self, dataset_root: pathlib.Path) -> None:
+        """Record the episode an interrupted run added to the dataset but not to the manifest.
+
+        The dataset's episode count is trusted: one episode more than recorded, the last of
+        the length noted by begin(), means the write completed. Otherwise the note is dropped
+        (a mismatch that remains is caught when the converter opens the dataset).
+        """
+        if self.writing is None:
+            return
+        episodes_path = dataset_root / "meta" / "episodes.jsonl"
+        lengths = list(read_episode_lengths(dataset_root).values()) if episodes_path.exists() else []
+        writing, self.writing = self.writing, None
+        if len(lengths) == self.num_written_episodes + 1 and lengths[-1] == writing.num_frames:
+            print(f"Manifest: recording {writing.source}, written to the dataset before the previous run stopped")
+            self.episodes.append(writing)
+        self.save()
+
+
+def prepare_incremental_run(
+    manifest_path: pathlib.Path,
+    dataset_root: pathlib.Path,
+    config_fp: str,
+    sources: list[tuple[str, str]],
+    available: set[str] | None = None,
+    rebuild: bool = False,
+) -> tuple[EpisodeManifest, list[str]]:
+    """Load (or start) the manifest and decide which sources still need converting.
+
+    With rebuild=True the existing dataset directory and manifest are deleted first.
+    Raises ValueError if already written episodes are stale and rebuild was not requested.
+
+    Returns:
+        (manifest, pending source names in conversion order)
+    """
+    if rebuild:
+        if dataset_root.exists():
+            print(f"Rebuild requested, removing existing dataset: {dataset_root}")
+            shutil.rmtree(dataset_root)
+        manifest_path.unlink(missing_ok=True)
+
+    manifest = EpisodeManifest.load(manifest_path)
+    if manifest is None:
+        return EpisodeManifest(manifest_path, config_fp), [name for name, _ in sources]
+
+    manifest.reconcile(dataset_root)
+    plan = manifest.plan(sources, config_fp, available)
+    if plan.needs_rebuild:
+        reasons = []
+        if plan.config_changed:
+            reasons.append("robot config / conversion options changed")
+        if plan.changed:
+            reasons.append(f"source changed: {plan.changed}")
+        if plan.removed:
+            reasons.append(f"source removed: {plan.removed}")
+        raise ValueError(
+            f"Existing dataset is out of date ({'; '.join(reasons)}). "
+            f"Re-run with --rebuild to convert from scratch. Manifest: {manifest_path}"
+        )
+
+    print(
+        f"Manifest: {len(manifest.episodes)} episodes already converted, "
+        f"{len(plan.pending)} pending ({manifest_path})"
+    )
+    return manifest, plan.pending
@@ -0,0 +1,404 @@
+"""
+Low-dimensional frame data of a LeRobot dataset for norm-stat computation.
+
+compute_norm_stats.py only needs `state` and `actions`, but the training data loader
+decodes every image of every frame before the transforms run. The helpers here read
+the non-image columns of a LeRobot v2 dataset straight from its parquet files (image
+columns are never read, videos never opened) and rebuild what LeRobotDataset returns
+per frame, for whole batches of frames at once:
+
+    <column>            (B, ...) every non-image feature (state, actions, index, ...)
+    <key>               (B, H, ...) for action-sequence keys: frames t..t+H-1, clamped
+                        to the episode like LeRobot's delta_timestamps
+    <key>_is_pad        (B, H) bool, True where the chunk ran past the episode end
+    task                (B,) task string of each frame
+    <image key>         (B, 3, 1, 1) float32 zeros: placeholders so input transforms
+                        that look up the camera keys still run
+
+Frames are in dataset order (episode by episode, as `index`), so batches match those
+of an unshuffled data loader.
+
+VectorStats is a mergeable alternative to openpi's RunningStats for computing the
+stats in parallel: each worker summarizes a disjoint set of episodes (count, mean, M2,
+min/max and a fixed-size histogram per dimension), and the summaries are combined with
+the parallel variance formula. Mean and std match a serial pass up to floating-point
+rounding. q01/q99 are approximate: they come from the merged histograms, re-binned
+once onto the combined range, while RunningStats re-bins as its range grows, so the two
+histogram quantiles typically differ by a few bins.
+
+EpisodeStatsCache persists one VectorStats per episode, keyed by a fingerprint of the
+episode's feature columns, so norm stats can be updated incrementally: only new or changed
+episodes are computed, stats of removed episodes are dropped, and the totals are
+re-merged from the cached episodes (in episode order, so an update is bit-identical
+to recomputing every episode).
+"""
+
+import hashlib
+import json
+import os
+import pathlib
+import shutil
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+
+
+# LeRobot feature dtypes whose values are frames (never read here)
+IMAGE_DTYPES = ("image", "video")
+
+# Columns every LeRobot v2 parquet file has
+INDEX_COLUMNS = ("timestamp", "frame_index", "episode_index", "index", "task_index")
+
+EPISODE_STATS_VERSION = 2
+
+# Histogram bins per dimension (openpi's RunningStats uses the same resolution)
+NUM_QUANTILE_BINS = 5000
+
+
+@dataclass
+class FrameColumns:
+    """Non-image columns of a whole LeRobot dataset, in dataset order."""
+    columns: dict[str, np.ndarray]
+    image_keys: list[str]
+    tasks: dict[int, str]
+    fps: int
+
+    def __len__(self) -> int:
+        return len(self.columns["index"])
+
+
+def _column_to_numpy(column: Any) -> np.ndarray:
+    """(N, ...) array of a pyarrow column; list columns are flattened without Python objects."""
+    import pyarrow as pa
+
+    array = column.combine_chunks()
+    shape = [len(array)]
+    while pa.types.is_list(array.type) or pa.types.is_large_list(array.type) or pa.types.is_fixed_size_list(array.type):
+        flat = array.flatten()
+        shape.append(len(flat) // len(array) if len(array) else 0)
+        array = flat
+    return array.to_numpy(zero_copy_only=False).reshape(shape)
+
+
+def _read_jsonl(path: pathlib.Path) -> list[dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def read_episode_lengths(dataset_root: pathlib.Path) -> dict[int, int]:
+    """{episode_index: frames} of a LeRobot v2 dataset, in episode order."""
+    episodes = _read_jsonl(dataset_root / "meta" / "episodes.jsonl")
+    return {record["episode_index"]: record["length"] for record in sorted(episodes, key=lambda r: r["episode_index"])}
+
+
+def read_frame_columns(dataset_root: pathlib.Path, episodes: list[int] | None = None) -> FrameColumns:
+    """Read every non-image column of a LeRobot v2 dataset (or of some episodes), episode by episode."""
+    # pyarrow is a LeRobot dependency; imported here so the rest of pipeline works without it
+    import pyarrow.parquet as pq
+
+    with open(dataset_root / "meta" / "info.json", 'r', encoding='utf-8') as f:
+        info = json.load(f)
+    features = info["features"]
+    image_keys = [key for key, feature in features.items() if feature["dtype"] in IMAGE_DTYPES]
+    names = [key for key in features if key not in image_keys]
+    names += [name for name in INDEX_COLUMNS if name not in names]
+
+    if episodes is None:
+        episodes = list(read_episode_lengths(dataset_root))
+    tasks = {record["task_index"]: record["task"] for record in _read_jsonl(dataset_root / "meta" / "tasks.jsonl")}
+
+    parts: dict[str, list[np.ndarray]] = {name: [] for name in names}
+    chunks_size = info["chunks_size"]
+    for episode_index in sorted(episodes):
+        path = dataset_root / info["data_path"].format(
+            episode_chunk=episode_index // chunks_size, episode_index=episode_index
+        )
+        table = pq.read_table(path, columns=names)
+        for name in names:
+            parts[name].append(_column_to_numpy(table.column(name)))
+
+    columns = {name: np.concatenate(values) for name, values in parts.items() if values}
+    return FrameColumns(columns, image_keys, tasks, info["fps"])
+
+
+def action_chunk_indices(episode_index: np.ndarray, horizon: int) -> tuple[np.ndarray, np.ndarray]:
+    """(N, horizon) row indices of frames t..t+horizon-1 clamped to each frame's episode,
+    and the (N, horizon) padding mask (LeRobot `<key>_is_pad`)."""
+    count = len(episode_index)
+    # Last row of each frame's episode (episodes are contiguous runs of episode_index)
+    boundaries = np.flatnonzero(np.diff(episode_index)) + 1
+    episode_ends = np.append(boundaries, count)
+    last_row = np.repeat(episode_ends - 1, np.diff(np.concatenate([[0], episode_ends])))
+    wanted = np.arange(count)[:, None] + np.arange(horizon)[None, :]
+    return np.minimum(wanted, last_row[:, None]), wanted > last_row[:, None]
+
+
+def frame_batches(
+    frames: FrameColumns,
+    action_keys: tuple[str, ...],
+    horizon: int,
+    batch_frames: int,
+    rows: np.ndarray | None = None,
+) -> Iterator[dict[str, np.ndarray]]:
+    """Batches of what LeRobotDataset returns per frame (see module docstring).
+
+    Args:
+        action_keys: Columns returned as action chunks (DataConfig.action_sequence_keys).
+        horizon: Chunk length (model action_horizon).
+        batch_frames: Frames per batch.
+        rows: Frames to return, in this order (default: all, in dataset order).
+    """
+    if rows is None:
+        rows = np.arange(len(frames))
+    chunk_rows, is_pad = action_chunk_indices(frames.columns["episode_index"], horizon)
+    task_names = np.array([frames.tasks.get(i, "") for i in range(max(frames.tasks, default=-1) + 1)], dtype=np.str_)
+    for start in range(0, len(rows), batch_frames):
+        batch_rows = rows[start:start + batch_frames]
+        batch = {}
+        for name, values in frames.columns.items():
+            if name in action_keys:
+                batch[name] = values[chunk_rows[batch_rows]]
+                batch[f"{name}_is_pad"] = is_pad[batch_rows]
+            else:
+                batch[name] = values[batch_rows]
+        if len(task_names):
+            batch["task"] = task_names[frames.columns["task_index"][batch_rows]]
+        for key in frames.image_keys:
+            batch[key] = np.zeros((len(batch_rows), 3, 1, 1), dtype=np.float32)
+        yield batch
+
+
+def episode_fingerprint(frames: FrameColumns) -> str:
+    """Hash of one episode's feature columns and task text (not its numbering or timestamps)."""
+    digest = hashlib.sha1()
+    for name in sorted(frames.columns):
+        if name in INDEX_COLUMNS:
+            continue
+        values = np.ascontiguousarray(frames.columns[name])
+        digest.update(f"{name}:{values.dtype.str}:{values.shape}".encode())
+        digest.update(values.tobytes())
+    for task_index in frames.columns["task_index"]:
+        digest.update(frames.tasks.get(int(task_index), "").encode() + b"\0")
+    return digest.hexdigest()
+
+
+def episode_stats_key(fingerprint: str, num_frames: int, length: int) -> str:
+    """Cache key of the stats of an episode's first num_frames frames (its fingerprint if all of them)."""
+    return fingerprint if num_frames == length else f"{fingerprint}-{num_frames}"
+
+
+class VectorStats:
+    """Mergeable per-dimension count, mean, M2, min/max and histogram of (..., width) vectors."""
+
+    def __init__(self, width: int, bins: int = NUM_QUANTILE_BINS):
+        self.count = 0
+        self.mean = np.zeros(width)
+        self.m2 = np.zeros(width)  # Sum of squared deviations from the mean
+        self.min = np.full(width, np.inf)
+        self.max = np.full(width, -np.inf)
+        self.histogram = np.zeros((width, bins))  # Counts over [min, max] per dimension
+
+    @property
+    def width(self) -> int:
+        return len(self.mean)
+
+    @property
+    def bins(self) -> int:
+        return self.histogram.shape[1]
+
+    def add(self, values: np.ndarray) -> None:
+        """Add a batch of vectors (all leading axes are flattened, like RunningStats.update)."""
+        values = np.asarray(values, dtype=np.float64).reshape(-1, self.width)
+        if not len(values):
+            return
+        batch = VectorStats(self.width, self.bins)
+        batch.count = len(values)
+        batch.mean = values.mean(axis=0)
+        batch.m2 = ((values - batch.mean) ** 2).sum(axis=0)
+        batch.min = values.min(axis=0)
+        batch.max = values.max(axis=0)
+        batch.histogram = _histogram(values.T, batch.min, batch.max, self.bins)
+        self.merge(batch)
+
+    def merge(self, *others: "VectorStats") -> None:
+        """Add the statistics of other episodes (or workers); histograms are re-binned once."""
+        others = [other for other in others if other.count]
+        if not others:
+            return
+        parts = [self, *others] if self.count else others
+        low = np.min([part.min for part in parts], axis=0)
+        high = np.max([part.max for part in parts], axis=0)
+        self.accumulate(parts, low, high)
+
+    def accumulate(self, parts: Iterable["VectorStats"], low: np.ndarray, high: np.ndarray) -> None:
+        """Replace these stats with the merge of parts whose values all lie in [low, high].
+
+        parts may be a generator that loads them one at a time, so only one part's
+        histogram is in memory at once.
+        """
+        count, mean, m2 = 0, np.zeros(self.width), np.zeros(self.width)
+        histogram = np.zeros((self.width, self.bins))
+        for part in parts:
+            if not part.count:
+                continue
+            # Parallel variance formula (Chan et al.)
+            total = count + part.count
+            delta = part.mean - mean
+            mean = mean + delta * (part.count / total)
+            m2 = m2 + part.m2 + delta ** 2 * (count * part.count / total)
+            count = total
+            histogram += _rebin(part.histogram, part.min, part.max, low, high)
+
+        self.count, self.mean, self.m2 = count, mean, m2
+        self.min, self.max, self.histogram = low, high, histogram
+
+    def quantiles(self, quantiles: list[float]) -> list[np.ndarray]:
+        """Per-dimension quantiles: left edge of the bin where the cumulative count reaches q * count."""
+        cumulative = np.cumsum(self.histogram, axis=1)
+        edges = self.min[:, None] + (self.max - self.min)[:, None] * np.arange(self.bins + 1) / self.bins
+        results = []
+        for q in quantiles:
+            index = np.minimum((cumulative < q * self.count).sum(axis=1), self.bins)
+            results.append(edges[np.arange(self.width), index])
+        return results
+
+    def statistics(self) -> dict[str, np.ndarray]:
+        """mean, std, q01 and q99 (the fields of openpi's NormStats)."""
+        if self.count < 2:
+            raise ValueError("Cannot compute statistics for less than 2 vectors.")
+        q01, q99 = self.quantiles([0.01, 0.99])
+        return {"mean": self.mean, "std": np.sqrt(self.m2 / self.count), "q01": q01, "q99": q99}
+
+
+def _histogram(
+    values: np.ndarray,
+    low: np.ndarray,
+    high: np.ndarray,
+    bins: int,
+    weights: np.ndarray | None = None,
+) -> np.ndarray:
+    """(width, bins) histograms of (width, N) values over [low, high] per row; constant rows fall in bin 0."""
+    span = high - low
+    scale = np.divide(bins, span, out=np.zeros_like(span), where=span > 0)
+    index = np.clip(((values - low[:, None]) * scale[:, None]).astype(np.int64), 0, bins - 1)
+    index += np.arange(len(values))[:, None] * bins
+    flat_weights = None if weights is None else weights.ravel()
+    counts = np.bincount(index.ravel(), weights=flat_weights, minlength=len(values) * bins)
+    return counts.reshape(len(values), bins).astype(np.float64)
+
+
+def _rebin(histogram: np.ndarray, low: np.ndarray, high: np.ndarray, new_low: np.ndarray, new_high: np.ndarray) -> np.ndarray:
+    """Move each bin's count to the bin of the new range containing its center."""
+    if np.array_equal(low, new_low) and np.array_equal(high, new_high):
+        return histogram
+    bins = histogram.shape[1]
+    centers = low[:, None] + (high - low)[:, None] * (np.arange(bins) + 0.5) / bins
+    return _histogram(centers, new_low, new_high, bins, weights=histogram)
+
+
+class EpisodeStatsCache:
+    """Per-episode VectorStats of one dataset, as <directory>/<key>.npz files (see episode_stats_key).
+
+    index.json records the fingerprint of everything else the stats depend on
+    (config, transforms, action horizon); a cache written with a different one is cleared.
+    It also holds the fingerprints of episodes a converter has just written (see
+    record_episode), so they need not be re-read from the parquet files.
+    """
+
+    def __init__(self, directory: pathlib.Path, config_fingerprint: str):
+        self.directory = pathlib.Path(directory)
+        self.config_fingerprint = config_fingerprint
+        self.index_path = self.directory / "index.json"
+        self.index = {}
+        if self.index_path.exists():
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+        if self.index.get("version") != EPISODE_STATS_VERSION or self.index.get("config_fingerprint") != config_fingerprint:
+            if self.index:
+                print(f"Config changed since {self.directory} was written; recomputing every episode")
+            if self.directory.exists():
+                shutil.rmtree(self.directory)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.index = {"version": EPISODE_STATS_VERSION, "config_fingerprint": config_fingerprint}
+            self._write_index()
+
+    def _write_index(self) -> None:
+        tmp_path = self.index_path.with_suffix(".json.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def record_episode(self, episode_index: int, fingerprint: str, length: int) -> None:
+        """Note the fingerprint of an episode just written to the dataset."""
+        self.index.setdefault("episodes", {})[str(episode_index)] = {"fingerprint": fingerprint, "length": length}
+        self._write_index()
+
+    def recorded_episodes(self) -> dict[int, tuple[str, int]]:
+        """episode index -> (fingerprint, length) of the episodes noted by record_episode."""
+        return {
+            int(episode): (entry["fingerprint"], entry["length"])
+            for episode, entry in self.index.get("episodes", {}).items()
+        }
+
+    def forget_episodes(self) -> None:
+        """Drop the recorded episode fingerprints (they only hold until the dataset changes)."""
+        if self.index.pop("episodes", None) is not None:
+            self._write_index()
+
+    def path(self, fingerprint: str) -> pathlib.Path:
+        return self.directory / f"{fingerprint}.npz"
+
+    def __contains__(self, fingerprint: str) -> bool:
+        return self.path(fingerprint).exists()
+
+    def fingerprints(self) -> set[str]:
+        return {path.stem for path in self.directory.glob("*.npz")}
+
+    def save(self, fingerprint: str, stats: dict[str, VectorStats]) -> None:
+        """Write one episode's stats atomically (tmp file + rename)."""
+        arrays = {}
+        for key, value in stats.items():
+            arrays[f"{key}.count"] = np.int64(value.count)
+            arrays[f"{key}.mean"] = value.mean
+            arrays[f"{key}.m2"] = value.m2
+            arrays[f"{key}.min"] = value.min
+            arrays[f"{key}.max"] = value.max
+            # Per-episode histograms hold whole counts
+            arrays[f"{key}.histogram"] = value.histogram.astype(np.int32)
+        # np.savez appends .npz to names without it, so write to a .tmp.npz and rename
+        tmp_path = self.directory / f"{fingerprint}.tmp.npz"
+        np.savez_compressed(tmp_path, **arrays)
+        os.replace(tmp_path, self.path(fingerprint))
+
+    def load(self, fingerprint: str, key: str, histogram: bool = True) -> VectorStats:
+        """One episode's stats of a key (without the histogram: count, moments and range only)."""
+        with np.load(self.path(fingerprint)) as data:
+            stats = VectorStats(len(data[f"{key}.mean"]), bins=0)
+            stats.count = int(data[f"{key}.count"])
+            stats.mean = data[f"{key}.mean"]
+            stats.m2 = data[f"{key}.m2"]
+            stats.min = data[f"{key}.min"]
+            stats.max = data[f"{key}.max"]
+            if histogram:
+                stats.histogram = data[f"{key}.histogram"].astype(np.float64)
+        return stats
+
+    def remove_except(self, fingerprints: set[str]) -> int:
+        """Delete the stats of episodes no longer in the dataset; returns how many were removed."""
+        removed = self.fingerprints() - fingerprints
+        for fingerprint in removed:
+            self.path(fingerprint).unlink()
+        return len(removed)
+
+    def merge(self, fingerprints: list[str], key: str) -> VectorStats:
+        """Merged stats of episodes, loading one episode histogram at a time."""
+        ranges = [self.load(fingerprint, key, histogram=False) for fingerprint in fingerprints]
+        counted = [part for part in ranges if part.count]
+        if not counted:
+            raise ValueError(f"No cached frames for '{key}'")
+        stats = VectorStats(counted[0].width)
+        low = np.min([part.min for part in counted], axis=0)
+        high = np.max([part.max for part in counted], axis=0)
+        stats.accumulate((self.load(fingerprint, key) for fingerprint in fingerprints), low, high)
+        return stats
@@ -0,0 +1,170 @@
+"""
+Sizing of the decode and image-writer pools of a conversion run.
+
+A LeRobot conversion has two parallel stages per frame: decoding/resizing the source
+JPEG and encoding the resized frame to PNG in the dataset's image writer. Fixed pool
+sizes either leave cores idle (large machines) or oversubscribe them (laptops), and
+an unbounded hand-off between the stages lets frames pile up in memory whenever
+writing falls behind.
+
+plan_pools() splits the available cores between the stages in proportion to their
+per-frame cost, measured on a few sample frames with measure_frame_costs(), and
+bounds the number of frames in flight by a memory budget. ordered_map() runs the
+decode stage with at most that many frames pending, so when the consumer blocks on
+a full writer queue, decoding stalls too.
+"""
+
+import io
+import math
+import os
+import pathlib
+import time
+from collections import deque
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, TypeVar
+
+import numpy as np
+from PIL import Image
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Image-writer threads per writer process before another process is added
+WRITER_THREADS_PER_PROCESS = 4
+
+# Memory for decoded frames waiting to be written (decode results + writer queue)
+DEFAULT_QUEUE_MB = 512
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (respects affinity masks / cgroup cpusets)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+@dataclass(frozen=True)
+class FrameCosts:
+    """Measured single-core seconds per frame of each stage."""
+    decode_s: float
+    write_s: float
+    frame_bytes: int
+    samples: int
+
+
+def measure_frame_costs(
+    image_paths: Iterable[pathlib.Path],
+    decode: Callable[[pathlib.Path], np.ndarray],
+) -> FrameCosts | None:
+    """Time decode() and a PNG encode (what the image writer does) on sample frames.
+
+    Returns None if no sample could be decoded.
+    """
+    decode_s = write_s = 0.0
+    frame_bytes = samples = 0
+    for path in image_paths:
+        start = time.perf_counter()
+        try:
+            image = decode(path)
+        except Exception:
+            continue
+        middle = time.perf_counter()
+        Image.fromarray(image).save(io.BytesIO(), format="PNG")
+        end = time.perf_counter()
+        decode_s += middle - start
+        write_s += end - middle
+        frame_bytes = max(frame_bytes, image.nbytes)
+        samples += 1
+    if samples == 0:
+        return None
+    return FrameCosts(decode_s / samples, write_s / samples, frame_bytes, samples)
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """Decode threads, LeRobot image-writer processes/threads and the in-flight frame bound."""
+    decode_threads: int
+    writer_processes: int  # 0: writer threads run in the converter process
+    writer_threads: int  # Per writer process
+    queue_frames: int
+
+    @property
+    def writer_workers(self) -> int:
+        return max(self.writer_processes, 1) * self.writer_threads
+
+    @property
+    def decode_ahead(self) -> int:
+        """Decoded frames allowed to wait for the consumer (half of queue_frames)."""
+        return max(self.queue_frames // 2, 1)
+
+    @property
+    def writer_backlog(self) -> int:
+        """Frames allowed in the image writer's queue (the other half)."""
+        return max(self.queue_frames - self.decode_ahead, 1)
+
+    def describe(self) -> str:
+        writer = (
+            f"{self.writer_processes} processes x {self.writer_threads} threads"
+            if self.writer_processes else f"{self.writer_threads} threads"
+        )
+        return f"decode {self.decode_threads} threads, image writer {writer}, queue {self.queue_frames} frames"
+
+
+def plan_pools(
+    cpus: int,
+    costs: FrameCosts | None,
+    queue_mb: int = DEFAULT_QUEUE_MB,
+    frame_bytes: int = 224 * 224 * 3,
+) -> PoolConfig:
+    """Split cpus between decoding and image writing so both stages keep pace.
+
+    One core is left for the converter's main loop. Without measured costs the
+    stages are assumed to be equally expensive.
+    """
+    workers = max(cpus - 1, 2)
+    if costs is not None and costs.decode_s + costs.write_s > 0:
+        decode_share = costs.decode_s / (costs.decode_s + costs.write_s)
+        frame_bytes = costs.frame_bytes or frame_bytes
+    else:
+        decode_share = 0.5
+    decode_threads = min(max(round(workers * decode_share), 1), workers - 1)
+    writer_workers = workers - decode_threads
+
+    if writer_workers <= WRITER_THREADS_PER_PROCESS:
+        writer_processes, writer_threads = 0, writer_workers
+    else:
+        writer_processes = math.ceil(writer_workers / WRITER_THREADS_PER_PROCESS)
+        writer_threads = math.ceil(writer_workers / writer_processes)
+
+    # Enough frames in flight to keep every worker busy, capped by the memory budget
+    memory_cap = max(queue_mb * 1024 ** 2 // frame_bytes, 1)
+    queue_frames = int(min(memory_cap, 4 * (decode_threads + writer_workers)))
+    return PoolConfig(decode_threads, writer_processes, writer_threads, max(queue_frames, 2))
+
+
+def ordered_map(
+    executor: Executor,
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    max_pending: int,
+) -> Iterator[R]:
+    """executor.map() in order with at most max_pending submitted but unconsumed items.
+
+    Unlike Executor.map, items are submitted lazily, so a slow consumer stalls the
+    producer instead of letting results accumulate.
+    """
+    pending: deque[Future] = deque()
+    iterator = iter(items)
+    try:
+        for item in iterator:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
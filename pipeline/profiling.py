@@ -0,0 +1,230 @@
+"""
+Per-stage profiling for dataset conversion (--profile).
+
+A Profiler accumulates wall time, call count and bytes per named stage, the peak RSS
+of every episode, and a Chrome trace event for every stage call. Converters that
+convert episodes in worker processes give each episode its own Profiler, return it
+with the episode and merge() it into the run's Profiler, so the report and the trace
+cover every process (one trace row per process id). Stage seconds are summed over
+processes, so with workers they can add up to more than the run's wall time.
+
+The report is plain JSON; the trace uses the Chrome trace event format and opens in
+chrome://tracing or https://ui.perfetto.dev.
+
+Stages may be recorded from several threads (e.g. a decode thread pool); each thread
+gets its own trace row.
+
+On Linux the kernel's RSS high-water mark is reset (/proc/self/clear_refs) at the
+start of every episode, so each episode's peak RSS is its own; elsewhere it is the
+peak of the process so far.
+"""
+
+import json
+import os
+import pathlib
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Any, ContextManager, Iterator
+
+
+# Trace events kept per run (about 100 bytes each); stage totals are always complete
+MAX_TRACE_EVENTS = 1_000_000
+
+
+def _now_us() -> float:
+    # perf_counter is CLOCK_MONOTONIC on Linux/macOS, so timestamps of worker processes line up
+    return time.perf_counter() * 1e6
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process (since the last reset_peak_rss())."""
+    try:
+        with open("/proc/self/status", 'r') as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's RSS high-water mark (Linux); False if not supported."""
+    try:
+        with open("/proc/self/clear_refs", 'w') as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+@dataclass
+class StageStats:
+    """Totals of one stage."""
+    seconds: float = 0.0
+    calls: int = 0
+    bytes: int = 0
+
+
+class Span:
+    """A running stage; set `bytes` to attribute a data volume to it."""
+    __slots__ = ("bytes",)
+
+    def __init__(self):
+        self.bytes = 0
+
+
+class Profiler:
+    """Stage timings, per-episode peak RSS and Chrome trace events of a conversion run."""
+
+    def __init__(self, max_trace_events: int = MAX_TRACE_EVENTS):
+        self.stages: dict[str, StageStats] = {}
+        self.episodes: list[dict[str, Any]] = []
+        self.events: list[dict[str, Any]] = []
+        self.max_trace_events = max_trace_events
+        self.dropped_events = 0
+        self.start_us = _now_us()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Locks are per process; workers return their Profiler pickled
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _trace(self, name: str, category: str, start_us: float, duration_us: float, args: dict[str, Any]) -> None:
+        if len(self.events) >= self.max_trace_events:
+            self.dropped_events += 1
+            return
+        self.events.append({
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start_us,
+            "dur": duration_us,
+            "pid": os.getpid(),
+            "tid": threading.get_native_id(),
+            "args": args,
+        })
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Span]:
+        """Time one call of stage `name`."""
+        span = Span()
+        start = _now_us()
+        try:
+            yield span
+        finally:
+            duration = _now_us() - start
+            with self._lock:
+                stats = self.stages.setdefault(name, StageStats())
+                stats.seconds += duration / 1e6
+                stats.calls += 1
+                stats.bytes += span.bytes
+                self._trace(name, "stage", start, duration, {"bytes": span.bytes} if span.bytes else {})
+
+    @contextmanager
+    def episode(self, name: str, phase: str) -> Iterator[dict[str, Any]]:
+        """Time one episode's `phase` (e.g. "convert", "write") and record its peak RSS.
+
+        Yields the episode record; callers may add fields such as "frames".
+        """
+        per_episode = reset_peak_rss()
+        record = {"episode": name, "phase": phase, "pid": os.getpid()}
+        start = _now_us()
+        try:
+            yield record
+        finally:
+            duration = _now_us() - start
+            record["seconds"] = duration / 1e6
+            record["peak_rss_mb"] = peak_rss_bytes() / 1024 ** 2
+            record["peak_rss_scope"] = "episode" if per_episode else "process"
+            with self._lock:
+                self.episodes.append(record)
+                self._trace(f"{phase} {name}", "episode", start, duration, dict(record))
+
+    def merge(self, other: "Profiler") -> None:
+        """Add another profiler's stages, episodes and trace events (e.g. from a worker)."""
+        for name, stats in other.stages.items():
+            total = self.stages.setdefault(name, StageStats())
+            total.seconds += stats.seconds
+            total.calls += stats.calls
+            total.bytes += stats.bytes
+        self.episodes.extend(other.episodes)
+        room = max(self.max_trace_events - len(self.events), 0)
+        self.events.extend(other.events[:room])
+        self.dropped_events += other.dropped_events + max(len(other.events) - room, 0)
+
+    def report(self) -> dict[str, Any]:
+        """JSON-serializable summary: per-stage totals (slowest first) and episodes."""
+        wall = (_now_us() - self.start_us) / 1e6
+        stages = {}
+        for name, stats in sorted(self.stages.items(), key=lambda item: -item[1].seconds):
+            stages[name] = {
+                "seconds": stats.seconds,
+                "calls": stats.calls,
+                "bytes": stats.bytes,
+                "ms_per_call": stats.seconds * 1000.0 / max(stats.calls, 1),
+                "mb_per_s": stats.bytes / 1024 ** 2 / stats.seconds if stats.seconds > 0 else 0.0,
+                "share_of_wall": stats.seconds / wall if wall > 0 else 0.0,
+            }
+        return {
+            "wall_seconds": wall,
+            "stages": stages,
+            "episodes": self.episodes,
+            "peak_rss_mb": max((e["peak_rss_mb"] for e in self.episodes), default=peak_rss_bytes() / 1024 ** 2),
+            "trace_events": len(self.events),
+            "dropped_trace_events": self.dropped_events,
+        }
+
+    def write(self, report_path: pathlib.Path, trace_path: pathlib.Path) -> dict[str, Any]:
+        """Write the JSON report and the Chrome trace; returns the report."""
+        report = self.report()
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+        origin = min((e["ts"] for e in self.events), default=0.0)
+        events = [{**e, "ts": e["ts"] - origin} for e in self.events]
+        for pid in sorted({e["pid"] for e in self.events}):
+            name = "converter" if pid == os.getpid() else f"worker {pid}"
+            events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": name}})
+        trace_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(trace_path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return report
+
+    def print_summary(self) -> None:
+        """Table of stage totals, slowest first."""
+        report = self.report()
+        print(f"\n{'stage':<22} {'seconds':>9} {'share':>7} {'calls':>9} {'ms/call':>9} {'MB':>10} {'MB/s':>9}")
+        print("-" * 81)
+        for name, s in report["stages"].items():
+            print(
+                f"{name:<22} {s['seconds']:>9.2f} {s['share_of_wall']:>6.1%} {s['calls']:>9} "
+                f"{s['ms_per_call']:>9.3f} {s['bytes'] / 1024 ** 2:>10.1f} {s['mb_per_s']:>9.1f}"
+            )
+        print(f"Wall time {report['wall_seconds']:.2f}s, peak RSS {report['peak_rss_mb']:.0f} MB")
+
+
+def profile_stage(profiler: Profiler | None, name: str) -> ContextManager[Span]:
+    """profiler.stage(name), or a no-op context yielding a throwaway Span without a profiler."""
+    if profiler is None:
+        return nullcontext(Span())
+    return profiler.stage(name)
+
+
+def profile_episode(profiler: Profiler | None, name: str, phase: str) -> ContextManager[dict[str, Any]]:
+    """profiler.episode(name, phase), or a no-op context without a profiler."""
+    if profiler is None:
+        return nullcontext({})
+    return profiler.episode(name, phase)
@@ -0,0 +1,234 @@
+"""
+Append-only progress telemetry for long-running dataset jobs.
+
+Converters and compute_norm_stats.py append one JSON line per update to a progress
+file (<lerobot_home>/<repo_id>.progress.jsonl for conversions):
+
+    {"time": ..., "job": "conversion", "phase": "converting", "pid": ..., "host": ...,
+     "episodes_done": 12, "episodes_total": 138, "frames_done": 10800, "frames_total": null,
+     "elapsed_s": 95.1, "episodes_per_s": 0.13, "frames_per_s": 113.6, "eta_s": 793.4}
+
+Every record is self-contained, so status tools only need the last line:
+read_progress() reads a fixed-size block from the end of the file, whatever its
+length. Phases end with "done" or "failed"; a run whose process is gone without
+either is reported as interrupted (see process_alive()).
+"""
+
+import json
+import os
+import pathlib
+import socket
+import time
+from typing import Any
+
+from .manifest import lerobot_home
+
+
+TERMINAL_PHASES = ("done", "failed")
+
+# Bytes read from the end of the file; records are a few hundred bytes
+TAIL_BYTES = 64 * 1024
+
+
+def default_progress_path(repo_id: str) -> pathlib.Path:
+    """Conversion progress file next to the dataset: <lerobot_home>/<repo_id>.progress.jsonl."""
+    return lerobot_home() / f"{repo_id}.progress.jsonl"
+
+
+class ProgressWriter:
+    """Appends progress records (counts, throughput, ETA) to a JSON-lines file.
+
+    Updates closer together than min_interval seconds are coalesced; phase changes
+    and the final record are always written.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        job: str,
+        episodes_total: int | None = None,
+        frames_total: int | None = None,
+        min_interval: float = 1.0,
+        **info: Any,
+    ):
+        self.path = pathlib.Path(path)
+        self.job = job
+        self.episodes_total = episodes_total
+        self.frames_total = frames_total
+        self.min_interval = min_interval
+        self.info = info
+        self.phase = "starting"
+        self.episodes_done = 0
+        self.frames_done = 0
+        self.start_time = time.time()
+        self.work_start = self.start_time
+        self.last_write = 0.0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._write()
+
+    def _record(self) -> dict[str, Any]:
+        now = time.time()
+        elapsed = now - self.start_time
+        working = now - self.work_start
+        episodes_per_s = self.episodes_done / working if working > 0 else 0.0
+        frames_per_s = self.frames_done / working if working > 0 else 0.0
+
+        # ETA from whichever total is known, frames first (episodes vary in length)
+        eta = None
+        if self.frames_total and frames_per_s > 0:
+            eta = max(self.frames_total - self.frames_done, 0) / frames_per_s
+        elif self.episodes_total and episodes_per_s > 0:
+            eta = max(self.episodes_total - self.episodes_done, 0) / episodes_per_s
+        if self.phase == "done":
+            eta = 0.0
+
+        return {
+            "time": now,
+            "job": self.job,
+            "phase": self.phase,
+            "pid": os.getpid(),
+            "host": socket.gethostname(),
+            "episodes_done": self.episodes_done,
+            "episodes_total": self.episodes_total,
+            "frames_done": self.frames_done,
+            "frames_total": self.frames_total,
+            "elapsed_s": elapsed,
+            "episodes_per_s": episodes_per_s,
+            "frames_per_s": frames_per_s,
+            "eta_s": eta,
+            **self.info,
+        }
+
+    def _write(self) -> None:
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self._record()) + "\n")
+        self.last_write = time.monotonic()
+
+    def set_phase(self, phase: str, **info: Any) -> None:
+        """Start a new phase (always recorded); extra fields are kept in later records.
+
+        Throughput is measured from the last phase started before any work was counted,
+        so setup phases (listing images, building data loaders) do not dilute it.
+        """
+        if self.episodes_done == 0 and self.frames_done == 0:
+            self.work_start = time.time()
+        self.phase = phase
+        self.info.update(info)
+        self._write()
+
+    def update(self, episodes: int = 0, frames: int = 0) -> None:
+        """Count finished work; written at most every min_interval seconds."""
+        self.episodes_done += episodes
+        self.frames_done += frames
+        if time.monotonic() - self.last_write >= self.min_interval:
+            self._write()
+
+    def finish(self, **info: Any) -> None:
+        """Final "done" record."""
+        self.set_phase("done", **info)
+
+    def fail(self, error: BaseException) -> None:
+        """Final "failed" record with the error message."""
+        self.set_phase("failed", error=f"{type(error).__name__}: {error}")
+
+    def __enter__(self) -> "ProgressWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # Record errors (and Ctrl-C) as failed; success is marked explicitly with finish()
+        if exc is not None and self.phase not in TERMINAL_PHASES:
+            self.fail(exc)
+
+
+def read_progress(path: pathlib.Path) -> dict[str, Any] | None:
+    """Last complete record of a progress file (None if missing/empty), in constant time."""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(size - TAIL_BYTES, 0))
+            tail = f.read()
+    except FileNotFoundError:
+        return None
+
+    # The last line may be partially written; use the last one that parses
+    for line in reversed(tail.splitlines()):
+        try:
+            return json.loads(line)
+        except ValueError:
+            continue
+    return None
+
+
+def process_alive(record: dict[str, Any]) -> bool | None:
+    """Whether the process that wrote record still runs (None if on another host)."""
+    if record.get("host") != socket.gethostname():
+        return None
+    try:
+        os.kill(record["pid"], 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def format_duration(seconds: float | None) -> str:
+    """h:mm:ss, or "?" if unknown."""
+    if seconds is None:
+        return "?"
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def format_progress(record: dict[str, Any]) -> str:
+    """One-line summary of a progress record."""
+    episodes = f"{record['episodes_done']}"
+    if record.get("episodes_total"):
+        episodes += f"/{record['episodes_total']}"
+    frames = f"{record['frames_done']}"
+    if record.get("frames_total"):
+        frames += f"/{record['frames_total']} ({record['frames_done'] / record['frames_total']:.1%})"
+    return (
+        f"[{record['phase']}] episodes {episodes}, frames {frames}, "
+        f"{record['episodes_per_s']:.2f} ep/s, {record['frames_per_s']:.1f} frames/s, "
+        f"elapsed {format_duration(record['elapsed_s'])}, ETA {format_duration(record.get('eta_s'))}"
+    )
+
+
+def run_state(record: dict[str, Any]) -> str:
+    """State of the run that wrote record: done, failed, interrupted (writer gone) or running."""
+    if record["phase"] in TERMINAL_PHASES:
+        return record["phase"]
+    if process_alive(record) is False:
+        return "interrupted"
+    return "running"
+
+
+def watch_progress(path: pathlib.Path, interval: float = 5.0) -> dict[str, Any] | None:
+    """Print one status line every interval seconds until the run ends; returns the last record.
+
+    Besides the run's average throughput, each line shows the live rate since the
+    previous poll.
+    """
+    previous = None
+    while True:
+        record = read_progress(path)
+        if record is None:
+            print(f"Waiting for {path} ...")
+        else:
+            line = format_progress(record)
+            if previous is not None and record["time"] > previous["time"]:
+                dt = record["time"] - previous["time"]
+                line += (
+                    f" | live {(record['episodes_done'] - previous['episodes_done']) / dt:.2f} ep/s, "
+                    f"{(record['frames_done'] - previous['frames_done']) / dt:.1f} frames/s"
+                )
+            age = time.time() - record["time"]
+            if age > 2 * interval:
+                line += f" | last update {format_duration(age)} ago"
+            print(f"{time.strftime('%H:%M:%S')} {line}", flush=True)
+            if run_state(record) != "running":
+                return record
+            previous = record
+        time.sleep(interval)
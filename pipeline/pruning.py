@@ -0,0 +1,145 @@
+"""
+Idle and duplicate frame pruning.
+
+Teleop episodes contain long stretches where the arm is stopped: robot_mode and the
+gripper do not change, joints stay within a small threshold, and the camera sees
+almost the same image. find_kept_frames() detects these stretches and drops them
+(keeping the last frame, so motion resumes from the correct state) or subsamples
+them, before any full-size image is decoded.
+
+Image similarity uses a 64-bit difference hash (dHash) computed from a JPEG draft
+decode at 1/8 scale, so it is only a small fraction of a full decode. Hashes are only
+computed for frames whose joints already look still.
+"""
+
+import pathlib
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+from PIL import Image
+
+from config.robot_config import PruneConfig
+
+
+def _dhash(img: Image.Image) -> int:
+    small = np.asarray(img.convert("L").resize((9, 8), Image.Resampling.BILINEAR), dtype=np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def image_hash(image_path: pathlib.Path) -> int:
+    """64-bit difference hash of an image (horizontal gradients of a 9x8 thumbnail)."""
+    with Image.open(image_path) as img:
+        img.draft("L", (64, 48))
+        return _dhash(img)
+
+
+def array_hash(image: np.ndarray) -> int:
+    """image_hash() of an already decoded (height, width, 3) uint8 frame."""
+    return _dhash(Image.fromarray(image))
+
+
+def hash_distance(a: int, b: int) -> int:
+    """Hamming distance between two image hashes."""
+    return (a ^ b).bit_count()
+
+
+@dataclass
+class PruneStats:
+    """Per-episode pruning result."""
+    frames_before: int
+    frames_after: int
+    idle_stretches: int
+    bytes_saved: int  # uncompressed image + state/action bytes of removed frames
+
+    @property
+    def frames_removed(self) -> int:
+        return self.frames_before - self.frames_after
+
+
+def find_kept_frames(
+    joints: np.ndarray,
+    gripper: np.ndarray | None,
+    robot_mode: np.ndarray | None,
+    hash_fn: Callable[[int], int | None],
+    config: PruneConfig,
+) -> tuple[np.ndarray, int]:
+    """Mask of frames to keep, and the number of idle stretches found.
+
+    Args:
+        joints: (T, J) raw joint positions (in the config's joint units).
+        gripper: (T,) gripper values, or None.
+        robot_mode: (T,) robot_mode values (NaN where missing), or None.
+        hash_fn: Image hash of frame i, or None if the image is unavailable.
+        config: Pruning thresholds.
+
+    A frame is still if, relative to the frame that started the stretch (its
+    anchor), no joint moved more than joint_threshold, robot_mode and gripper are
+    unchanged and the image hash is within hash_threshold. Runs of at least
+    min_idle_frames still frames are pruned; frames within transition_margin of a
+    gripper change are always kept.
+    """
+    num_frames = len(joints)
+    keep = np.ones(num_frames, dtype=bool)
+    if num_frames < 2:
+        return keep, 0
+
+    hashes: dict[int, int | None] = {}
+
+    def cached_hash(i: int) -> int | None:
+        if i not in hashes:
+            hashes[i] = hash_fn(i)
+        return hashes[i]
+
+    def same(values: np.ndarray | None, i: int, j: int) -> bool:
+        # NaN == NaN counts as unchanged (field missing in both frames)
+        return values is None or values[i] == values[j] or (np.isnan(values[i]) and np.isnan(values[j]))
+
+    # Cheap per-frame test against the previous frame before touching any image
+    joint_still = np.zeros(num_frames, dtype=bool)
+    joint_still[1:] = np.abs(np.diff(joints, axis=0)).max(axis=1, initial=0.0) <= config.joint_threshold
+
+    runs = []
+    anchor = 0
+    run_start = None
+    for i in range(1, num_frames + 1):
+        still = False
+        if i < num_frames and joint_still[i]:
+            anchor_hash = cached_hash(anchor)
+            frame_hash = cached_hash(i) if anchor_hash is not None else None
+            still = (
+                np.abs(joints[i] - joints[anchor]).max(initial=0.0) <= config.joint_threshold
+                and same(gripper, i, anchor)
+                and same(robot_mode, i, anchor)
+                and frame_hash is not None
+                and hash_distance(anchor_hash, frame_hash) <= config.hash_threshold
+            )
+        if still:
+            if run_start is None:
+                run_start = i
+            continue
+        if run_start is not None:
+            runs.append((run_start, i))  # still frames [run_start, i)
+            run_start = None
+        anchor = i
+
+    idle_stretches = 0
+    for start, end in runs:
+        if end - start < config.min_idle_frames:
+            continue
+        idle_stretches += 1
+        if config.mode == "drop":
+            keep[start:end - 1] = False
+        else:
+            stretch = np.zeros(end - start, dtype=bool)
+            stretch[::max(config.keep_every, 1)] = True
+            stretch[-1] = True
+            keep[start:end] = stretch
+
+    # Never prune around gripper transitions
+    if gripper is not None and config.transition_margin >= 0:
+        for t in np.flatnonzero(np.diff(gripper) != 0) + 1:
+            keep[max(t - 1 - config.transition_margin, 0):t + 1 + config.transition_margin] = True
+
+    return keep, idle_stretches
@@ -0,0 +1,119 @@
+"""
+Timestamp-based frame rate resampling.
+
+Collectors record at their own rate (e.g. 30 Hz) while datasets are declared at a
+target fps (e.g. 10 Hz). resample_grid() lays a uniform grid at the target rate over
+an episode's per-frame timestamps; episode columns are then resampled onto it:
+
+    joint_angles     linearly interpolated between the two neighbouring frames
+    scalar fields    nearest frame (robot_mode, discrete gripper fields, ...), or
+                     interpolated for the fields passed as `interpolate_fields`
+    actions          dropped (action_counts = 0), so the layout recomputes them as
+                     deltas between consecutive resampled states
+    images           nearest frame (`grid.nearest`)
+
+Episodes that were filtered (robot_mode, dropped missing frames) have holes in their
+timeline. The grid is split wherever two source frames are more than max_gap median
+intervals apart: each contiguous run gets its own grid starting at its first frame,
+so nothing is interpolated across a hole, and the first sample after a hole gets a
+zero action (like the first frame of an episode) instead of the jump across it.
+
+Everything is vectorized over the episode; no per-frame Python loop.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from config.layout import EpisodeColumns
+
+
+@dataclass
+class ResampleGrid:
+    """Target-rate sample times and where they fall between source frames."""
+    times: np.ndarray  # (N,) target timestamps
+    lower: np.ndarray  # (N,) source frame at or before each target time
+    weight: np.ndarray  # (N,) interpolation weight of frame lower + 1
+    nearest: np.ndarray  # (N,) nearest source frame
+    segment_start: np.ndarray  # (N,) bool, first sample of a contiguous run of source frames
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def interpolate(self, values: np.ndarray) -> np.ndarray:
+        """Linear interpolation of (T, ...) values onto the grid."""
+        upper = np.minimum(self.lower + 1, len(values) - 1)
+        weight = self.weight.reshape(-1, *([1] * (values.ndim - 1)))
+        return values[self.lower] * (1.0 - weight) + values[upper] * weight
+
+    def take(self, values: np.ndarray) -> np.ndarray:
+        """Nearest-frame values on the grid."""
+        return values[self.nearest]
+
+
+def source_fps(timestamps: np.ndarray) -> float:
+    """Recording rate estimated from the median frame interval."""
+    intervals = np.diff(timestamps)
+    intervals = intervals[intervals > 0]
+    if len(intervals) == 0:
+        return float("inf")
+    return float(1.0 / np.median(intervals))
+
+
+def resample_grid(timestamps: np.ndarray, fps: float, max_gap: float = 1.5) -> ResampleGrid | None:
+    """Grid at `fps` over each contiguous run of the episode, or None if it cannot be downsampled.
+
+    Runs are split where consecutive timestamps are more than max_gap median intervals
+    apart. Returns None when timestamps are missing/non-increasing or the episode is
+    already recorded at (or below) the target rate.
+    """
+    if len(timestamps) < 2 or np.isnan(timestamps).any() or np.any(np.diff(timestamps) < 0):
+        return None
+    rate = source_fps(timestamps)
+    if rate <= fps * 1.05:
+        return None
+
+    # Contiguous runs [starts[k], ends[k]] of source frames
+    breaks = np.flatnonzero(np.diff(timestamps) > max_gap / rate) + 1
+    starts = np.concatenate([[0], breaks])
+    ends = np.concatenate([breaks - 1, [len(timestamps) - 1]])
+    counts = np.floor((timestamps[ends] - timestamps[starts]) * fps).astype(np.int64) + 1
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    times = np.repeat(timestamps[starts], counts) + offsets / fps
+    segment_start = offsets == 0
+
+    lower = np.clip(np.searchsorted(timestamps, times, side="right") - 1, 0, len(timestamps) - 1)
+    upper = np.minimum(lower + 1, len(timestamps) - 1)
+    span = timestamps[upper] - timestamps[lower]
+    weight = np.divide(times - timestamps[lower], span, out=np.zeros_like(times), where=span > 0)
+    weight = np.clip(weight, 0.0, 1.0)
+    nearest = np.where(weight < 0.5, lower, upper)
+    return ResampleGrid(times=times, lower=lower, weight=weight, nearest=nearest, segment_start=segment_start)
+
+
+def resample_columns(
+    columns: EpisodeColumns,
+    grid: ResampleGrid,
+    interpolate_fields: tuple[str, ...] = (),
+) -> EpisodeColumns:
+    """Episode columns resampled onto grid (see module docstring)."""
+    fields = {}
+    for name, values in columns.fields.items():
+        if name == "timestamp":
+            fields[name] = grid.times
+        elif name in interpolate_fields:
+            fields[name] = grid.interpolate(values)
+        else:
+            fields[name] = grid.take(values)
+
+    # Recorded zero actions at the start of each run after a hole; elsewhere the
+    # layout falls back to deltas between resampled states
+    restart = grid.segment_start.copy()
+    restart[0] = False
+    return EpisodeColumns(
+        joint_angles=grid.interpolate(np.asarray(columns.joint_angles, dtype=np.float64)),
+        joint_counts=grid.take(columns.joint_counts),
+        actions=np.zeros((len(grid), int(restart.any())), dtype=np.float64),
+        action_counts=restart.astype(np.int64),
+        fields=fields,
+    )
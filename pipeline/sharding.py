@@ -0,0 +1,287 @@
+"""
+Sharded conversion across machines and merging of the partial LeRobot datasets.
+
+`--shard i/N` splits the (sorted, start/end-filtered) episode list into N contiguous
+ranges; node i converts range i into its own dataset, `<repo_id>-shard-i-of-N`. The
+split only depends on the episode list, so every node computes the same ranges, and
+merging the shards in order 0..N-1 reproduces the episode order of a single run.
+
+merge_datasets() combines shard datasets (LeRobot v2 layout) into one:
+
+    meta/info.json              totals, splits and chunk count recomputed
+    meta/tasks.jsonl            union of tasks; task_index remapped per shard
+    meta/episodes.jsonl         episodes renumbered 0..E-1 in shard order
+    meta/episodes_stats.jsonl   renumbered (v2.1); index column stats recomputed
+    meta/stats.json             frame-weighted aggregate of the shards' stats (v2.0)
+    data/chunk-*/episode_*.parquet
+    videos/chunk-*/<key>/episode_*.mp4
+
+Nothing is decoded or re-encoded. Video files are hard-linked (copied across file
+systems) under their new episode number, and a parquet file is only rewritten when
+its episode_index/index/task_index columns change. Video datasets keep no pixel data
+in the parquet files, so merge time scales with the number of episodes and frames in
+the metadata columns, not with pixel data.
+
+Image datasets (the converters' default) embed the frame bytes in the parquet files,
+so renumbering every episode after shard 0 means copying all of their pixel data.
+merge_datasets() refuses that unless called with rewrite_images=True; convert with
+--video to get shards that merge at metadata cost.
+"""
+
+import json
+import math
+import os
+import pathlib
+import shutil
+from typing import Any
+
+import numpy as np
+
+
+# Keys of meta/info.json that must agree between shards
+_COMPATIBLE_INFO_KEYS = ("codebase_version", "robot_type", "fps", "features", "chunks_size", "data_path", "video_path")
+
+# Frame-indexing columns renumbered by the merge
+_INDEX_COLUMNS = ("episode_index", "index", "task_index")
+
+
+def parse_shard(shard: str) -> tuple[int, int]:
+    """Parse "i/N" (0 <= i < N) into (i, N)."""
+    try:
+        index, count = (int(part) for part in shard.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard {shard!r}, expected i/N (e.g. 0/4)") from None
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard {shard!r}: need 0 <= i < N")
+    return index, count
+
+
+def select_shard(items: list[Any], index: int, count: int) -> list[Any]:
+    """Contiguous range `index` of `count` near-equal ranges of items."""
+    return items[len(items) * index // count:len(items) * (index + 1) // count]
+
+
+def shard_repo_id(repo_id: str, index: int, count: int) -> str:
+    """Repo ID of shard `index` of `count` of a dataset."""
+    return f"{repo_id}-shard-{index}-of-{count}"
+
+
+def _read_jsonl(path: pathlib.Path) -> list[dict[str, Any]]:
+    if not path.exists():
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _write_jsonl(path: pathlib.Path, records: list[dict[str, Any]]) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def _link_or_copy(src: pathlib.Path, dst: pathlib.Path) -> None:
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _column_stats(values: np.ndarray) -> dict[str, list[float]]:
+    """LeRobot per-episode stats of a 1D column."""
+    values = values.astype(np.float64)
+    return {
+        "min": [float(values.min())],
+        "max": [float(values.max())],
+        "mean": [float(values.mean())],
+        "std": [float(values.std())],
+        "count": [len(values)],
+    }
+
+
+def aggregate_stats(weighted: list[tuple[dict[str, Any], int]]) -> dict[str, Any]:
+    """Combine per-feature min/max/mean/std dicts, weighting mean/std by frame count."""
+    merged = {}
+    for key in weighted[0][0]:
+        parts = [(stats[key], n) for stats, n in weighted if key in stats and n > 0]
+        if not parts:
+            continue
+        total = sum(n for _, n in parts)
+        mean = sum(np.asarray(s["mean"], dtype=np.float64) * n for s, n in parts) / total
+        second = sum((np.asarray(s["std"], dtype=np.float64) ** 2 + np.asarray(s["mean"], dtype=np.float64) ** 2) * n
+                     for s, n in parts) / total
+        merged[key] = {
+            "min": np.min([np.asarray(s["min"]) for s, _ in parts], axis=0).tolist(),
+            "max": np.max([np.asarray(s["max"]) for s, _ in parts], axis=0).tolist(),
+            "mean": mean.tolist(),
+            "std": np.sqrt(np.maximum(second - mean ** 2, 0.0)).tolist(),
+        }
+    return merged
+
+
+def _check_compatible(infos: list[dict[str, Any]], roots: list[pathlib.Path]) -> None:
+    for key in _COMPATIBLE_INFO_KEYS:
+        values = [json.dumps(info.get(key), sort_keys=True) for info in infos]
+        if len(set(values)) > 1:
+            mismatched = [str(root) for root, v in zip(roots, values) if v != values[0]]
+            raise ValueError(f"Shards disagree on '{key}' ({', '.join(mismatched)} differ from {roots[0]})")
+
+
+def merge_datasets(
+    shard_roots: list[pathlib.Path],
+    output_root: pathlib.Path,
+    rewrite_images: bool = False,
+) -> dict[str, int]:
+    """Merge LeRobot datasets in shard_roots, in order, into a new dataset at output_root.
+
+    The merged dataset is assembled next to output_root and renamed into place once
+    complete, so an interrupted merge leaves no partial dataset behind.
+
+    Raises ValueError for datasets with embedded image features whose parquet files
+    would have to be rewritten (any episode after the first shard), unless
+    rewrite_images is set: that copies all of their pixel data.
+
+    Returns:
+        {"episodes", "frames", "tasks", "rewritten_parquet", "linked_files"}
+    """
+    # pyarrow is a LeRobot dependency; imported here so the rest of pipeline works without it
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if output_root.exists():
+        raise FileExistsError(f"Output dataset already exists: {output_root}")
+    infos = []
+    for root in shard_roots:
+        with open(root / "meta" / "info.json", 'r', encoding='utf-8') as f:
+            infos.append(json.load(f))
+    _check_compatible(infos, shard_roots)
+
+    info = dict(infos[0])
+    chunks_size = info["chunks_size"]
+    video_keys = [key for key, feature in info["features"].items() if feature["dtype"] == "video"]
+    image_keys = [key for key, feature in info["features"].items() if feature["dtype"] == "image"]
+    if image_keys and not rewrite_images and any(shard_info.get("total_episodes", 0) for shard_info in infos[1:]):
+        raise ValueError(
+            f"Shards store frames as embedded images ({', '.join(image_keys)}), so renumbering their "
+            f"episodes rewrites every parquet file after the first shard, copying all pixel data. "
+            f"Convert with --video for a metadata-only merge, or set rewrite_images (--rewrite_images) to copy anyway."
+        )
+
+    work_root = output_root.with_name(output_root.name + ".merging")
+    if work_root.exists():
+        shutil.rmtree(work_root)
+    (work_root / "meta").mkdir(parents=True)
+
+    tasks: dict[str, int] = {}
+    episodes, episodes_stats, shard_stats = [], [], []
+    has_episodes_stats = False
+    episode_offset = frame_offset = 0
+    rewritten = linked = 0
+
+    for root, shard_info in zip(shard_roots, infos):
+        # Tasks: merged index by first appearance of each task string
+        task_map = {}
+        for record in _read_jsonl(root / "meta" / "tasks.jsonl"):
+            task_map[record["task_index"]] = tasks.setdefault(record["task"], len(tasks))
+        remap = np.arange(max(task_map, default=-1) + 1)
+        for old, new in task_map.items():
+            remap[old] = new
+
+        stats_by_episode = {r["episode_index"]: r for r in _read_jsonl(root / "meta" / "episodes_stats.jsonl")}
+        has_episodes_stats |= bool(stats_by_episode)
+        shard_frames = 0
+
+        for record in sorted(_read_jsonl(root / "meta" / "episodes.jsonl"), key=lambda r: r["episode_index"]):
+            old_index = record["episode_index"]
+            new_index = episode_offset
+            length = record["length"]
+
+            src = root / shard_info["data_path"].format(
+                episode_chunk=old_index // chunks_size, episode_index=old_index
+            )
+            dst = work_root / info["data_path"].format(
+                episode_chunk=new_index // chunks_size, episode_index=new_index
+            )
+            # Only the small index columns are read to decide whether the file must change
+            index_table = pq.read_table(src, columns=list(_INDEX_COLUMNS))
+            new_columns = {
+                "episode_index": np.full(length, new_index, dtype=np.int64),
+                "index": np.arange(frame_offset, frame_offset + length, dtype=np.int64),
+                "task_index": remap[index_table.column("task_index").to_numpy()],
+            }
+            if all(np.array_equal(index_table.column(name).to_numpy(), new_columns[name]) for name in _INDEX_COLUMNS):
+                _link_or_copy(src, dst)
+                linked += 1
+            else:
+                if image_keys and not rewrite_images:
+                    raise ValueError(f"{src} needs renumbering, which would copy its embedded images")
+                table = pq.read_table(src)
+                for name in _INDEX_COLUMNS:
+                    position = table.schema.get_field_index(name)
+                    field = table.schema.field(position)
+                    table = table.set_column(position, field, pa.array(new_columns[name], type=field.type))
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                pq.write_table(table, dst)
+                rewritten += 1
+
+            for key in video_keys:
+                _link_or_copy(
+                    root / shard_info["video_path"].format(
+                        episode_chunk=old_index // chunks_size, video_key=key, episode_index=old_index
+                    ),
+                    work_root / info["video_path"].format(
+                        episode_chunk=new_index // chunks_size, video_key=key, episode_index=new_index
+                    ),
+                )
+                linked += 1
+
+            episodes.append({**record, "episode_index": new_index})
+            if old_index in stats_by_episode:
+                stats = dict(stats_by_episode[old_index]["stats"])
+                for name in _INDEX_COLUMNS:
+                    if name in stats:
+                        stats[name] = _column_stats(new_columns[name])
+                episodes_stats.append({"episode_index": new_index, "stats": stats})
+
+            episode_offset += 1
+            frame_offset += length
+            shard_frames += length
+
+        stats_path = root / "meta" / "stats.json"
+        if stats_path.exists():
+            with open(stats_path, 'r', encoding='utf-8') as f:
+                shard_stats.append((json.load(f), shard_frames))
+
+    _write_jsonl(work_root / "meta" / "tasks.jsonl", [{"task_index": i, "task": t} for t, i in tasks.items()])
+    _write_jsonl(work_root / "meta" / "episodes.jsonl", episodes)
+    if has_episodes_stats:
+        _write_jsonl(work_root / "meta" / "episodes_stats.jsonl", episodes_stats)
+    if shard_stats:
+        stats = aggregate_stats(shard_stats)
+        # Index columns are exact for the merged numbering (0..E-1 / 0..F-1)
+        for name, count in (("episode_index", episode_offset), ("index", frame_offset)):
+            if name in stats and count > 0:
+                stats[name] = {k: v for k, v in _column_stats(np.arange(count)).items() if k != "count"}
+        with open(work_root / "meta" / "stats.json", 'w', encoding='utf-8') as f:
+            json.dump(stats, f, indent=4)
+
+    info.update(
+        total_episodes=episode_offset,
+        total_frames=frame_offset,
+        total_tasks=len(tasks),
+        total_videos=episode_offset * len(video_keys),
+        total_chunks=math.ceil(episode_offset / chunks_size) if episode_offset else 0,
+        splits={"train": f"0:{episode_offset}"},
+    )
+    with open(work_root / "meta" / "info.json", 'w', encoding='utf-8') as f:
+        json.dump(info, f, indent=4)
+
+    output_root.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(work_root, output_root)
+    return {
+        "episodes": episode_offset,
+        "frames": frame_offset,
+        "tasks": len(tasks),
+        "rewritten_parquet": rewritten,
+        "linked_files": linked,
+    }
@@ -0,0 +1,344 @@
+"""
+Single-pass dataset validation driven by RobotConfig.
+
+validate_episode() parses one JSON (or columnar) episode once and reduces it to a
+ValidationStats: gripper value distributions (the extracted gripper and every source
+field), gripper open/close transitions, the action gripper column, joint ranges and limit
+violations, frames with missing joints/actions, the robot_mode histogram and missing
+image files. ValidationStats are mergeable (counts are summed, ranges combined), so
+episodes can be validated in worker processes and folded into one dataset report
+without ever holding more than one episode's frames.
+
+Which fields and columns are checked comes from the RobotConfig: the gripper fields
+and extraction method from GripperConfig, the action gripper column from num_joints
+(raw `actions` are [joints..., gripper]), out-of-range gripper values from
+GripperConfig.value_range, transitions as crossings of GripperConfig.threshold and
+joint violations from RobotConfig.joint_limits.
+"""
+
+import math
+import pathlib
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from config.layout import EpisodeColumns
+from config.robot_config import RobotConfig
+from .columnar import ColumnarEpisode, is_columnar_episode
+from .image_io import ImageIndex
+from .json_stream import load_json_without_images
+
+
+# Distinct values kept per histogram; further values are counted as "other"
+MAX_HISTOGRAM_VALUES = 256
+
+# Joint limits used when RobotConfig.joint_limits is None (catches unit mix-ups)
+DEFAULT_JOINT_LIMIT = {"deg": 360.0, "rad": 2 * math.pi}
+
+
+class ValueHistogram:
+    """Counts of distinct values (rounded to `decimals`), NaN counted as missing."""
+
+    def __init__(self, decimals: int = 6, max_values: int = MAX_HISTOGRAM_VALUES):
+        self.decimals = decimals
+        self.max_values = max_values
+        self.counts: dict[float, int] = {}
+        self.missing = 0
+        self.other = 0
+
+    def _count(self, value: float, count: int) -> None:
+        if value in self.counts:
+            self.counts[value] += count
+        elif len(self.counts) < self.max_values:
+            self.counts[value] = count
+        else:
+            self.other += count
+
+    def add(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        nan = np.isnan(values)
+        self.missing += int(nan.sum())
+        unique, counts = np.unique(np.round(values[~nan], self.decimals), return_counts=True)
+        for value, count in zip(unique.tolist(), counts.tolist()):
+            self._count(value, count)
+
+    def merge(self, other: "ValueHistogram") -> None:
+        for value, count in other.counts.items():
+            self._count(value, count)
+        self.missing += other.missing
+        self.other += other.other
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "values": {f"{value:g}": count for value, count in sorted(self.counts.items())},
+            "missing": self.missing,
+            "other": self.other,
+        }
+
+
+class RangeStats:
+    """Per-column count, min, max, mean and std of a (T, width) array, NaN ignored."""
+
+    def __init__(self, width: int):
+        self.count = np.zeros(width, dtype=np.int64)
+        self.min = np.full(width, np.inf)
+        self.max = np.full(width, -np.inf)
+        self.sum = np.zeros(width)
+        self.sum_sq = np.zeros(width)
+
+    def add(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64).reshape(len(values), len(self.count))
+        valid = ~np.isnan(values)
+        self.count += valid.sum(axis=0)
+        self.min = np.fmin(self.min, np.where(valid, values, np.inf).min(axis=0, initial=np.inf))
+        self.max = np.fmax(self.max, np.where(valid, values, -np.inf).max(axis=0, initial=-np.inf))
+        zeroed = np.where(valid, values, 0.0)
+        self.sum += zeroed.sum(axis=0)
+        self.sum_sq += (zeroed ** 2).sum(axis=0)
+
+    def merge(self, other: "RangeStats") -> None:
+        self.count += other.count
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        self.sum += other.sum
+        self.sum_sq += other.sum_sq
+
+    def to_dict(self) -> dict[str, Any]:
+        count = np.maximum(self.count, 1)
+        mean = self.sum / count
+        std = np.sqrt(np.maximum(self.sum_sq / count - mean ** 2, 0.0))
+        empty = self.count == 0
+
+        def column(values: np.ndarray) -> list[float | None]:
+            return [None if e else float(v) for v, e in zip(values, empty)]
+
+        return {
+            "count": self.count.tolist(),
+            "min": column(self.min),
+            "max": column(self.max),
+            "mean": column(mean),
+            "std": column(std),
+        }
+
+
+def joint_limits(config: RobotConfig) -> np.ndarray:
+    """(num_joints, 2) joint (min, max) in joint_units, ±360°/±2π if not configured."""
+    if config.joint_limits is not None:
+        limits = np.asarray(config.joint_limits, dtype=np.float64)
+        if limits.shape != (config.num_joints, 2):
+            raise ValueError(f"joint_limits must have {config.num_joints} (min, max) pairs, got {limits.shape}")
+        return limits
+    limit = DEFAULT_JOINT_LIMIT[config.joint_units]
+    return np.tile([-limit, limit], (config.num_joints, 1))
+
+
+@dataclass
+class ValidationStats:
+    """Mergeable validation statistics of one episode or a whole dataset."""
+    num_joints: int
+    gripper_fields: tuple[str, ...]
+    episodes: int = 0
+    frames_total: int = 0  # Before robot_mode filtering
+    frames: int = 0  # Frames the converters use
+    short_joint_frames: int = 0
+    missing_action_frames: int = 0
+    gripper: ValueHistogram = field(default_factory=ValueHistogram)
+    gripper_sources: dict[str, ValueHistogram] = field(default_factory=dict)
+    gripper_out_of_range: int = 0
+    gripper_rising: int = 0
+    gripper_falling: int = 0
+    episodes_without_transitions: int = 0
+    action_gripper: RangeStats = None
+    action_gripper_nonzero: int = 0
+    joints: RangeStats = None
+    joint_violations: np.ndarray = None  # (num_joints,) frames outside the limits, per joint
+    frames_with_joint_violations: int = 0
+    robot_mode: ValueHistogram = field(default_factory=lambda: ValueHistogram(decimals=0))
+    images_checked: bool = False
+    missing_images: int = 0
+    episodes_with_missing_images: int = 0
+    per_episode: list[dict[str, Any]] = field(default_factory=list)
+    errors: list[dict[str, str]] = field(default_factory=list)
+
+    def __post_init__(self):
+        for name in self.gripper_fields:
+            self.gripper_sources.setdefault(name, ValueHistogram())
+        if self.action_gripper is None:
+            self.action_gripper = RangeStats(1)
+        if self.joints is None:
+            self.joints = RangeStats(self.num_joints)
+        if self.joint_violations is None:
+            self.joint_violations = np.zeros(self.num_joints, dtype=np.int64)
+
+    @classmethod
+    def for_config(cls, config: RobotConfig) -> "ValidationStats":
+        gripper_fields = config.compile().gripper.fields if config.gripper is not None else ()
+        return cls(num_joints=config.num_joints, gripper_fields=tuple(dict.fromkeys(gripper_fields)))
+
+    def merge(self, other: "ValidationStats") -> None:
+        """Add another episode's (or worker's) statistics."""
+        for name in ("episodes", "frames_total", "frames", "short_joint_frames", "missing_action_frames",
+                     "gripper_out_of_range", "gripper_rising", "gripper_falling", "episodes_without_transitions",
+                     "action_gripper_nonzero", "frames_with_joint_violations", "missing_images",
+                     "episodes_with_missing_images"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.gripper.merge(other.gripper)
+        for name, histogram in other.gripper_sources.items():
+            self.gripper_sources.setdefault(name, ValueHistogram()).merge(histogram)
+        self.action_gripper.merge(other.action_gripper)
+        self.joints.merge(other.joints)
+        self.joint_violations += other.joint_violations
+        self.robot_mode.merge(other.robot_mode)
+        self.images_checked |= other.images_checked
+        self.per_episode.extend(other.per_episode)
+        self.errors.extend(other.errors)
+
+    def report(self, config: RobotConfig) -> dict[str, Any]:
+        """JSON-serializable dataset report."""
+        report = {
+            "robot": config.name,
+            "episodes": self.episodes,
+            "failed_episodes": len(self.errors),
+            "frames_total": self.frames_total,
+            "frames": self.frames,
+            "filter_robot_mode": config.filter_robot_mode,
+            "robot_mode": self.robot_mode.to_dict(),
+            "joints": {
+                "units": config.joint_units,
+                "limits": joint_limits(config).tolist(),
+                **self.joints.to_dict(),
+                "violations": self.joint_violations.tolist(),
+                "frames_with_violations": self.frames_with_joint_violations,
+                "short_frames": self.short_joint_frames,
+            },
+            "missing_action_frames": self.missing_action_frames,
+            "gripper": None,
+            "images": {
+                "checked": self.images_checked,
+                "missing": self.missing_images,
+                "episodes_with_missing": self.episodes_with_missing_images,
+            },
+            "per_episode": self.per_episode,
+            "errors": self.errors,
+        }
+        if config.gripper is not None:
+            report["gripper"] = {
+                "field": config.gripper.field_name,
+                "extraction_method": config.gripper.extraction_method,
+                "value_range": list(config.gripper.value_range),
+                "values": self.gripper.to_dict(),
+                "out_of_range": self.gripper_out_of_range,
+                "sources": {name: histogram.to_dict() for name, histogram in self.gripper_sources.items()},
+                "transitions": {
+                    "rising": self.gripper_rising,
+                    "falling": self.gripper_falling,
+                    "episodes_without_transitions": self.episodes_without_transitions,
+                },
+                "action_column": config.num_joints,
+                "action": {
+                    **{k: v[0] for k, v in self.action_gripper.to_dict().items()},
+                    "nonzero": self.action_gripper_nonzero,
+                },
+            }
+        return report
+
+
+def read_episode(
+    episode_path: pathlib.Path,
+    scalar_fields: tuple[str, ...],
+) -> tuple[str, EpisodeColumns, list[str]]:
+    """(episode name, columns, image file names) of a JSON or columnar episode, parsed once."""
+    if is_columnar_episode(episode_path):
+        episode = ColumnarEpisode.load(episode_path)
+        return episode.episode_name, episode.columns, episode.image_file_names()
+
+    data = load_json_without_images(episode_path)
+    frames = data['frames']
+    image_names = [frame.get('image_path', f"frame_{frame['frame_id']:06d}.jpg") for frame in frames]
+    return data['episode_name'], EpisodeColumns.from_frames(frames, scalar_fields), image_names
+
+
+def validate_episode(
+    episode_path: pathlib.Path,
+    config: RobotConfig,
+    images_base_dir: pathlib.Path | None = None,
+) -> ValidationStats:
+    """Validation statistics of one episode; load errors are recorded, not raised."""
+    stats = ValidationStats.for_config(config)
+    layout = config.compile()
+    try:
+        episode_name, columns, image_names = read_episode(
+            episode_path, (*stats.gripper_fields, 'robot_mode'),
+        )
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        stats.errors.append({"episode": episode_path.name, "error": f"{type(e).__name__}: {e}"})
+        return stats
+
+    stats.episodes = 1
+    stats.frames_total = len(columns)
+    robot_mode = columns.field('robot_mode')
+    stats.robot_mode.add(robot_mode)
+
+    # Validate the frames the converters keep
+    if config.filter_robot_mode is not None:
+        keep = robot_mode == config.filter_robot_mode
+        columns = columns.select(keep)
+        image_names = [name for name, k in zip(image_names, keep) if k]
+    stats.frames = len(columns)
+    summary = {"episode": episode_name, "source": episode_path.name, "frames": len(columns)}
+
+    # Joints
+    stats.short_joint_frames = int((columns.joint_counts < config.num_joints).sum())
+    joints = np.zeros((len(columns), config.num_joints))
+    width = min(columns.joint_angles.shape[1], config.num_joints)
+    joints[:, :width] = columns.joint_angles[:, :width]
+    stats.joints.add(joints)
+    limits = joint_limits(config)
+    outside = (joints < limits[:, 0]) | (joints > limits[:, 1])
+    stats.joint_violations = outside.sum(axis=0).astype(np.int64)
+    stats.frames_with_joint_violations = int(outside.any(axis=1).sum())
+    summary["joint_violations"] = stats.frames_with_joint_violations
+
+    # Actions: raw rows are [joints..., gripper]
+    stats.missing_action_frames = int((columns.action_counts == 0).sum())
+
+    # Gripper
+    if layout.gripper is not None:
+        for name in stats.gripper_fields:
+            stats.gripper_sources[name].add(columns.field(name))
+        gripper = layout.gripper(columns)
+        stats.gripper.add(gripper)
+        present = gripper[~np.isnan(gripper)]
+        low, high = config.gripper.value_range
+        stats.gripper_out_of_range = int(((present < low) | (present > high)).sum())
+        # Open/close transitions: crossings of the threshold GripperConfig binarises at, so
+        # noise on a continuous gripper signal is not counted
+        steps = np.diff((present > config.gripper.threshold).astype(np.int8))
+        stats.gripper_rising = int((steps > 0).sum())
+        stats.gripper_falling = int((steps < 0).sum())
+        stats.episodes_without_transitions = int(stats.gripper_rising + stats.gripper_falling == 0)
+        summary["gripper_transitions"] = stats.gripper_rising + stats.gripper_falling
+
+        column = config.num_joints
+        has_gripper_action = columns.action_counts > column
+        if columns.actions.shape[1] > column:
+            action_gripper = columns.actions[has_gripper_action, column]
+        else:
+            action_gripper = np.zeros(0)
+        stats.action_gripper.add(action_gripper)
+        stats.action_gripper_nonzero = int((np.abs(action_gripper) > 1e-6).sum())
+
+    # Images: each episode's images/ directory is listed once
+    if images_base_dir is not None:
+        stats.images_checked = True
+        listing = ImageIndex().listing(images_base_dir / episode_name / "images")
+        missing = [name for name in image_names if name not in listing]
+        stats.missing_images = len(missing)
+        stats.episodes_with_missing_images = int(bool(missing))
+        summary["missing_images"] = len(missing)
+        if missing:
+            summary["missing_examples"] = missing[:3]
+
+    stats.per_episode.append(summary)
+    return stats
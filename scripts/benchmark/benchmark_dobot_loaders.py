@@ -0,0 +1,183 @@
+"""
+Benchmark the Dobot-Arm-DataCollect episode loaders.
+
+Writes synthetic episodes (robot_data.csv, pickled dataset.npy and a migrated
+structured dataset.npy) and times the column-oriented loaders in
+pipeline/dobot_data.py against the previous row-by-row implementation
+(csv.DictReader / iterating pickled dicts, reproduced below as the baseline).
+States and actions from every loader are checked to be identical to the baseline.
+
+사용법:
+    python scripts/benchmark/benchmark_dobot_loaders.py \
+        --num_frames 10000 \
+        --repeats 5 \
+        --output_json dobot_loader_benchmark.json
+"""
+
+import csv
+import json
+import pathlib
+import sys
+import tempfile
+import time
+from typing import Any, Callable
+
+import numpy as np
+import tyro
+
+# Add RoboVLA root to path
+robo_vla_root = pathlib.Path(__file__).parent.parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from pipeline.dobot_data import DobotEpisode, load_dobot_csv, load_dobot_npy, migrate_dobot_npy
+
+from synthetic_episodes import synthetic_episode, write_dobot_episode
+
+
+def baseline_load_csv(csv_path: pathlib.Path) -> list[dict[str, Any]]:
+    """Previous row-by-row CSV loader (csv.DictReader, two arrays per row)."""
+    data = []
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            joints = [float(row[f'j{i}']) for i in range(1, 7)]
+            gripper = 1.0 if float(row.get('gripper_tooldo2', 0)) > 0.5 else 0.0
+            data.append({
+                'action': np.array(joints + [gripper], dtype=np.float32),
+                'state': np.array(joints + [gripper], dtype=np.float32),
+                'image_path': row['image_path'],
+                'timestamp': float(row['timestamp']),
+                'frame_id': int(row['frame_id']),
+            })
+    return data
+
+
+def baseline_load_npy(npy_path: pathlib.Path) -> list[dict[str, Any]]:
+    """Previous loader iterating a pickled object array of per-frame dicts."""
+    data = []
+    for item in np.load(npy_path, allow_pickle=True):
+        joints = item['joint_angles'][:6]
+        gripper = 1.0 if float(item.get('gripper_tooldo2', 0)) > 0.5 else 0.0
+        data.append({
+            'action': np.array(list(joints) + [gripper], dtype=np.float32),
+            'state': np.array(list(joints) + [gripper], dtype=np.float32),
+            'image_path': item['image_path'],
+            'timestamp': float(item['timestamp']),
+            'frame_id': int(item['frame_id']),
+        })
+    return data
+
+
+def time_loader(load: Callable[[], Any], repeats: int) -> tuple[Any, float]:
+    """Run load `repeats` times, returning the last result and mean seconds per call."""
+    result = None
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = load()
+    return result, (time.perf_counter() - start) / repeats
+
+
+def check_same(baseline: list[dict[str, Any]], episode: DobotEpisode) -> bool:
+    """True if states/actions/metadata match the row-by-row baseline exactly."""
+    return (
+        np.array_equal(np.stack([d['state'] for d in baseline]), episode.states)
+        and np.array_equal(np.stack([d['action'] for d in baseline]), episode.actions)
+        and [d['image_path'] for d in baseline] == episode.image_path.tolist()
+        and np.array_equal([d['timestamp'] for d in baseline], episode.timestamp)
+        and np.array_equal([d['frame_id'] for d in baseline], episode.frame_id)
+    )
+
+
+def main(
+    num_frames: int = 10000,
+    repeats: int = 5,
+    work_dir: str | None = None,
+    output_json: str | None = None,
+):
+    """
+    Benchmark row-by-row vs column-oriented Dobot episode loaders.
+
+    Args:
+        num_frames: Frames in the synthetic episode
+        repeats: Timed calls per loader
+        work_dir: Directory for the synthetic episode (default: a temporary directory)
+        output_json: Optional path for a machine-readable report
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        episode_dir = pathlib.Path(work_dir or tmp) / "vla_auto_benchmark"
+        print(f"Writing synthetic episode with {num_frames} frames to {episode_dir}")
+        write_dobot_episode(episode_dir, synthetic_episode(num_frames), image_size=None)
+
+        csv_path = episode_dir / "robot_data.csv"
+        npy_path = episode_dir / "dataset.npy"
+        structured_path = episode_dir / "structured" / "dataset.npy"
+        structured_path.parent.mkdir(exist_ok=True)
+        structured_path.write_bytes(npy_path.read_bytes())
+        migrate_dobot_npy(structured_path, keep_backup=False)
+
+        baseline_csv, baseline_csv_time = time_loader(lambda: baseline_load_csv(csv_path), repeats)
+        baseline_npy, baseline_npy_time = time_loader(lambda: baseline_load_npy(npy_path), repeats)
+
+        def states(load: Callable[[pathlib.Path], DobotEpisode], path: pathlib.Path) -> Callable[[], DobotEpisode]:
+            # Include building the episode-level state/action arrays in the timing
+            def run() -> DobotEpisode:
+                episode = load(path)
+                _ = episode.states, episode.actions
+                return episode
+            return run
+
+        cases = [
+            ("csv", "row-by-row (csv.DictReader)", None, baseline_csv_time, baseline_csv),
+            ("csv", "vectorized (np.loadtxt)", states(load_dobot_csv, csv_path), baseline_csv_time, baseline_csv),
+            ("npy", "row-by-row (pickled dicts)", None, baseline_npy_time, baseline_npy),
+            ("npy", "columns from pickled dicts", states(load_dobot_npy, npy_path), baseline_npy_time, baseline_npy),
+            ("npy", "structured dtype (mmap)", states(load_dobot_npy, structured_path), baseline_npy_time, baseline_npy),
+        ]
+
+        results = []
+        for source, loader, load, baseline_time, baseline in cases:
+            if load is None:
+                per_call, identical = baseline_time, True
+            else:
+                episode, per_call = time_loader(load, repeats)
+                identical = check_same(baseline, episode)
+            results.append({
+                "source": source,
+                "loader": loader,
+                "ms_per_episode": per_call * 1000.0,
+                "frames_per_s": num_frames / per_call,
+                "speedup": baseline_time / per_call,
+                "identical": identical,
+            })
+
+        sizes = {
+            "robot_data.csv": csv_path.stat().st_size,
+            "dataset.npy (pickled)": npy_path.stat().st_size,
+            "dataset.npy (structured)": structured_path.stat().st_size,
+        }
+
+    print(f"\n{'source':<7} {'loader':<30} {'ms/episode':>11} {'frames/s':>11} {'speedup':>8} {'identical':>10}")
+    print("-" * 82)
+    for r in results:
+        print(
+            f"{r['source']:<7} {r['loader']:<30} {r['ms_per_episode']:>11.2f} {r['frames_per_s']:>11.0f} "
+            f"{r['speedup']:>7.2f}x {str(r['identical']):>10}"
+        )
+    print()
+    for name, size in sizes.items():
+        print(f"  {name:<26} {size / 1024 ** 2:>8.2f} MB")
+
+    if output_json is not None:
+        report = {
+            "num_frames": num_frames,
+            "repeats": repeats,
+            "results": results,
+            "file_sizes_bytes": sizes,
+        }
+        with open(output_json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to: {output_json}")
+
+
+if __name__ == "__main__":
+    tyro.cli(main)
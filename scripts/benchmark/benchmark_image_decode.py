@@ -0,0 +1,124 @@
+"""
+Benchmark image decode paths used by the dataset converters.
+
+Times every resize filter with and without JPEG DCT-domain downscaling (fast_decode)
+and reports the pixel difference against the reference path used by the converters
+by default (full decode + LANCZOS), so the speed/quality trade-off can be judged.
+
+사용법:
+    python scripts/benchmark/benchmark_image_decode.py \
+        --images_dir /path/to/VLA_DATASET/1/images \
+        --num_images 200 \
+        --output_json decode_benchmark.json
+"""
+
+import json
+import pathlib
+import sys
+import time
+
+import numpy as np
+import tyro
+
+# Add RoboVLA root to path
+robo_vla_root = pathlib.Path(__file__).parent.parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from pipeline.image_io import RESIZE_FILTERS, decode_image
+
+
+def psnr(reference: np.ndarray, image: np.ndarray) -> float:
+    """Peak signal-to-noise ratio in dB (inf for identical images)."""
+    mse = np.mean((reference.astype(np.float64) - image.astype(np.float64)) ** 2)
+    if mse == 0:
+        return float("inf")
+    return float(10.0 * np.log10(255.0 ** 2 / mse))
+
+
+def time_decode(
+    paths: list[pathlib.Path],
+    target_size: tuple[int, int],
+    resize_filter: str,
+    fast_decode: bool,
+    repeats: int,
+) -> tuple[list[np.ndarray], float]:
+    """Decode all paths `repeats` times, returning the last images and seconds per frame."""
+    images = []
+    start = time.perf_counter()
+    for _ in range(repeats):
+        images = [decode_image(p, target_size, resize_filter, fast_decode) for p in paths]
+    elapsed = time.perf_counter() - start
+    return images, elapsed / (repeats * len(paths))
+
+
+def main(
+    images_dir: str,
+    num_images: int = 200,
+    width: int = 224,
+    height: int = 224,
+    repeats: int = 1,
+    output_json: str | None = None,
+):
+    """
+    Benchmark decode + resize for every filter, with and without fast_decode.
+
+    Args:
+        images_dir: Directory searched recursively for *.jpg frames
+        num_images: Maximum number of frames to decode per configuration
+        width: Target width
+        height: Target height
+        repeats: Number of passes over the frames per configuration
+        output_json: Optional path for a machine-readable report
+    """
+    paths = sorted(pathlib.Path(images_dir).rglob("*.jpg"))[:num_images]
+    if len(paths) == 0:
+        raise ValueError(f"No JPEG images found in {images_dir}")
+    target_size = (width, height)
+
+    print(f"Benchmarking {len(paths)} images → {width}x{height} (repeats={repeats})")
+
+    reference, reference_time = time_decode(paths, target_size, "lanczos", False, repeats)
+
+    results = []
+    for fast_decode in (False, True):
+        for resize_filter in RESIZE_FILTERS:
+            if resize_filter == "lanczos" and not fast_decode:
+                images, per_frame = reference, reference_time
+            else:
+                images, per_frame = time_decode(paths, target_size, resize_filter, fast_decode, repeats)
+
+            abs_diff = np.stack([np.abs(r.astype(np.int16) - img.astype(np.int16)) for r, img in zip(reference, images)])
+            results.append({
+                "resize_filter": resize_filter,
+                "fast_decode": fast_decode,
+                "ms_per_frame": per_frame * 1000.0,
+                "frames_per_s": 1.0 / per_frame,
+                "speedup": reference_time / per_frame,
+                "mean_abs_diff": float(abs_diff.mean()),
+                "max_abs_diff": int(abs_diff.max()),
+                "psnr_db": float(np.mean([psnr(r, img) for r, img in zip(reference, images)])),
+            })
+
+    print(f"\n{'filter':<10} {'fast':<6} {'ms/frame':>9} {'frames/s':>9} {'speedup':>8} {'mean|Δ|':>8} {'max|Δ|':>7} {'PSNR':>7}")
+    print("-" * 72)
+    for r in results:
+        print(
+            f"{r['resize_filter']:<10} {str(r['fast_decode']):<6} {r['ms_per_frame']:>9.2f} {r['frames_per_s']:>9.1f} "
+            f"{r['speedup']:>7.2f}x {r['mean_abs_diff']:>8.3f} {r['max_abs_diff']:>7d} {r['psnr_db']:>7.2f}"
+        )
+
+    if output_json is not None:
+        report = {
+            "images_dir": str(images_dir),
+            "num_images": len(paths),
+            "target_size": list(target_size),
+            "reference": {"resize_filter": "lanczos", "fast_decode": False},
+            "results": results,
+        }
+        with open(output_json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to: {output_json}")
+
+
+if __name__ == "__main__":
+    tyro.cli(main)
@@ -0,0 +1,329 @@
+"""
+Benchmark suite for the conversion pipeline on synthetic Dobot episodes.
+
+Generates (or reuses) a synthetic dataset with synthetic_episodes.py and times each
+pipeline stage over all of its episodes:
+
+    dobot_csv             load_dobot_csv (robot_data.csv)
+    dobot_npy_pickled     load_dobot_npy on the collector's pickled dataset.npy
+    dobot_npy_structured  load_dobot_npy on a migrated (structured) dataset.npy
+    load_json_episode     JSON parse + robot_mode filter (universal converter)
+    load_image            decode + resize of every frame (universal converter)
+    convert_episode       full per-episode conversion, serial (universal converter)
+    end_to_end            iter_converted_episodes with --workers, written to a fresh
+                          LeRobotDataset in a temporary directory
+
+Every stage runs in a freshly spawned process, so its peak RSS is its own (the
+dataset writer's and worker processes' peaks are reported as children). Results are
+reported as frames/s and saved as JSON together with the run parameters, git commit
+and library versions; --baseline_json prints the speedup of every stage against an
+earlier report. Everything runs offline on CPU. Stages that need the universal
+converter are skipped (and reported as such) if LeRobot cannot be imported.
+
+사용법:
+    python scripts/benchmark/benchmark_pipeline.py \
+        --num_episodes 10 \
+        --num_frames 300 \
+        --workers 4 \
+        --output_json pipeline_benchmark.json \
+        --baseline_json previous_pipeline_benchmark.json
+"""
+
+import importlib
+import json
+import multiprocessing
+import os
+import pathlib
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+import tyro
+from PIL import Image
+
+# Add RoboVLA root to path
+robo_vla_root = pathlib.Path(__file__).parent.parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from config.robot_config import get_robot_config
+from pipeline.dobot_data import load_dobot_csv, load_dobot_npy, migrate_dobot_npy
+
+from synthetic_episodes import generate_dataset
+
+
+UNIVERSAL_CONVERTER = robo_vla_root / "scripts" / "data" / "convert_json_to_lerobot_universal.py"
+
+STAGES = (
+    "dobot_csv",
+    "dobot_npy_pickled",
+    "dobot_npy_structured",
+    "load_json_episode",
+    "load_image",
+    "convert_episode",
+    "end_to_end",
+)
+
+
+def peak_rss_mb(who: int) -> float:
+    """Peak resident set size in MB (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def load_universal_converter():
+    """Import scripts/data/convert_json_to_lerobot_universal.py as a module.
+
+    Imported by name from scripts/data, so converter functions can be pickled to the
+    end-to-end stage's worker processes.
+    """
+    sys.path.insert(0, str(UNIVERSAL_CONVERTER.parent))
+    return importlib.import_module(UNIVERSAL_CONVERTER.stem)
+
+
+def run_stage(stage: str, params: dict[str, Any]) -> tuple[int, int]:
+    """Run one stage over the whole synthetic dataset; returns (episodes, frames)."""
+    data_dir = pathlib.Path(params["data_dir"])
+    json_dir = pathlib.Path(params["json_dir"])
+    episode_dirs = sorted(data_dir.glob("vla_auto_*"))[:params["num_episodes"]]
+    json_files = sorted(json_dir.glob("*.json"), key=lambda p: int(p.stem))[:params["num_episodes"]]
+
+    if stage in ("dobot_csv", "dobot_npy_pickled", "dobot_npy_structured"):
+        if stage == "dobot_csv":
+            paths = [d / "robot_data.csv" for d in episode_dirs]
+            load = load_dobot_csv
+        elif stage == "dobot_npy_pickled":
+            paths = [d / "dataset.npy" for d in episode_dirs]
+            load = load_dobot_npy
+        else:
+            paths = sorted(pathlib.Path(params["structured_dir"]).glob("*.npy"))
+            load = load_dobot_npy
+        frames = 0
+        for path in paths:
+            episode = load(path)
+            _ = episode.states, episode.actions
+            frames += len(episode)
+        return len(paths), frames
+
+    converter = load_universal_converter()
+    config = get_robot_config(params["robot_name"])
+
+    if stage == "load_json_episode":
+        frames = 0
+        for json_file in json_files:
+            episode_frames, _ = converter.load_json_episode(json_file, data_dir, config, verbose=False)
+            frames += len(episode_frames)
+        return len(json_files), frames
+
+    if stage == "load_image":
+        frames = 0
+        for episode_dir in episode_dirs:
+            for image_path in sorted((episode_dir / "images").glob("*.jpg")):
+                converter.load_image(
+                    image_path, config.image_size, config.image_resize_filter, config.image_fast_decode
+                )
+                frames += 1
+        return len(episode_dirs), frames
+
+    if stage == "convert_episode":
+        frames = 0
+        for json_file in json_files:
+            episode_data = converter.convert_episode(json_file, data_dir, config)
+            frames += 0 if episode_data is None else len(episode_data["task"])
+        return len(json_files), frames
+
+    if stage == "end_to_end":
+        dataset = converter.LeRobotDataset.create(
+            repo_id="benchmark/synthetic_dobot",
+            root=pathlib.Path(params["output_root"]) / "synthetic_dobot",
+            robot_type=config.name,
+            fps=params["fps"],
+            features=converter.dataset_features(config),
+        )
+        episodes = frames = 0
+        for _, episode_data in converter.iter_converted_episodes(json_files, data_dir, config, params["workers"]):
+            if episode_data is None:
+                continue
+            episode_data.pop("prune_stats", None)
+            dataset.add_episode(episode_data)
+            episodes += 1
+            frames += len(episode_data["task"])
+        return episodes, frames
+
+    raise ValueError(f"Unknown stage: {stage}")
+
+
+def timed_stage(stage: str, params: dict[str, Any], repeats: int) -> dict[str, Any]:
+    """Time `repeats` runs of a stage (executed in a spawned process)."""
+    # Keep any LeRobot/Hugging Face access local to the benchmark's temporary directory
+    os.environ["HF_LEROBOT_HOME"] = params["output_root"]
+    os.environ["HF_HUB_OFFLINE"] = "1"
+
+    seconds = []
+    episodes = frames = 0
+    for repeat in range(repeats):
+        # Each end-to-end run writes a new dataset
+        run_params = {**params, "output_root": str(pathlib.Path(params["output_root"]) / f"run_{repeat}")}
+        start = time.perf_counter()
+        episodes, frames = run_stage(stage, run_params)
+        seconds.append(time.perf_counter() - start)
+
+    best = min(seconds)
+    return {
+        "stage": stage,
+        "episodes": episodes,
+        "frames": frames,
+        "seconds": best,
+        "mean_seconds": float(np.mean(seconds)),
+        "frames_per_s": frames / best if best > 0 else float("inf"),
+        "peak_rss_mb": peak_rss_mb(resource.RUSAGE_SELF),
+        "children_peak_rss_mb": peak_rss_mb(resource.RUSAGE_CHILDREN),
+    }
+
+
+def run_isolated(stage: str, params: dict[str, Any], repeats: int) -> dict[str, Any]:
+    """Run timed_stage in a fresh process; failures are reported, not raised."""
+    # Executor workers are not daemonic, so the end-to-end stage can start its own pool
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        try:
+            return executor.submit(timed_stage, stage, params, repeats).result()
+        except ImportError as e:
+            return {"stage": stage, "skipped": f"{type(e).__name__}: {e}"}
+        except Exception as e:
+            return {"stage": stage, "error": f"{type(e).__name__}: {e}"}
+
+
+def git_commit() -> str | None:
+    """Current commit of the RoboVLA checkout, if it is a git repository."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=robo_vla_root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: list[dict[str, Any]], baseline: dict[str, dict[str, Any]]) -> None:
+    """Table of per-stage throughput, peak RSS and (with a baseline) speedup."""
+    print(f"\n{'stage':<22} {'frames':>8} {'seconds':>9} {'frames/s':>11} {'peak MB':>9} {'child MB':>9} {'speedup':>8}")
+    print("-" * 82)
+    for r in results:
+        if "frames_per_s" not in r:
+            print(f"{r['stage']:<22} {r.get('skipped') or r.get('error')}")
+            continue
+        previous = baseline.get(r["stage"], {}).get("frames_per_s")
+        speedup = f"{r['frames_per_s'] / previous:>7.2f}x" if previous else f"{'-':>8}"
+        print(
+            f"{r['stage']:<22} {r['frames']:>8} {r['seconds']:>9.3f} {r['frames_per_s']:>11.1f} "
+            f"{r['peak_rss_mb']:>9.1f} {r['children_peak_rss_mb']:>9.1f} {speedup}"
+        )
+
+
+def main(
+    num_episodes: int = 10,
+    num_frames: int = 300,
+    width: int = 640,
+    height: int = 480,
+    robot_name: str = "dobot_e6",
+    fps: int = 10,
+    workers: int = 4,
+    repeats: int = 1,
+    stages: tuple[str, ...] = STAGES,
+    data_dir: str | None = None,
+    output_json: str | None = None,
+    baseline_json: str | None = None,
+):
+    """
+    Time every conversion stage on synthetic Dobot episodes.
+
+    Args:
+        num_episodes: Number of synthetic episodes
+        num_frames: Frames per episode
+        width: Source frame width (JPEG)
+        height: Source frame height (JPEG)
+        robot_name: Robot config used by the converter stages
+        fps: Dataset fps of the end-to-end stage
+        workers: Converter worker processes in the end-to-end stage
+        repeats: Runs per stage (the fastest is reported)
+        stages: Stages to run (default: all)
+        data_dir: Directory for the synthetic dataset; existing episodes are reused
+            (default: a temporary directory, deleted afterwards)
+        output_json: Optional path for a machine-readable report
+        baseline_json: Earlier report to compare frames/s against
+    """
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stages: {unknown} (choose from {list(STAGES)})")
+
+    with tempfile.TemporaryDirectory(prefix="pipeline_benchmark_") as tmp:
+        root = pathlib.Path(data_dir or tmp)
+        print(f"Generating {num_episodes} synthetic episodes x {num_frames} frames ({width}x{height}) in {root}")
+        start = time.perf_counter()
+        episodes_dir, json_dir = generate_dataset(root, num_episodes, num_frames, (width, height))
+        print(f"  done in {time.perf_counter() - start:.1f}s")
+
+        # Migrated copies of dataset.npy for the structured loader
+        structured_dir = pathlib.Path(tmp) / "structured_npy"
+        structured_dir.mkdir()
+        for episode_dir in sorted(episodes_dir.glob("vla_auto_*"))[:num_episodes]:
+            npy_path = structured_dir / f"{episode_dir.name}.npy"
+            npy_path.write_bytes((episode_dir / "dataset.npy").read_bytes())
+            migrate_dobot_npy(npy_path, keep_backup=False)
+
+        params = {
+            "data_dir": str(episodes_dir),
+            "json_dir": str(json_dir),
+            "structured_dir": str(structured_dir),
+            "output_root": str(pathlib.Path(tmp) / "lerobot"),
+            "num_episodes": num_episodes,
+            "robot_name": robot_name,
+            "fps": fps,
+            "workers": workers,
+        }
+
+        results = []
+        for stage in stages:
+            print(f"Running {stage}...")
+            results.append(run_isolated(stage, params, repeats))
+
+    baseline = {}
+    if baseline_json is not None:
+        with open(baseline_json, 'r', encoding='utf-8') as f:
+            baseline = {r["stage"]: r for r in json.load(f)["results"]}
+    print_results(results, baseline)
+
+    if output_json is not None:
+        report = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "machine": {
+                "platform": platform.platform(),
+                "python": platform.python_version(),
+                "cpu_count": os.cpu_count(),
+                "numpy": np.__version__,
+                "pillow": Image.__version__,
+            },
+            "params": {
+                "num_episodes": num_episodes,
+                "num_frames": num_frames,
+                "frame_size": [width, height],
+                "robot_name": robot_name,
+                "fps": fps,
+                "workers": workers,
+                "repeats": repeats,
+            },
+            "results": results,
+        }
+        with open(output_json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to: {output_json}")
+
+
+if __name__ == "__main__":
+    tyro.cli(main)
@@ -0,0 +1,183 @@
+"""
+Benchmark per-frame image storage vs video storage (--video) for converted datasets.
+
+Uses the same steps LeRobot performs for each storage mode on one episode's frames:
+
+    image  frames written as individual PNG files (LeRobot image writer)
+    video  frames written as PNG, then encoded per episode with encode_video_frames
+
+and reports on-disk size, conversion (write + encode) time, random-access read
+latency (PNG decode vs timestamp-based video decode, as LeRobotDataset does during
+training/eval) and the fidelity of decoded video frames.
+
+사용법:
+    python scripts/benchmark/benchmark_video_storage.py \
+        --images_dir /path/to/VLA_DATASET/1/images \
+        --num_frames 300 \
+        --output_json video_benchmark.json
+"""
+
+import json
+import pathlib
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import tyro
+from PIL import Image
+
+# Add RoboVLA root to path
+robo_vla_root = pathlib.Path(__file__).parent.parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from lerobot.common.datasets.video_utils import decode_video_frames_torchvision, encode_video_frames
+
+from pipeline.image_io import decode_image
+
+
+def psnr(reference: np.ndarray, image: np.ndarray) -> float:
+    """Peak signal-to-noise ratio in dB (inf for identical images)."""
+    mse = np.mean((reference.astype(np.float64) - image.astype(np.float64)) ** 2)
+    if mse == 0:
+        return float("inf")
+    return float(10.0 * np.log10(255.0 ** 2 / mse))
+
+
+def latency_summary(seconds: list[float]) -> dict[str, float]:
+    """Mean / median / p95 latency in milliseconds."""
+    ms = np.array(seconds) * 1000.0
+    return {
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+    }
+
+
+def write_png_frames(frames: list[np.ndarray], frames_dir: pathlib.Path) -> None:
+    """Write frames as frame_XXXXXX.png (the layout encode_video_frames reads)."""
+    frames_dir.mkdir(parents=True, exist_ok=True)
+    for i, frame in enumerate(frames):
+        Image.fromarray(frame).save(frames_dir / f"frame_{i:06d}.png")
+
+
+def video_frame(video_path: pathlib.Path, index: int, fps: int) -> np.ndarray:
+    """Decode one frame by timestamp, as LeRobotDataset does, into (H, W, 3) uint8."""
+    frames = decode_video_frames_torchvision(video_path, [index / fps], tolerance_s=1e-4, backend="pyav")
+    return (frames[0].permute(1, 2, 0).numpy() * 255.0).round().astype(np.uint8)
+
+
+def main(
+    images_dir: str,
+    num_frames: int = 300,
+    width: int = 224,
+    height: int = 224,
+    fps: int = 10,
+    vcodec: str = "libsvtav1",
+    gop: int = 2,
+    crf: int = 30,
+    num_reads: int = 200,
+    seed: int = 0,
+    output_json: str | None = None,
+):
+    """
+    Compare per-frame PNG storage with per-episode video storage.
+
+    Args:
+        images_dir: Directory of one episode's JPEG frames
+        num_frames: Maximum number of frames in the benchmark episode
+        width: Frame width after resize
+        height: Frame height after resize
+        fps: Episode frame rate (video timestamps)
+        vcodec: Video codec passed to encode_video_frames
+        gop: Keyframe interval (smaller = faster random access, larger files)
+        crf: Constant rate factor (higher = smaller files, lower quality)
+        num_reads: Random-access reads timed per storage mode
+        seed: Seed for the random read order
+        output_json: Optional path for a machine-readable report
+    """
+    paths = sorted(pathlib.Path(images_dir).glob("*.jpg"))[:num_frames]
+    if len(paths) == 0:
+        raise ValueError(f"No JPEG images found in {images_dir}")
+
+    print(f"Decoding {len(paths)} frames → {width}x{height}")
+    frames = [decode_image(p, (width, height)) for p in paths]
+    reads = np.random.default_rng(seed).integers(0, len(frames), size=num_reads)
+
+    work_dir = pathlib.Path(tempfile.mkdtemp(prefix="video_benchmark_"))
+    try:
+        # Image storage: one PNG per frame
+        frames_dir = work_dir / "images"
+        start = time.perf_counter()
+        write_png_frames(frames, frames_dir)
+        image_write_time = time.perf_counter() - start
+        image_bytes = sum(p.stat().st_size for p in frames_dir.iterdir())
+
+        image_latency = []
+        for i in reads:
+            start = time.perf_counter()
+            with Image.open(frames_dir / f"frame_{i:06d}.png") as img:
+                np.asarray(img.convert("RGB"))
+            image_latency.append(time.perf_counter() - start)
+
+        # Video storage: PNG frames encoded into one stream per episode
+        video_path = work_dir / "episode_000000.mp4"
+        start = time.perf_counter()
+        encode_video_frames(frames_dir, video_path, fps, vcodec=vcodec, g=gop, crf=crf, overwrite=True)
+        encode_time = time.perf_counter() - start
+        video_bytes = video_path.stat().st_size
+
+        video_latency = []
+        fidelity = []
+        for i in reads:
+            start = time.perf_counter()
+            decoded = video_frame(video_path, int(i), fps)
+            video_latency.append(time.perf_counter() - start)
+            fidelity.append(psnr(frames[i], decoded))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    results = {
+        "image": {
+            "bytes": image_bytes,
+            "bytes_per_frame": image_bytes / len(frames),
+            "conversion_s": image_write_time,
+            "random_read": latency_summary(image_latency),
+        },
+        "video": {
+            "bytes": video_bytes,
+            "bytes_per_frame": video_bytes / len(frames),
+            "conversion_s": image_write_time + encode_time,
+            "encode_s": encode_time,
+            "random_read": latency_summary(video_latency),
+            "psnr_db": float(np.mean(fidelity)),
+        },
+    }
+
+    print(f"\n{'storage':<8} {'size MB':>9} {'KB/frame':>9} {'convert s':>10} {'read mean':>10} {'read p95':>9}")
+    print("-" * 60)
+    for name, r in results.items():
+        print(
+            f"{name:<8} {r['bytes'] / 1024 ** 2:>9.2f} {r['bytes_per_frame'] / 1024:>9.1f} {r['conversion_s']:>10.2f} "
+            f"{r['random_read']['mean_ms']:>8.2f}ms {r['random_read']['p95_ms']:>7.2f}ms"
+        )
+    print(f"\nVideo is {image_bytes / video_bytes:.1f}x smaller; decoded frames PSNR {results['video']['psnr_db']:.2f} dB")
+
+    if output_json is not None:
+        report = {
+            "images_dir": str(images_dir),
+            "num_frames": len(frames),
+            "frame_size": [width, height],
+            "fps": fps,
+            "video_settings": {"vcodec": vcodec, "gop": gop, "crf": crf},
+            "num_reads": num_reads,
+            "results": results,
+        }
+        with open(output_json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to: {output_json}")
+
+
+if __name__ == "__main__":
+    tyro.cli(main)
@@ -0,0 +1,240 @@
+"""
+Synthetic Dobot-Arm-DataCollect episodes for benchmarks.
+
+Writes any number of episodes in the collector's on-disk format, plus the per-episode
+JSON files produced by convert_to_json.py:
+
+    <output_dir>/
+        vla_dataset/                     (images_base_dir / Dobot data_dir)
+            vla_auto_20260101_000001/
+                images/frame_000000.jpg ...
+                robot_data.csv
+                dataset.npy              (pickled per-frame dicts, as recorded)
+        json/                            (json_dir)
+            1.json ...
+
+Joints follow a random walk with an idle stretch (arm stopped, static image) in the
+middle of each episode, the suction gripper toggles every `gripper_period` frames and
+the first frames are recorded outside robot_mode 7, so filtering, pruning and gripper
+extraction see realistic input. Frames are smooth gradients with a moving block, which
+compress like camera images rather than noise. Everything is seeded and offline.
+
+사용법:
+    python scripts/benchmark/synthetic_episodes.py \
+        --output_dir /tmp/synthetic_dobot \
+        --num_episodes 20 \
+        --num_frames 300
+"""
+
+import csv
+import json
+import pathlib
+import sys
+
+import numpy as np
+import tyro
+from PIL import Image
+
+# Add RoboVLA root to path
+robo_vla_root = pathlib.Path(__file__).parent.parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from pipeline.dobot_data import DobotEpisode, JOINT_COLUMNS, TCP_COLUMNS
+
+
+CSV_HEADER = [
+    "frame_id", "timestamp", "image_path", *JOINT_COLUMNS, *TCP_COLUMNS,
+    "gripper_tooldo1", "gripper_tooldo2", "robot_mode",
+]
+
+
+def episode_name(index: int) -> str:
+    """Collector-style directory name of synthetic episode `index` (1-based)."""
+    return f"vla_auto_20260101_{index:06d}"
+
+
+def synthetic_episode(
+    num_frames: int,
+    seed: int = 0,
+    fps: float = 10.0,
+    idle_fraction: float = 0.2,
+    gripper_period: int = 200,
+    warmup_frames: int = 5,
+) -> DobotEpisode:
+    """Episode columns: random-walk joints with one idle stretch, toggling gripper.
+
+    Joint angles and TCP pose are rounded to 3 decimals, as the collector writes them.
+    """
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(scale=0.5, size=(num_frames, 6))
+    idle = np.zeros(num_frames, dtype=bool)
+    idle_frames = int(num_frames * idle_fraction)
+    if idle_frames > 0:
+        start = (num_frames - idle_frames) // 2
+        idle[start:start + idle_frames] = True
+    steps[idle] = 0.0
+    joints = np.cumsum(steps, axis=0) + rng.uniform(-90, 90, size=6)
+    tcp = np.cumsum(np.where(idle[:, None], 0.0, rng.normal(scale=1.0, size=(num_frames, 6))), axis=0)
+
+    robot_mode = np.full(num_frames, 7, dtype=np.int64)
+    robot_mode[:min(warmup_frames, num_frames)] = 5
+
+    return DobotEpisode(
+        frame_id=np.arange(num_frames, dtype=np.int64),
+        timestamp=1769415506.1058023 + np.arange(num_frames) / fps,
+        image_path=np.array([f"frame_{i:06d}.jpg" for i in range(num_frames)], dtype=np.str_),
+        joint_angles=joints.round(3),
+        tcp_pose=tcp.round(3),
+        gripper_tooldo1=np.zeros(num_frames, dtype=np.float64),
+        gripper_tooldo2=((np.arange(num_frames) // max(gripper_period, 1)) % 2).astype(np.float64),
+        robot_mode=robot_mode,
+    )
+
+
+def synthetic_frame(episode: DobotEpisode, i: int, width: int, height: int) -> np.ndarray:
+    """(H, W, 3) uint8 frame: gradient background with a block placed by the joints."""
+    y, x = np.mgrid[0:height, 0:width]
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    image[..., 0] = (x * 255 // max(width - 1, 1)).astype(np.uint8)
+    image[..., 1] = (y * 255 // max(height - 1, 1)).astype(np.uint8)
+    image[..., 2] = 96
+
+    # Block position follows the first two joints, so idle stretches give static images
+    size = max(min(width, height) // 6, 1)
+    cx = int((episode.joint_angles[i, 0] % 180.0) / 180.0 * (width - size))
+    cy = int((episode.joint_angles[i, 1] % 180.0) / 180.0 * (height - size))
+    image[cy:cy + size, cx:cx + size] = (255, 255, 255) if episode.gripper[i] else (32, 32, 32)
+    return image
+
+
+def write_dobot_episode(
+    episode_dir: pathlib.Path,
+    episode: DobotEpisode,
+    image_size: tuple[int, int] | None = (640, 480),
+    jpeg_quality: int = 90,
+) -> None:
+    """Write robot_data.csv, a pickled dataset.npy and (unless image_size is None) images/."""
+    episode_dir.mkdir(parents=True, exist_ok=True)
+    items = []
+    with open(episode_dir / "robot_data.csv", 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        for i in range(len(episode)):
+            joint_angles = [float(v) for v in episode.joint_angles[i]]
+            tcp_pose = [float(v) for v in episode.tcp_pose[i]]
+            gripper_tooldo1 = int(episode.gripper_tooldo1[i])
+            gripper_tooldo2 = int(episode.gripper_tooldo2[i])
+            writer.writerow([
+                int(episode.frame_id[i]), float(episode.timestamp[i]), str(episode.image_path[i]),
+                *joint_angles, *tcp_pose, gripper_tooldo1, gripper_tooldo2, int(episode.robot_mode[i]),
+            ])
+            items.append({
+                'frame_id': int(episode.frame_id[i]),
+                'timestamp': float(episode.timestamp[i]),
+                'image_path': str(episode.image_path[i]),
+                'joint_angles': joint_angles,
+                'tcp_pose': tcp_pose,
+                'gripper_tooldo1': gripper_tooldo1,
+                'gripper_tooldo2': gripper_tooldo2,
+                'robot_mode': int(episode.robot_mode[i]),
+            })
+    np.save(episode_dir / "dataset.npy", np.array(items, dtype=object), allow_pickle=True)
+
+    if image_size is not None:
+        images_dir = episode_dir / "images"
+        images_dir.mkdir(exist_ok=True)
+        width, height = image_size
+        for i in range(len(episode)):
+            Image.fromarray(synthetic_frame(episode, i, width, height)).save(
+                images_dir / str(episode.image_path[i]), quality=jpeg_quality
+            )
+
+
+def write_episode_json(
+    json_path: pathlib.Path,
+    name: str,
+    episode: DobotEpisode,
+    prompt: str = "pick up the object and place it in the box",
+) -> None:
+    """Write the convert_to_json.py output for one episode (actions = per-frame deltas)."""
+    states = np.column_stack([episode.joint_angles, episode.gripper])
+    actions = np.zeros_like(states)
+    actions[1:] = np.diff(states, axis=0)
+
+    frames = []
+    for i in range(len(episode)):
+        frames.append({
+            "frame_id": int(episode.frame_id[i]),
+            "timestamp": float(episode.timestamp[i]),
+            "image_path": str(episode.image_path[i]),
+            "joint_angles": [float(v) for v in episode.joint_angles[i]],
+            "tcp_pose": [float(v) for v in episode.tcp_pose[i]],
+            "gripper_tooldo1": int(episode.gripper_tooldo1[i]),
+            "gripper_tooldo2": int(episode.gripper_tooldo2[i]),
+            "gripper": int(episode.gripper[i]),
+            "robot_mode": int(episode.robot_mode[i]),
+            "actions": [float(v) for v in actions[i]],
+        })
+
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump({"episode_name": name, "prompt": prompt, "frames": frames}, f)
+
+
+def generate_dataset(
+    output_dir: pathlib.Path,
+    num_episodes: int,
+    num_frames: int,
+    image_size: tuple[int, int] | None = (640, 480),
+    jpeg_quality: int = 90,
+    seed: int = 0,
+) -> tuple[pathlib.Path, pathlib.Path]:
+    """Write num_episodes synthetic episodes; returns (vla_dataset dir, json dir).
+
+    Episodes that already exist (robot_data.csv and JSON present) are not rewritten, so
+    a dataset can be generated once and reused across benchmark runs.
+    """
+    data_dir = output_dir / "vla_dataset"
+    json_dir = output_dir / "json"
+    for index in range(1, num_episodes + 1):
+        name = episode_name(index)
+        json_path = json_dir / f"{index}.json"
+        if (data_dir / name / "robot_data.csv").exists() and json_path.exists():
+            continue
+        episode = synthetic_episode(num_frames, seed=seed + index)
+        write_dobot_episode(data_dir / name, episode, image_size, jpeg_quality)
+        write_episode_json(json_path, name, episode)
+    return data_dir, json_dir
+
+
+def main(
+    output_dir: str,
+    num_episodes: int = 10,
+    num_frames: int = 300,
+    width: int = 640,
+    height: int = 480,
+    jpeg_quality: int = 90,
+    seed: int = 0,
+):
+    """
+    Generate synthetic Dobot episodes (CSV, dataset.npy, JPEG frames and JSON).
+
+    Args:
+        output_dir: Destination; vla_dataset/ and json/ are created inside it
+        num_episodes: Number of episodes
+        num_frames: Frames per episode
+        width: Frame width in pixels
+        height: Frame height in pixels
+        jpeg_quality: JPEG quality of the frames
+        seed: Base random seed (episode i uses seed + i)
+    """
+    data_dir, json_dir = generate_dataset(
+        pathlib.Path(output_dir), num_episodes, num_frames, (width, height), jpeg_quality, seed
+    )
+    print(f"Wrote {num_episodes} episodes x {num_frames} frames")
+    print(f"  Dobot data_dir / images_base_dir: {data_dir}")
+    print(f"  json_dir: {json_dir}")
+
+
+if __name__ == "__main__":
+    tyro.cli(main)
@@ -1,48 +1,82 @@
 """
 LeRobot 변환 상태 확인 스크립트
+
+변환 스크립트(convert_json_to_lerobot_universal.py, examples/dobot_e6/convert_dobot_data_to_lerobot.py)가
+기록하는 진행 상황 파일(<lerobot_home>/<repo_id>.progress.jsonl)의 마지막 레코드만 읽으므로
+파일 크기와 관계없이 바로 응답합니다.
+
+사용법:
+    python scripts/data/check_lerobot_conversion_status.py --repo_id your_hf_username/dobot_e6_vla_dataset
+
+    # 실행 중인 변환을 5초마다 표시 (평균/실시간 처리 속도, ETA)
+    python scripts/data/check_lerobot_conversion_status.py --repo_id your_hf_username/dobot_e6_vla_dataset --watch
 """
 
 import pathlib
-import time
-
-def check_status():
-    log_file = pathlib.Path("/tmp/lerobot_conversion.log")
-    dataset_path = pathlib.Path("/home/billy/.cache/huggingface/lerobot/billy/dobot_e6_vla_dataset")
-    
-    if not log_file.exists():
-        print("로그 파일이 없습니다.")
-        return
-    
-    # 로그 파일의 마지막 몇 줄 읽기
-    with open(log_file, 'r') as f:
-        lines = f.readlines()
-    
+import sys
+
+import tyro
+
+# Add RoboVLA root to path
+robo_vla_root = pathlib.Path(__file__).parent.parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from pipeline.manifest import lerobot_home
+from pipeline.progress import default_progress_path, format_progress, read_progress, run_state, watch_progress
+
+
+STATE_MESSAGES = {
+    "done": "✅ 변환 완료!",
+    "failed": "❌ 오류 발생!",
+    "interrupted": "⚠️  변환 중단됨 (변환 프로세스가 완료 기록 없이 종료됨)",
+    "running": "⏳ 변환 진행 중...",
+}
+
+
+def check_status(
+    repo_id: str | None = None,
+    progress_file: str | None = None,
+    watch: bool = False,
+    interval: float = 5.0,
+):
+    """
+    변환 진행 상황을 출력합니다.
+
+    Args:
+        repo_id: 변환 중인 데이터셋의 repo ID (진행 상황 파일 위치를 결정)
+        progress_file: 진행 상황 파일 경로 (기본값: <lerobot_home>/<repo_id>.progress.jsonl)
+        watch: 변환이 끝날 때까지 interval초마다 상태를 출력
+        interval: --watch 갱신 간격 (초)
+    """
+    if repo_id is None and progress_file is None:
+        raise ValueError("--repo_id 또는 --progress_file 중 하나를 지정하세요")
+    path = pathlib.Path(progress_file) if progress_file else default_progress_path(repo_id)
+
     print("=" * 80)
     print("LeRobot 변환 상태")
     print("=" * 80)
-    print(f"\n로그 파일: {log_file}")
-    print(f"데이터셋 경로: {dataset_path}")
-    print(f"데이터셋 존재: {dataset_path.exists()}")
-    
-    if dataset_path.exists():
-        # 에피소드 수 확인
-        episode_dirs = [d for d in dataset_path.iterdir() if d.is_dir() and d.name.startswith("episode_")]
-        print(f"변환된 에피소드 수: {len(episode_dirs)}")
-    
-    print("\n[최근 로그 (마지막 20줄)]")
-    for line in lines[-20:]:
-        print(line.rstrip())
-    
-    # 완료 여부 확인
-    if lines:
-        last_line = lines[-1].strip()
-        if "✅ Dataset conversion complete!" in last_line or "Total frames:" in last_line:
-            print("\n✅ 변환 완료!")
-        elif "Error" in last_line or "Traceback" in last_line:
-            print("\n❌ 오류 발생!")
-        else:
-            print("\n⏳ 변환 진행 중...")
+    print(f"\n진행 상황 파일: {path}")
+    if repo_id is not None:
+        dataset_path = lerobot_home() / repo_id
+        print(f"데이터셋 경로: {dataset_path}")
+        print(f"데이터셋 존재: {dataset_path.exists()}")
+    print()
+
+    if watch:
+        record = watch_progress(path, interval)
+    else:
+        record = read_progress(path)
+        if record is not None:
+            print(format_progress(record))
+
+    if record is None:
+        print("진행 상황 파일이 없습니다.")
+        return
+
+    if "error" in record:
+        print(f"오류: {record['error']}")
+    print(f"\n{STATE_MESSAGES[run_state(record)]}")
 
 
 if __name__ == "__main__":
-    check_status()
+    tyro.cli(check_status)
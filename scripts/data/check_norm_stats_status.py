@@ -1,74 +1,97 @@
 """
 norm_stats 계산 상태 확인 스크립트
+
+compute_norm_stats.py가 기록하는 진행 상황 파일(기본값:
+<assets_dir>/<repo_id>/norm_stats.progress.jsonl)의 마지막 레코드만 읽으므로 파일 크기와
+관계없이 바로 응답합니다. 계산이 끝나면 기록된 norm_stats.json의 그리퍼 통계를 확인합니다.
+
+사용법:
+    python scripts/data/check_norm_stats_status.py \
+        --progress_file assets/pi0_e6_freeze_vlm/your_hf_username/dobot_e6_vla_dataset/norm_stats.progress.jsonl
+
+    # 실행 중인 계산을 5초마다 표시 (평균/실시간 처리 속도, ETA)
+    python scripts/data/check_norm_stats_status.py --progress_file ... --watch
 """
 
-import pathlib
 import json
+import pathlib
+import sys
+
+import tyro
+
+# Add RoboVLA root to path
+robo_vla_root = pathlib.Path(__file__).parent.parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from pipeline.progress import format_progress, read_progress, run_state, watch_progress
+
+
+STATE_MESSAGES = {
+    "done": "✅ 계산 완료!",
+    "failed": "❌ 오류 발생!",
+    "interrupted": "⚠️  계산 중단됨 (계산 프로세스가 완료 기록 없이 종료됨)",
+    "running": "⏳ 계산 진행 중...",
+}
+
+
+def check_gripper_stats(norm_stats_path: pathlib.Path) -> None:
+    """norm_stats.json의 그리퍼 통계(actions[7]) 확인"""
+    with open(norm_stats_path, 'r') as f:
+        stats = json.load(f)
+    if 'norm_stats' in stats and 'actions' in stats['norm_stats']:
+        actions_stats = stats['norm_stats']['actions']
+        if 'mean' in actions_stats and len(actions_stats['mean']) >= 8:
+            print(f"\n[그리퍼 통계 확인]")
+            print(f"  actions[6] (dummy): mean={actions_stats['mean'][6]:.6f}, std={actions_stats['std'][6]:.6f}")
+            print(f"  actions[7] (gripper): mean={actions_stats['mean'][7]:.6f}, std={actions_stats['std'][7]:.6f}")
+            if abs(actions_stats['mean'][7]) > 1e-6 or abs(actions_stats['std'][7]) > 1e-6:
+                print("  ✅ 그리퍼 값이 정상적으로 계산되었습니다!")
+            else:
+                print("  ⚠️  그리퍼 값이 여전히 0입니다.")
+
+
+def check_status(progress_file: str, watch: bool = False, interval: float = 5.0):
+    """
+    norm_stats 계산 진행 상황을 출력합니다.
+
+    Args:
+        progress_file: compute_norm_stats.py의 진행 상황 파일 경로
+        watch: 계산이 끝날 때까지 interval초마다 상태를 출력
+        interval: --watch 갱신 간격 (초)
+    """
+    path = pathlib.Path(progress_file)
 
-def check_status():
-    log_file = pathlib.Path("/tmp/norm_stats.log")
-    
     print("=" * 80)
     print("norm_stats 계산 상태")
     print("=" * 80)
-    
-    if not log_file.exists():
-        print("로그 파일이 없습니다.")
+    print(f"\n진행 상황 파일: {path}\n")
+
+    if watch:
+        record = watch_progress(path, interval)
+    else:
+        record = read_progress(path)
+        if record is not None:
+            print(format_progress(record))
+
+    if record is None:
+        print("진행 상황 파일이 없습니다.")
         return
-    
-    # 로그 파일의 마지막 몇 줄 읽기
-    with open(log_file, 'r') as f:
-        lines = f.readlines()
-    
-    print(f"\n로그 파일: {log_file}")
-    print(f"로그 라인 수: {len(lines)}")
-    
-    # 진행률 확인
-    progress_lines = [l for l in lines if "Computing stats:" in l]
-    if progress_lines:
-        last_progress = progress_lines[-1]
-        print(f"\n[최근 진행 상황]")
-        print(last_progress.strip())
-    
-    print("\n[최근 로그 (마지막 15줄)]")
-    for line in lines[-15:]:
-        print(line.rstrip())
-    
-    # 완료 여부 확인
-    if lines:
-        last_lines = ''.join(lines[-10:])
-        if "Saved norm_stats" in last_lines or "norm_stats.json" in last_lines:
-            print("\n✅ 계산 완료!")
-            
-            # norm_stats.json 위치 확인
-            config_name = "pi0_e6_freeze_vlm"
-            possible_paths = [
-                pathlib.Path.home() / ".cache" / "openpi" / "openpi-assets" / "checkpoints" / config_name / "assets" / "norm_stats.json",
-                pathlib.Path("checkpoints") / config_name / "assets" / "norm_stats.json",
-            ]
-            
-            for p in possible_paths:
-                if p.exists():
-                    print(f"\n✅ norm_stats.json 발견: {p}")
-                    # 그리퍼 통계 확인
-                    with open(p, 'r') as f:
-                        stats = json.load(f)
-                    if 'norm_stats' in stats and 'actions' in stats['norm_stats']:
-                        actions_stats = stats['norm_stats']['actions']
-                        if 'mean' in actions_stats and len(actions_stats['mean']) >= 8:
-                            print(f"\n[그리퍼 통계 확인]")
-                            print(f"  actions[6] (dummy): mean={actions_stats['mean'][6]:.6f}, std={actions_stats['std'][6]:.6f}")
-                            print(f"  actions[7] (gripper): mean={actions_stats['mean'][7]:.6f}, std={actions_stats['std'][7]:.6f}")
-                            if abs(actions_stats['mean'][7]) > 1e-6 or abs(actions_stats['std'][7]) > 1e-6:
-                                print("  ✅ 그리퍼 값이 정상적으로 계산되었습니다!")
-                            else:
-                                print("  ⚠️  그리퍼 값이 여전히 0입니다.")
-                    break
-        elif "Error" in last_lines or "Traceback" in last_lines:
-            print("\n❌ 오류 발생!")
+
+    if "config_name" in record:
+        print(f"Config: {record['config_name']} ({record.get('repo_id')})")
+    if "error" in record:
+        print(f"오류: {record['error']}")
+    state = run_state(record)
+    print(f"\n{STATE_MESSAGES[state]}")
+
+    if state == "done" and record.get("output"):
+        norm_stats_path = pathlib.Path(record["output"])
+        if norm_stats_path.exists():
+            print(f"\n✅ norm_stats.json 발견: {norm_stats_path}")
+            check_gripper_stats(norm_stats_path)
         else:
-            print("\n⏳ 계산 진행 중...")
+            print(f"\n⚠️  norm_stats.json이 없습니다: {norm_stats_path}")
 
 
 if __name__ == "__main__":
-    check_status()
+    tyro.cli(check_status)
@@ -3,8 +3,46 @@
 This script is used to compute the normalization statistics for a given config. It
 will compute the mean and standard deviation of the data in the dataset and save it
 to the config assets directory.
+
+For LeRobot datasets the statistics are computed from the parquet columns by default
+(see pipeline/norm_stats.py): only the low-dimensional columns are read, action chunks
+are gathered with array indexing, and the config's repack and data transforms run on
+whole batches with placeholder images, so no image is decoded. The stats are fed in
+the data loader's batches (config.batch_size, in dataset order, last partial batch
+dropped), so norm_stats.json is identical to the data loader path, which --no-fast
+still runs. Before computing, a few frames are checked against the data loader.
+
+With --workers N the parquet path is map-reduced: worker processes summarize disjoint
+episode ranges as mergeable VectorStats (count, mean, M2, min/max, histograms; see
+pipeline/norm_stats.py), which are merged with the parallel variance formula.
+
+With --incremental one VectorStats per episode is cached in
+<assets_dir>/<repo_id>/norm_stats.episodes/ (keyed by a fingerprint of the episode's
+frame data), so re-runs only compute new or changed episodes and drop removed ones.
+
+Both compute over exactly the default path's frames (the rows of select_rows(); an
+episode cut short by the last partial batch has its own cache entry), which every run
+checks by frame count. Mean and std then match the default path's up to floating-point
+rounding (MATCH_TOLERANCE). q01/q99 do not: on every path they are read off 5000-bin
+histograms, and the merged histograms are binned differently from RunningStats' (which
+re-bins as its range grows), so they are approximate, typically within a few bins of
+the default path's. --check also runs the default path, fails if mean/std deviate
+beyond MATCH_TOLERANCE and reports the quantile deviation, failing only beyond the
+looser QUANTILE_TOLERANCE.
+
+Progress (phase, frames done, throughput, ETA) is appended to a JSON-lines file,
+<assets_dir>/<repo_id>/norm_stats.progress.jsonl by default, which
+check_norm_stats_status.py reads.
 """
 
+import dataclasses
+import math
+import multiprocessing
+import pathlib
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
 import numpy as np
 import tqdm
 import tyro
@@ -15,6 +53,47 @@ import openpi.training.config as _config
 import openpi.training.data_loader as _data_loader
 import openpi.transforms as transforms
 
+# Add RoboVLA root to path
+robo_vla_root = pathlib.Path(__file__).parent.parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from pipeline.manifest import config_fingerprint, lerobot_home
+from pipeline.norm_stats import (
+    NUM_QUANTILE_BINS,
+    EpisodeStatsCache,
+    FrameColumns,
+    VectorStats,
+    action_chunk_indices,
+    episode_fingerprint,
+    episode_stats_key,
+    frame_batches,
+    read_episode_lengths,
+    read_frame_columns,
+)
+from pipeline.progress import ProgressWriter
+from pipeline.sharding import select_shard
+
+# Frames per transform call on the fast path (a multiple of the batch size)
+FAST_CHUNK_FRAMES = 4096
+
+# Target frames per worker task with --workers
+PARALLEL_TASK_FRAMES = 16384
+
+# Keys norm stats are computed for (after the config's input transforms)
+NORM_STATS_KEYS = ["state", "actions"]
+
+# DataConfig fields left out of the per-episode cache fingerprint: the norm stats themselves
+# (loaded from the assets this script writes) and the model transforms, which run after them
+STATS_INDEPENDENT_FIELDS = ("norm_stats", "model_transforms")
+
+# Largest deviation of --workers/--incremental mean/std from the default path's (--check), as a
+# fraction of the default std: the same frames summed in a different order
+MATCH_TOLERANCE = 1e-5
+
+# Bound on the q01/q99 deviation (--check), as a fraction of the default q01..q99 span. The
+# quantiles are histogram approximations binned differently, not a floating-point match.
+QUANTILE_TOLERANCE = 1e-2
+
 
 class RemoveStrings(transforms.DataTransformFn):
     def __call__(self, x: dict) -> dict:
@@ -86,10 +165,14 @@ def create_rlds_dataloader(
     return data_loader, num_batches
 
 
-def main(config_name: str, max_frames: int | None = None):
-    config = _config.get_config(config_name)
-    data_config = config.data.create(config.assets_dirs, config.model)
-
+def compute_stats_from_loader(
+    config: _config.TrainConfig,
+    data_config: _config.DataConfig,
+    keys: list[str],
+    progress: ProgressWriter,
+    max_frames: int | None = None,
+) -> dict[str, normalize.RunningStats]:
+    """Norm stats over the training data loader (decodes and transforms every frame)."""
     if data_config.rlds_data_dir is not None:
         data_loader, num_batches = create_rlds_dataloader(
             data_config, config.model.action_horizon, config.batch_size, max_frames
@@ -99,18 +182,478 @@ def main(config_name: str, max_frames: int | None = None):
             data_config, config.model.action_horizon, config.batch_size, config.model, config.num_workers, max_frames
         )
 
-    keys = ["state", "actions"]
     stats = {key: normalize.RunningStats() for key in keys}
 
+    progress.frames_total = num_batches * config.batch_size
+    progress.set_phase("computing")
     for batch in tqdm.tqdm(data_loader, total=num_batches, desc="Computing stats"):
         for key in keys:
             stats[key].update(np.asarray(batch[key]))
+        progress.update(frames=len(batch["state"]))
+    return stats
+
+
+def transform_batch(
+    transform_fns: list[transforms.DataTransformFn],
+    batch: dict[str, np.ndarray],
+    keys: list[str],
+    batched: bool,
+) -> dict[str, np.ndarray]:
+    """keys of the transformed frames of a batch, applying the transforms to the whole batch if batched."""
+    if batched:
+        for fn in transform_fns:
+            batch = fn(batch)
+        return {key: np.asarray(batch[key]) for key in keys}
+    outputs = {key: [] for key in keys}
+    for i in range(len(batch["index"])):
+        frame = {name: values[i] for name, values in batch.items()}
+        for fn in transform_fns:
+            frame = fn(frame)
+        for key in keys:
+            outputs[key].append(np.asarray(frame[key]))
+    return {key: np.stack(values) for key, values in outputs.items()}
+
 
-    norm_stats = {key: stats.get_statistics() for key, stats in stats.items()}
+def check_against_loader(
+    frames: FrameColumns,
+    data_config: _config.DataConfig,
+    config: _config.TrainConfig,
+    transform_fns: list[transforms.DataTransformFn],
+    keys: list[str],
+    batched: bool,
+) -> None:
+    """Compare a few fast-path frames (incl. a padded action chunk) with the data loader's.
+
+    frames may be any run of whole episodes; their "index" column locates them in the dataset.
+    """
+    horizon = config.model.action_horizon
+    _, is_pad = action_chunk_indices(frames.columns["episode_index"], horizon)
+    padded = np.flatnonzero(is_pad.any(axis=1))
+    rows = np.unique([0, len(frames) - 1, *padded[:1], *(padded[:1] - 1).clip(0)])
+    batch = next(frame_batches(frames, tuple(data_config.action_sequence_keys), horizon, len(rows), rows))
+    if data_config.prompt_from_task:
+        batch["prompt"] = batch["task"]
+    fast = transform_batch(transform_fns, batch, keys, batched)
+
+    dataset = _data_loader.create_torch_dataset(data_config, horizon, config.model)
+    dataset = _data_loader.TransformedDataset(dataset, transform_fns)
+    for i, row in enumerate(rows):
+        reference = dataset[int(frames.columns["index"][row])]
+        for key in keys:
+            expected = np.asarray(reference[key])
+            if expected.dtype != fast[key].dtype or not np.array_equal(expected, fast[key][i]):
+                raise ValueError(
+                    f"Fast path disagrees with the data loader on '{key}' of frame {row}; "
+                    f"re-run with --no-fast"
+                )
+
+
+def fast_transforms(data_config: _config.DataConfig) -> list[transforms.DataTransformFn]:
+    return [
+        *data_config.repack_transforms.inputs,
+        *data_config.data_transforms.inputs,
+        RemoveStrings(),
+    ]
+
+
+def select_rows(num_frames: int, batch_size: int, max_frames: int | None = None) -> tuple[int, np.ndarray]:
+    """(num_batches, dataset rows) the stats are computed over: whole batches, like the data loader."""
+    if max_frames is not None and max_frames < num_frames:
+        # A seeded random subset, in dataset order (not the data loader's shuffle order)
+        num_batches = max_frames // batch_size
+        rows = np.sort(np.random.default_rng(0).choice(num_frames, num_batches * batch_size, replace=False))
+    else:
+        num_batches = num_frames // batch_size
+        rows = np.arange(num_batches * batch_size)
+    return num_batches, rows
+
+
+def episode_row_counts(lengths: dict[int, int], num_rows: int) -> dict[int, int]:
+    """Frames of each episode among the first num_rows dataset frames (the rows select_rows() keeps)."""
+    offsets = np.cumsum([0, *lengths.values()])
+    return {
+        episode: int(np.clip(num_rows - offset, 0, length))
+        for episode, offset, length in zip(lengths, offsets, lengths.values())
+    }
+
+
+def check_frame_count(merged: VectorStats, num_frames: int, part: VectorStats, part_frames: int) -> None:
+    """Raise unless merged stats cover exactly the default path's num_frames frames.
+
+    part holds the stats of part_frames of them, which gives the vectors per frame (e.g. the
+    action horizon for action chunks).
+    """
+    vectors_per_frame, remainder = divmod(part.count, part_frames)
+    if remainder or merged.count != vectors_per_frame * num_frames:
+        raise RuntimeError(
+            f"Merged stats cover {merged.count / max(vectors_per_frame, 1):g} frames, the default path {num_frames}"
+        )
+
+
+def prepare_fast_path(
+    frames: FrameColumns,
+    config: _config.TrainConfig,
+    data_config: _config.DataConfig,
+    transform_fns: list[transforms.DataTransformFn],
+    keys: list[str],
+) -> bool:
+    """Whether the transforms accept whole batches; raises if the fast path disagrees with the data loader."""
+    # Transforms written for single frames usually also work on batches; if not, run them per frame
+    batched = True
+    probe = next(frame_batches(frames, tuple(data_config.action_sequence_keys), config.model.action_horizon, 2))
+    if data_config.prompt_from_task:
+        probe["prompt"] = probe["task"]
+    try:
+        transform_batch(transform_fns, probe, keys, batched=True)
+    except Exception as e:
+        print(f"Transforms do not accept batches ({type(e).__name__}: {e}); applying them per frame")
+        batched = False
+    check_against_loader(frames, data_config, config, transform_fns, keys, batched)
+    return batched
+
+
+def compute_stats_from_columns(
+    config: _config.TrainConfig,
+    data_config: _config.DataConfig,
+    keys: list[str],
+    progress: ProgressWriter,
+    max_frames: int | None = None,
+) -> dict[str, normalize.RunningStats]:
+    """Norm stats from the LeRobot parquet columns, batch for batch as the data loader."""
+    frames = read_frame_columns(lerobot_home() / data_config.repo_id)
+    transform_fns = fast_transforms(data_config)
+    batch_size = config.batch_size
+    num_batches, rows = select_rows(len(frames), batch_size, max_frames)
+    print(f"Read {len(frames)} frames ({', '.join(frames.columns)}) from {lerobot_home() / data_config.repo_id}")
+    batched = prepare_fast_path(frames, config, data_config, transform_fns, keys)
+
+    stats = {key: normalize.RunningStats() for key in keys}
+    progress.frames_total = len(rows)
+    progress.set_phase("computing")
+    chunk_frames = batch_size * max(1, FAST_CHUNK_FRAMES // batch_size)
+    with tqdm.tqdm(total=num_batches, desc="Computing stats") as bar:
+        for batch in frame_batches(
+            frames, tuple(data_config.action_sequence_keys), config.model.action_horizon, chunk_frames, rows
+        ):
+            if data_config.prompt_from_task:
+                batch["prompt"] = batch["task"]
+            values = transform_batch(transform_fns, batch, keys, batched)
+            # Same update sequence as the data loader (histogram ranges depend on it)
+            for start in range(0, len(batch["index"]), batch_size):
+                for key in keys:
+                    stats[key].update(values[key][start:start + batch_size])
+                bar.update(1)
+            progress.update(frames=len(batch["index"]))
+    return stats
+
+
+# Config state of a stats worker process (set by init_stats_worker)
+_worker: dict = {}
+
+
+def init_stats_worker(config_name: str, batched: bool) -> None:
+    """Process pool initializer: build the config and its transforms once per worker."""
+    config = _config.get_config(config_name)
+    data_config = config.data.create(config.assets_dirs, config.model)
+    _worker.update(config=config, data_config=data_config, transform_fns=fast_transforms(data_config), batched=batched)
+
+
+def frame_stats(
+    frames: FrameColumns,
+    rows: np.ndarray,
+    config: _config.TrainConfig,
+    data_config: _config.DataConfig,
+    transform_fns: list[transforms.DataTransformFn],
+    keys: list[str],
+    batched: bool,
+) -> dict[str, VectorStats]:
+    """Mergeable stats of the transformed keys of some frames."""
+    values = {key: [] for key in keys}
+    for batch in frame_batches(
+        frames, tuple(data_config.action_sequence_keys), config.model.action_horizon, FAST_CHUNK_FRAMES, rows
+    ):
+        if data_config.prompt_from_task:
+            batch["prompt"] = batch["task"]
+        for key, value in transform_batch(transform_fns, batch, keys, batched).items():
+            values[key].append(value)
+
+    stats = {}
+    for key in keys:
+        # One add for all frames: the histogram range is that of all their values
+        value = np.concatenate(values[key])
+        stats[key] = VectorStats(value.shape[-1])
+        stats[key].add(value)
+    return stats
+
+
+def episode_range_stats(episodes: list[int], rows: np.ndarray, keys: list[str]) -> tuple[dict[str, VectorStats], int]:
+    """Mergeable stats of some episodes' frames; rows count from the first frame of episodes[0]."""
+    config, data_config = _worker["config"], _worker["data_config"]
+    frames = read_frame_columns(lerobot_home() / data_config.repo_id, episodes)
+    stats = frame_stats(frames, rows, config, data_config, _worker["transform_fns"], keys, _worker["batched"])
+    return stats, len(rows)
+
+
+def run_stats_tasks(
+    config_name: str,
+    batched: bool,
+    tasks: list[tuple[list[int], np.ndarray]],
+    keys: list[str],
+    workers: int,
+) -> Iterator[tuple[dict[str, VectorStats], int]]:
+    """episode_range_stats() of each (episodes, rows) task, in task order."""
+    if not tasks:
+        return
+    if workers <= 1:
+        init_stats_worker(config_name, batched)
+        for episodes, rows in tasks:
+            yield episode_range_stats(episodes, rows, keys)
+        return
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_stats_worker,
+        initargs=(config_name, batched),
+    ) as executor:
+        yield from executor.map(episode_range_stats, *zip(*tasks), [keys] * len(tasks))
+
+
+def compute_stats_in_parallel(
+    config_name: str,
+    config: _config.TrainConfig,
+    data_config: _config.DataConfig,
+    keys: list[str],
+    progress: ProgressWriter,
+    workers: int,
+    max_frames: int | None = None,
+) -> dict[str, normalize.NormStats]:
+    """Norm stats from the LeRobot parquet columns, map-reduced over episode ranges in worker processes."""
+    dataset_root = lerobot_home() / data_config.repo_id
+    lengths = read_episode_lengths(dataset_root)
+    episodes = list(lengths)
+    offsets = np.concatenate([[0], np.cumsum(list(lengths.values()), dtype=np.int64)])
+    _, rows = select_rows(int(offsets[-1]), config.batch_size, max_frames)
+    print(f"{len(episodes)} episodes, {offsets[-1]} frames in {dataset_root}")
+
+    # The first episode holds dataset frame 0 and padded action chunks, enough for the loader check
+    transform_fns = fast_transforms(data_config)
+    batched = prepare_fast_path(read_frame_columns(dataset_root, episodes[:1]), config, data_config, transform_fns, keys)
+
+    # More tasks than workers keeps them busy; each task's values are held in memory at once
+    num_tasks = min(len(episodes), max(workers * 4, math.ceil(offsets[-1] / PARALLEL_TASK_FRAMES)))
+    tasks = []
+    for positions in (select_shard(range(len(episodes)), i, num_tasks) for i in range(num_tasks)):
+        start, end = offsets[positions[0]], offsets[positions[-1] + 1]
+        task_rows = rows[(rows >= start) & (rows < end)] - start
+        if len(task_rows):
+            tasks.append(([episodes[p] for p in positions], task_rows))
+
+    progress.frames_total = len(rows)
+    progress.set_phase("computing")
+    partials = []
+    with tqdm.tqdm(total=len(rows), desc=f"Computing stats ({workers} workers)") as bar:
+        for stats, num_frames in run_stats_tasks(config_name, batched, tasks, keys, workers):
+            partials.append((stats, num_frames))
+            bar.update(num_frames)
+            progress.update(frames=num_frames)
+
+    # Merged in episode order, so the result does not depend on which worker finished first
+    norm_stats = {}
+    for key in keys:
+        merged = VectorStats(partials[0][0][key].width)
+        merged.merge(*(stats[key] for stats, _ in partials))
+        check_frame_count(merged, len(rows), partials[0][0][key], partials[0][1])
+        norm_stats[key] = normalize.NormStats(**merged.statistics())
+    return norm_stats
+
+
+def check_against_default(
+    norm_stats: dict[str, normalize.NormStats],
+    reference: dict[str, normalize.NormStats],
+) -> None:
+    """Raise if merged mean/std deviate from the default path's beyond MATCH_TOLERANCE
+    (or the approximate q01/q99 beyond QUANTILE_TOLERANCE)."""
+    failures = []
+    for key, expected in reference.items():
+        span = np.asarray(expected.q99) - np.asarray(expected.q01)
+        for name, scale, tolerance in (
+            ("mean", expected.std, MATCH_TOLERANCE),
+            ("std", expected.std, MATCH_TOLERANCE),
+            ("q01", span, QUANTILE_TOLERANCE),
+            ("q99", span, QUANTILE_TOLERANCE),
+        ):
+            scale = np.asarray(scale)
+            diff = np.abs(np.asarray(getattr(norm_stats[key], name)) - np.asarray(getattr(expected, name)))
+            deviation = float((diff / np.where(scale > 0, scale, 1.0)).max())
+            kind = "approximate, " if tolerance is QUANTILE_TOLERANCE else ""
+            print(f"  {key}.{name}: max deviation {deviation:.2e} ({kind}tolerance {tolerance:.0e})")
+            if deviation > tolerance:
+                failures.append(f"{key}.{name}")
+    if failures:
+        raise ValueError(f"Stats deviate from the default path: {', '.join(failures)}")
+    print("✅ Mean/std match the default path; q01/q99 are within the histogram approximation")
+
+
+def episode_stats_cache(
+    config_name: str,
+    config: _config.TrainConfig,
+    data_config: _config.DataConfig,
+    keys: list[str],
+    cache_dir: pathlib.Path,
+) -> EpisodeStatsCache:
+    """Per-episode stats cache, valid for this config's data config, action horizon and keys.
+
+    The data config is fingerprinted field by field (dataclasses.asdict, as in
+    pipeline/manifest.config_fingerprint), without the fields the stats do not depend on.
+    """
+    data_fields = {
+        field.name: getattr(data_config, field.name)
+        for field in dataclasses.fields(data_config)
+        if field.name not in STATS_INDEPENDENT_FIELDS
+    }
+    return EpisodeStatsCache(cache_dir, config_fingerprint(
+        config_name,
+        {name: dataclasses.asdict(value) if dataclasses.is_dataclass(value) else value
+         for name, value in data_fields.items()},
+        config.model.action_horizon,
+        keys,
+        NUM_QUANTILE_BINS,
+    ))
+
+
+def compute_stats_incrementally(
+    config_name: str,
+    config: _config.TrainConfig,
+    data_config: _config.DataConfig,
+    keys: list[str],
+    progress: ProgressWriter,
+    workers: int,
+    cache_dir: pathlib.Path,
+) -> dict[str, normalize.NormStats]:
+    """Norm stats merged from per-episode stats cached in cache_dir; only new or changed episodes are computed."""
+    dataset_root = lerobot_home() / data_config.repo_id
+    cache = episode_stats_cache(config_name, config, data_config, keys, cache_dir)
+
+    # LeRobot never writes empty episodes, but they would have no stats to cache
+    lengths = {episode: length for episode, length in read_episode_lengths(dataset_root).items() if length}
+    # The frames of the default path: whole batches in dataset order, so the last episodes may be cut short
+    _, rows = select_rows(sum(lengths.values()), config.batch_size)
+    counts = episode_row_counts(lengths, len(rows))
+    # Episodes a converter just wrote were fingerprinted from its in-memory arrays; read the others
+    recorded = {
+        episode: fingerprint for episode, (fingerprint, length) in cache.recorded_episodes().items()
+        if lengths.get(episode) == length
+    }
+    fingerprints = {
+        episode: recorded[episode] if episode in recorded
+        else episode_fingerprint(read_frame_columns(dataset_root, [episode]))
+        for episode in tqdm.tqdm(lengths, desc="Fingerprinting episodes")
+    }
+    entries = {
+        episode: episode_stats_key(fingerprints[episode], counts[episode], lengths[episode])
+        for episode in lengths if counts[episode]
+    }
+    # Identical episodes share one entry; whole-episode entries of cut episodes are kept for appends
+    pending = {key: episode for episode, key in entries.items() if key not in cache}
+    removed = cache.remove_except(set(entries.values()) | set(fingerprints.values()))
+    print(
+        f"{len(lengths)} episodes in {dataset_root}: {len(entries) - len(pending)} cached, "
+        f"{len(pending)} new or changed, {removed} removed ({len(lengths) - len(recorded)} fingerprinted)"
+    )
+
+    if pending:
+        first_episode = read_frame_columns(dataset_root, list(lengths)[:1])
+        batched = prepare_fast_path(first_episode, config, data_config, fast_transforms(data_config), keys)
+        tasks = [([episode], np.arange(counts[episode])) for episode in pending.values()]
+        progress.frames_total = sum(len(rows) for _, rows in tasks)
+        progress.set_phase("computing")
+        with tqdm.tqdm(total=progress.frames_total, desc="Computing episode stats") as bar:
+            results = run_stats_tasks(config_name, batched, tasks, keys, workers)
+            for key, (stats, num_frames) in zip(pending, results):
+                cache.save(key, stats)
+                bar.update(num_frames)
+                progress.update(frames=num_frames)
+
+    # Merged in episode order, so an update gives the same result as recomputing every episode
+    order = list(entries.values())
+    norm_stats = {}
+    for key in keys:
+        merged = cache.merge(order, key)
+        check_frame_count(merged, len(rows), cache.load(order[0], key, histogram=False), counts[next(iter(entries))])
+        norm_stats[key] = normalize.NormStats(**merged.statistics())
+    cache.forget_episodes()
+    return norm_stats
+
+
+def main(
+    config_name: str,
+    max_frames: int | None = None,
+    progress_file: str | None = None,
+    fast: bool = True,
+    workers: int = 1,
+    incremental: bool = False,
+    output_dir: str | None = None,
+    check: bool = False,
+):
+    """Compute the norm stats of a config's dataset.
+
+    Args:
+        config_name: Training config name.
+        max_frames: Compute the stats over at most this many frames.
+        progress_file: Progress log (default: <assets_dir>/<repo_id>/norm_stats.progress.jsonl).
+        fast: Read LeRobot parquet columns without decoding images (--no-fast: iterate the data loader).
+        workers: Worker processes for the parquet path (>1: mergeable per-episode-range stats).
+            Mean/std match the serial result up to floating-point rounding; q01/q99 are
+            approximate (histogram-based, typically within a few of 5000 bins of the serial
+            result, which is itself histogram-based).
+        incremental: Cache per-episode stats in <assets_dir>/<repo_id>/norm_stats.episodes and only
+            compute new or changed episodes (parquet path; no --max_frames). Same accuracy as
+            --workers.
+        output_dir: Write norm_stats.json here instead of <assets_dir>/<repo_id>.
+        check: With --workers or --incremental, also run the default path and fail if mean/std
+            deviate by more than MATCH_TOLERANCE (1e-5 of the std) or the approximate q01/q99
+            by more than QUANTILE_TOLERANCE (1% of the q01..q99 span).
+    """
+    config = _config.get_config(config_name)
+    data_config = config.data.create(config.assets_dirs, config.model)
+    assets_path = config.assets_dirs / data_config.repo_id
+    output_path = pathlib.Path(output_dir) if output_dir else assets_path
+
+    progress = ProgressWriter(
+        pathlib.Path(progress_file) if progress_file else output_path / "norm_stats.progress.jsonl",
+        job="norm_stats",
+        config_name=config_name,
+        repo_id=data_config.repo_id,
+    )
+    keys = NORM_STATS_KEYS
+    if incremental and (not fast or data_config.rlds_data_dir is not None or max_frames is not None):
+        raise ValueError("--incremental needs the parquet path of a LeRobot dataset and no --max_frames")
+    merged = incremental or (fast and data_config.rlds_data_dir is None and workers > 1)
+    if check and not merged:
+        raise ValueError("--check compares --workers or --incremental stats with the default path")
+    with progress:
+        progress.set_phase("loading")
+        if incremental:
+            norm_stats = compute_stats_incrementally(
+                config_name, config, data_config, keys, progress, workers, assets_path / "norm_stats.episodes"
+            )
+        elif merged:
+            norm_stats = compute_stats_in_parallel(config_name, config, data_config, keys, progress, workers, max_frames)
+        else:
+            if fast and data_config.rlds_data_dir is None:
+                stats = compute_stats_from_columns(config, data_config, keys, progress, max_frames)
+            else:
+                stats = compute_stats_from_loader(config, data_config, keys, progress, max_frames)
+            norm_stats = {key: stats.get_statistics() for key, stats in stats.items()}
+        if check:
+            print("Checking against the default path...")
+            stats = compute_stats_from_columns(config, data_config, keys, progress, max_frames)
+            check_against_default(norm_stats, {key: stats.get_statistics() for key, stats in stats.items()})
 
-    output_path = config.assets_dirs / data_config.repo_id
-    print(f"Writing stats to: {output_path}")
-    normalize.save(output_path, norm_stats)
+        progress.set_phase("writing")
+        print(f"Writing stats to: {output_path}")
+        normalize.save(output_path, norm_stats)
+        progress.finish(output=str(output_path / "norm_stats.json"))
 
 
 if __name__ == "__main__":
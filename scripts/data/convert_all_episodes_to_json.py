@@ -6,12 +6,119 @@ VLA_DATASET의 모든 에피소드를 JSON으로 변환하는 스크립트.
         --vla_dataset_dir VLA_DATASET \
         --output_dir json_output \
         --use_csv
+
+    # 8개 프로세스로 병렬 변환 (에피소드 범위를 샤드로 나눠 실행, 실패한 샤드만 재시도)
+    python scripts/convert_all_episodes_to_json.py \
+        --vla_dataset_dir VLA_DATASET \
+        --output_dir json_output \
+        --jobs 8
 """
 
 import argparse
+import math
 import pathlib
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+
+
+@dataclass
+class ShardResult:
+    """convert_to_json.py 서브프로세스 하나의 실행 결과."""
+    shard_id: int
+    episode_dirs: list[pathlib.Path]
+    returncode: int
+    elapsed: float
+    log_path: pathlib.Path
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+    @property
+    def label(self) -> str:
+        names = [d.name for d in self.episode_dirs]
+        return names[0] if len(names) == 1 else f"{names[0]}-{names[-1]} ({len(names)} episodes)"
+
+
+def make_shards(episode_dirs: list[pathlib.Path], shard_size: int) -> list[list[pathlib.Path]]:
+    """에피소드 목록을 shard_size개씩 연속된 샤드로 나눕니다."""
+    return [episode_dirs[i:i + shard_size] for i in range(0, len(episode_dirs), shard_size)]
+
+
+def run_shard(
+    shard_id: int,
+    episode_dirs: list[pathlib.Path],
+    base_cmd: list[str],
+    extra_args: list[str],
+    cwd: pathlib.Path,
+    log_dir: pathlib.Path,
+) -> ShardResult:
+    """샤드 하나를 convert_to_json.py 서브프로세스로 실행하고 출력은 로그 파일에 남깁니다."""
+    cmd = base_cmd + ['--episode_dirs'] + [str(d) for d in episode_dirs] + extra_args
+    log_path = log_dir / f"shard_{shard_id:04d}.log"
+    start = time.perf_counter()
+    with open(log_path, 'w', encoding='utf-8') as log:
+        log.write(f"Command: {' '.join(cmd)}\n\n")
+        log.flush()
+        result = subprocess.run(cmd, cwd=cwd, stdout=log, stderr=subprocess.STDOUT)
+    return ShardResult(shard_id, episode_dirs, result.returncode, time.perf_counter() - start, log_path)
+
+
+def run_sharded(
+    episode_dirs: list[pathlib.Path],
+    base_cmd: list[str],
+    extra_args: list[str],
+    cwd: pathlib.Path,
+    log_dir: pathlib.Path,
+    jobs: int,
+    shard_size: int,
+    max_retries: int,
+) -> list[pathlib.Path]:
+    """샤드를 최대 jobs개씩 동시에 실행하고, 실패한 샤드만 에피소드 단위로 쪼개 재시도합니다.
+
+    Returns:
+        재시도 후에도 실패한 에피소드 디렉토리 목록
+    """
+    log_dir.mkdir(parents=True, exist_ok=True)
+    shards = make_shards(episode_dirs, shard_size)
+    next_shard_id = 0
+    failed: list[pathlib.Path] = []
+
+    for attempt in range(max_retries + 1):
+        if attempt > 0:
+            # 실패한 샤드는 에피소드 하나씩 다시 실행해 문제 에피소드만 격리
+            shards = make_shards(failed, 1)
+            print(f"\nRetry {attempt}/{max_retries}: {len(shards)} failed episodes")
+
+        total_episodes = sum(len(shard) for shard in shards)
+        done_episodes = 0
+        failed = []
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = []
+            for shard in shards:
+                futures.append(pool.submit(run_shard, next_shard_id, shard, base_cmd, extra_args, cwd, log_dir))
+                next_shard_id += 1
+
+            for future in as_completed(futures):
+                result = future.result()
+                done_episodes += len(result.episode_dirs)
+                status = "ok" if result.ok else f"FAILED (exit code {result.returncode}, log: {result.log_path})"
+                print(
+                    f"  [{done_episodes}/{total_episodes} episodes, {time.perf_counter() - start:.0f}s] "
+                    f"shard {result.shard_id} {result.label}: {status} in {result.elapsed:.1f}s"
+                )
+                if not result.ok:
+                    failed.extend(result.episode_dirs)
+
+        if not failed:
+            break
+
+    return sorted(failed, key=lambda d: int(d.name) if d.name.isdigit() else d.name)
 
 def main():
     parser = argparse.ArgumentParser(description="Convert all episodes in VLA_DATASET to JSON")
@@ -37,6 +144,11 @@ def main():
         action='store_true',
         help='Do not include images in JSON'
     )
+    parser.add_argument(
+        '--columnar',
+        action='store_true',
+        help='Also write the binary columnar format (<n>.episode/ .npy columns) next to each JSON'
+    )
     parser.add_argument(
         '--start_episode',
         type=int,
@@ -49,6 +161,24 @@ def main():
         default=138,
         help='End episode number (default: 138)'
     )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Number of concurrent convert_to_json.py processes (default: 1 = single process, all episodes)'
+    )
+    parser.add_argument(
+        '--shard_size',
+        type=int,
+        default=None,
+        help='Episodes per shard with --jobs > 1 (default: split into ~4 shards per job)'
+    )
+    parser.add_argument(
+        '--max_retries',
+        type=int,
+        default=2,
+        help='Retry rounds for failed shards with --jobs > 1; retries run episode by episode (default: 2)'
+    )
     
     args = parser.parse_args()
     
@@ -93,32 +223,65 @@ def main():
     print(f"Use CSV: {args.use_csv}")
     print(f"Include images: {not args.no_images}")
     
-    # 변환 명령어 구성
-    cmd = [
-        sys.executable,
-        str(convert_script),
-        '--episode_dirs',
-    ] + [str(d) for d in episode_dirs] + [
-        '--output_dir',
-        str(output_dir),
-    ]
+    # 변환 명령어 구성 (--episode_dirs는 샤드마다 채움)
+    base_cmd = [sys.executable, str(convert_script)]
+    extra_args = ['--output_dir', str(output_dir)]
     
     if args.use_csv:
-        cmd.append('--use-csv')
+        extra_args.append('--use-csv')
     
     if args.no_images:
-        cmd.append('--no-images')
-    
-    print(f"\nRunning conversion command...")
-    print(f"Command: {' '.join(cmd)}")
+        extra_args.append('--no-images')
     
     # 변환 실행
-    try:
-        result = subprocess.run(cmd, check=True, cwd=vla_dataset_dir.parent)
+    if args.jobs > 1:
+        # 샤드 병렬 변환: 에피소드 하나의 실패가 전체 실행을 실패시키지 않음
+        shard_size = args.shard_size or max(1, math.ceil(len(episode_dirs) / (args.jobs * 4)))
+        log_dir = output_dir / "_shard_logs"
+        print(f"\nRunning {math.ceil(len(episode_dirs) / shard_size)} shards of up to {shard_size} episodes "
+              f"with {args.jobs} jobs (logs: {log_dir})...")
+        start = time.perf_counter()
+        failed = run_sharded(
+            episode_dirs,
+            base_cmd,
+            extra_args,
+            cwd=vla_dataset_dir.parent,
+            log_dir=log_dir,
+            jobs=args.jobs,
+            shard_size=shard_size,
+            max_retries=args.max_retries,
+        )
+        print(f"\nConverted {len(episode_dirs) - len(failed)}/{len(episode_dirs)} episodes "
+              f"in {time.perf_counter() - start:.1f}s")
+    else:
+        failed = []
+        cmd = base_cmd + ['--episode_dirs'] + [str(d) for d in episode_dirs] + extra_args
+        
+        print(f"\nRunning conversion command...")
+        print(f"Command: {' '.join(cmd)}")
+        
+        try:
+            subprocess.run(cmd, check=True, cwd=vla_dataset_dir.parent)
+        except subprocess.CalledProcessError as e:
+            print(f"\n❌ Conversion failed with exit code {e.returncode}")
+            sys.exit(1)
+    
+    if failed:
+        print(f"\n⚠️  Conversion finished with {len(failed)} failed episodes: {', '.join(d.name for d in failed)}")
+    else:
         print(f"\n✅ Conversion complete!")
-        print(f"JSON files saved to: {output_dir}")
-    except subprocess.CalledProcessError as e:
-        print(f"\n❌ Conversion failed with exit code {e.returncode}")
+    print(f"JSON files saved to: {output_dir}")
+    
+    if args.columnar:
+        from pipeline.columnar import write_columnar_episode
+        from pipeline.json_stream import load_json_without_images
+        
+        print(f"\nWriting columnar episodes...")
+        for json_file in sorted(output_dir.glob("*.json")):
+            write_columnar_episode(output_dir, json_file.stem, load_json_without_images(json_file))
+        print(f"✅ Columnar episodes saved to: {output_dir}")
+    
+    if failed:
         sys.exit(1)
 
 
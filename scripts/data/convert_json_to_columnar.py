@@ -0,0 +1,64 @@
+"""
+Convert per-episode JSON files to the binary columnar intermediate format.
+
+Each <n>.json becomes a <n>.episode/ directory of memory-mappable .npy columns
+(see pipeline/columnar.py). The LeRobot converters read these directly, skipping
+JSON float parsing on every conversion run.
+
+사용법:
+    python scripts/data/convert_json_to_columnar.py \
+        --json_dir json_output \
+        --output_dir columnar_output
+"""
+
+import pathlib
+import sys
+
+import tyro
+
+# Add RoboVLA root to path
+robo_vla_root = pathlib.Path(__file__).parent.parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from pipeline.columnar import write_columnar_episode
+from pipeline.json_stream import load_json_without_images
+
+
+def main(json_dir: str, output_dir: str):
+    """
+    Convert JSON episodes to columnar episodes.
+
+    Args:
+        json_dir: Directory with per-episode JSON files
+        output_dir: Output directory for <n>.episode directories (may equal json_dir)
+
+    Only numeric fields are stored; embedded image payloads are dropped, images are
+    read from images_base_dir at conversion time.
+    """
+    json_path = pathlib.Path(json_dir)
+    output_path = pathlib.Path(output_dir)
+
+    json_files = sorted(json_path.glob("*.json"))
+    if len(json_files) == 0:
+        raise ValueError(f"No JSON files found in {json_dir}")
+
+    print(f"Found {len(json_files)} JSON files")
+
+    json_bytes = 0
+    columnar_bytes = 0
+    for json_file in json_files:
+        data = load_json_without_images(json_file)
+
+        episode_dir = write_columnar_episode(output_path, json_file.stem, data)
+        size = sum(p.stat().st_size for p in episode_dir.iterdir())
+        json_bytes += json_file.stat().st_size
+        columnar_bytes += size
+        print(f"  {json_file.name} → {episode_dir.name} ({len(data['frames'])} frames)")
+
+    print(f"\n✅ Columnar conversion complete!")
+    print(f"  JSON: {json_bytes / 1024 ** 2:.1f} MB → columnar: {columnar_bytes / 1024 ** 2:.1f} MB")
+    print(f"  Output: {output_path}")
+
+
+if __name__ == "__main__":
+    tyro.cli(main)
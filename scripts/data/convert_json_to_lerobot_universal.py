@@ -4,12 +4,17 @@ Universal JSON to LeRobot converter for any robot configuration.
 This script uses robot_config.py to support different DOF, gripper formats, etc.
 """
 
+import dataclasses
+import importlib
 import json
 import pathlib
-from typing import Any
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterator, Literal
 
 import numpy as np
-from PIL import Image
 import tyro
 from lerobot.common.datasets.lerobot_dataset import LeRobotDataset
 
@@ -20,7 +25,28 @@ from pathlib import Path
 robo_vla_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(robo_vla_root))
 
-from config.robot_config import get_robot_config, RobotConfig
+from config.layout import EpisodeColumns
+from config.robot_config import get_robot_config, PruneConfig, RobotConfig
+from pipeline.columnar import ColumnarEpisode, EPISODE_SUFFIX, is_columnar_episode
+from pipeline.frame_cache import FrameCache
+from pipeline.image_io import ImageIndex, decode_image
+from pipeline.ingest import CollectorWatcher
+from pipeline.json_stream import JsonEpisodeReader, decode_embedded_image, pop_embedded_image
+from pipeline.norm_stats import FrameColumns, episode_fingerprint as stats_fingerprint, read_episode_lengths
+from pipeline.profiling import Profiler, profile_episode, profile_stage
+from pipeline.progress import ProgressWriter, default_progress_path
+from pipeline.pruning import PruneStats, array_hash, find_kept_frames, image_hash
+from pipeline.resample import resample_columns, resample_grid, source_fps
+from pipeline.sharding import parse_shard, select_shard, shard_repo_id
+from pipeline.manifest import (
+    SourceFingerprintCache,
+    config_fingerprint,
+    default_fingerprint_cache_path,
+    default_manifest_path,
+    lerobot_home,
+    prepare_incremental_run,
+    source_fingerprint,
+)
 
 
 def deg_to_rad(deg: float) -> float:
@@ -33,254 +59,882 @@ def mm_to_m(mm: float) -> float:
     return mm * 0.001
 
 
-def load_image(image_path: pathlib.Path, target_size: tuple[int, int] = (224, 224)) -> np.ndarray:
-    """Load and resize image."""
-    if not image_path.exists():
-        print(f"  Warning: Image not found: {image_path}, using dummy image")
-        return np.random.randint(0, 255, (*target_size, 3), dtype=np.uint8)
-    
+def dummy_image(target_size: tuple[int, int] = (224, 224)) -> np.ndarray:
+    """Random-noise placeholder for a missing or unreadable frame."""
+    return np.random.randint(0, 255, (*target_size, 3), dtype=np.uint8)
+
+
+def load_image(
+    image_path: pathlib.Path,
+    target_size: tuple[int, int] = (224, 224),
+    resize_filter: str = "lanczos",
+    fast_decode: bool = False,
+    cache: FrameCache | None = None,
+    profiler: Profiler | None = None,
+) -> np.ndarray:
+    """Load and resize image, consulting the frame cache first if one is given.
+
+    Existence is not checked here (see ImageIndex); unreadable files get a dummy image.
+    """
     try:
-        img = Image.open(image_path)
-        if img.mode != 'RGB':
-            img = img.convert('RGB')
-        img = img.resize(target_size, Image.Resampling.LANCZOS)
-        return np.array(img, dtype=np.uint8)
+        if cache is not None:
+            return cache.get_or_decode(image_path, target_size, resize_filter, fast_decode, profiler)
+        return decode_image(image_path, target_size, resize_filter, fast_decode, profiler)
     except Exception as e:
         print(f"  Error loading image {image_path}: {e}")
-        return np.random.randint(0, 255, (*target_size, 3), dtype=np.uint8)
+        return dummy_image(target_size)
 
 
-def pad_state(
-    joint_angles: list[float],
-    gripper: float | None,
-    config: RobotConfig
-) -> np.ndarray:
-    """Pad state to configured dimensions."""
-    # Convert joint units
-    if config.joint_units == "deg" and config.joint_output_units == "rad":
-        joints = [deg_to_rad(j) for j in joint_angles]
-    else:
-        joints = joint_angles[:config.num_joints]
-    
-    state = joints.copy()
+def load_json_episode(
+    json_path: pathlib.Path,
+    images_base_dir: pathlib.Path,
+    config: RobotConfig,
+    verbose: bool = True,
+    decode_images: bool = True,
+    profiler: Profiler | None = None,
+) -> tuple[list[dict[str, Any]], str]:
+    """Load episode data from JSON file.
+
+    Frames are parsed one at a time (pipeline/json_stream.py). Images embedded in the
+    file are decoded to config.image_size as they are read and kept under '_image'
+    (None with decode_images=False); the base64 payloads are never held together.
+    """
+    reader = JsonEpisodeReader(json_path)
+    frames = []
+    original_count = 0
+    for frame in reader:
+        original_count += 1
+        # Filter by robot_mode if configured (before decoding the frame's image)
+        if config.filter_robot_mode is not None and frame.get('robot_mode') != config.filter_robot_mode:
+            continue
+        payload = pop_embedded_image(frame)
+        if payload is not None:
+            frame['_image'] = decode_embedded_image(
+                payload, config.image_size, config.image_resize_filter, config.image_fast_decode, profiler
+            ) if decode_images else None
+        frames.append(frame)
     
-    # Add dummy dimension if needed
-    if config.use_dummy_dim:
-        state.append(0.0)
+    episode_name = reader.meta['episode_name']
+    prompt = reader.meta.get('prompt', 'manipulation task')
+    if config.filter_robot_mode is not None and verbose:
+        print(f"  Filtered: {original_count} → {len(frames)} frames (mode=={config.filter_robot_mode})")
     
-    # Add gripper if present
-    if config.gripper is not None and gripper is not None:
-        state.append(float(gripper))
+    # Add image paths (gripper values are extracted per episode by the compiled layout)
+    episode_dir = images_base_dir / episode_name
+    for frame in frames:
+        image_path = episode_dir / "images" / frame.get('image_path', f"frame_{frame['frame_id']:06d}.jpg")
+        frame['_image_path'] = image_path
     
-    return np.array(state, dtype=np.float32)
+    return frames, prompt
 
 
-def pad_actions(
-    actions: list[float],
-    config: RobotConfig
-) -> np.ndarray:
-    """Pad actions to configured dimensions."""
-    # Extract joint deltas
-    joint_deltas = actions[:config.num_joints]
+def load_columnar_episode(
+    episode_dir: pathlib.Path,
+    images_base_dir: pathlib.Path,
+    config: RobotConfig,
+    verbose: bool = True,
+) -> tuple[EpisodeColumns, list[pathlib.Path], str]:
+    """Load episode columns from the columnar format (see pipeline/columnar.py).
+
+    Columns stay memory-mapped; without robot_mode filtering no data is copied.
+    """
+    episode = ColumnarEpisode.load(episode_dir)
+    prompt = episode.prompt or 'manipulation task'
     
-    # Convert units
-    if config.joint_units == "deg" and config.joint_output_units == "rad":
-        joint_deltas = [deg_to_rad(d) for d in joint_deltas]
+    # Filter by robot_mode if configured
+    if config.filter_robot_mode is not None:
+        original_count = len(episode)
+        episode = episode.select(episode.columns.field('robot_mode') == config.filter_robot_mode)
+        if verbose:
+            print(f"  Filtered: {original_count} → {len(episode)} frames (mode=={config.filter_robot_mode})")
     
-    action = joint_deltas.copy()
+    images_dir = images_base_dir / episode.episode_name / "images"
+    image_paths = [images_dir / name for name in episode.image_file_names()]
+    return episode.columns, image_paths, prompt
+
+
+def load_episode(
+    episode_path: pathlib.Path,
+    images_base_dir: pathlib.Path,
+    config: RobotConfig,
+    verbose: bool = True,
+    decode_images: bool = True,
+    profiler: Profiler | None = None,
+) -> tuple[EpisodeColumns, list[pathlib.Path], str, dict[pathlib.Path, np.ndarray | None]]:
+    """(columns, image paths, prompt, embedded images) of a JSON or columnar episode.
+
+    Embedded images are keyed by the frame's image path and already decoded to
+    config.image_size (None with decode_images=False); frames without one are read
+    from images_base_dir.
+    """
+    if is_columnar_episode(episode_path):
+        return (*load_columnar_episode(episode_path, images_base_dir, config, verbose), {})
+    frames, prompt = load_json_episode(episode_path, images_base_dir, config, verbose, decode_images, profiler)
+    scalar_fields = config.compile().scalar_fields
+    if config.prune is not None:
+        scalar_fields = (*scalar_fields, 'robot_mode')
+    if config.resample_fps is not None:
+        scalar_fields = (*scalar_fields, 'timestamp')
+    embedded = {frame['_image_path']: frame.pop('_image') for frame in frames if '_image' in frame}
+    return (
+        EpisodeColumns.from_frames(frames, scalar_fields),
+        [frame['_image_path'] for frame in frames],
+        prompt,
+        embedded,
+    )
+
+
+def images_present(image_paths: list[pathlib.Path], embedded: dict[pathlib.Path, Any]) -> np.ndarray:
+    """(T,) bool mask of frames with an embedded image or an image file on disk."""
+    present = ImageIndex().present(image_paths)
+    if embedded:
+        present |= np.fromiter((p in embedded for p in image_paths), dtype=bool, count=len(image_paths))
+    return present
+
+
+# What happens to missing frames, per --missing_frames
+MISSING_FRAME_ACTIONS = {"noise": "replaced with random-noise images", "drop": "dropped", "error": "conversion aborted"}
+
+
+def print_missing_images(
+    name: str,
+    image_paths: list[pathlib.Path],
+    present: np.ndarray,
+    missing_frames: str,
+) -> None:
+    """Print one episode's missing-frame line."""
+    missing = [p for p, ok in zip(image_paths, present) if not ok]
+    examples = ", ".join(p.name for p in missing[:3])
+    more = f", ... +{len(missing) - 3} more" if len(missing) > 3 else ""
+    print(
+        f"  {name}: {len(missing)}/{len(image_paths)} images missing ({examples}{more}) in {missing[0].parent}, "
+        f"{MISSING_FRAME_ACTIONS[missing_frames]}"
+    )
+
+
+def resample_episode(
+    columns: EpisodeColumns,
+    image_paths: list[pathlib.Path],
+    present: np.ndarray,
+    config: RobotConfig,
+) -> tuple[EpisodeColumns, list[pathlib.Path], np.ndarray]:
+    """Resample an episode to config.resample_fps using its frame timestamps.
+
+    Joint angles are interpolated (continuous gripper fields too), other fields and
+    images come from the nearest frame, and actions are recomputed by the layout as
+    deltas between resampled states. Holes left by the robot_mode filter or dropped
+    frames split the grid (see pipeline/resample.py), so no frames are invented across
+    them. Episodes without usable timestamps, or already at or below the target rate,
+    are returned unchanged.
+    """
+    timestamps = np.asarray(columns.field('timestamp'), dtype=np.float64)
+    grid = resample_grid(timestamps, config.resample_fps)
+    if grid is None:
+        if np.isnan(timestamps).any():
+            print(f"  Resample: frames without timestamp, keeping {len(columns)} frames as recorded")
+        return columns, image_paths, present
     
-    # Add dummy dimension if needed
-    if config.use_dummy_dim:
-        action.append(0.0)
+    interpolate_fields = ()
+    if config.gripper is not None and not config.gripper.discrete:
+        interpolate_fields = config.compile().gripper.fields
+    runs = int(grid.segment_start.sum())
+    print(
+        f"  Resampled: {len(columns)} → {len(grid)} frames "
+        f"({source_fps(timestamps):.1f} → {config.resample_fps} Hz"
+        f"{f', {runs} runs split at gaps' if runs > 1 else ''})"
+    )
+    return (
+        resample_columns(columns, grid, interpolate_fields),
+        [image_paths[i] for i in grid.nearest],
+        present[grid.nearest],
+    )
+
+
+def prune_episode(
+    columns: EpisodeColumns,
+    image_paths: list[pathlib.Path],
+    present: np.ndarray,
+    config: RobotConfig,
+    embedded: dict[pathlib.Path, np.ndarray] | None = None,
+) -> tuple[np.ndarray, PruneStats]:
+    """Keep mask of idle/duplicate frame pruning (config.prune) and its statistics."""
+    layout = config.compile()
+    embedded = embedded or {}
     
-    # Extract gripper delta
-    if config.gripper is not None:
-        gripper_idx = config.num_joints
-        if len(actions) > gripper_idx:
-            gripper_delta = actions[gripper_idx]
-        else:
-            gripper_delta = 0.0
-        action.append(gripper_delta)
+    def hash_fn(i: int) -> int | None:
+        if not present[i]:
+            return None
+        if image_paths[i] in embedded:
+            return array_hash(embedded[image_paths[i]])
+        return image_hash(image_paths[i])
     
-    return np.array(action, dtype=np.float32)
+    keep, idle_stretches = find_kept_frames(
+        joints=columns.joint_angles[:, :layout.num_joints],
+        gripper=layout.gripper_values(columns),
+        robot_mode=columns.field('robot_mode'),
+        hash_fn=hash_fn,
+        config=config.prune,
+    )
+    width, height = config.image_size
+    frame_bytes = width * height * 3 + 4 * (config.state_dim + config.action_dim)
+    removed = len(keep) - int(keep.sum())
+    return keep, PruneStats(
+        frames_before=len(keep),
+        frames_after=len(keep) - removed,
+        idle_stretches=idle_stretches,
+        bytes_saved=removed * frame_bytes,
+    )
 
 
-def load_json_episode(
-    json_path: pathlib.Path,
+def source_bytes(episode_path: pathlib.Path) -> int:
+    """On-disk size of a JSON file or columnar episode directory."""
+    if episode_path.is_dir():
+        return sum(p.stat().st_size for p in episode_path.iterdir())
+    return episode_path.stat().st_size
+
+
+def build_episode(
+    episode_path: pathlib.Path,
     images_base_dir: pathlib.Path,
     config: RobotConfig,
-) -> tuple[list[dict[str, Any]], str]:
-    """Load episode data from JSON file."""
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    cache: FrameCache | None = None,
+    missing_frames: Literal["noise", "drop", "error"] = "noise",
+    profiler: Profiler | None = None,
+    report_missing: bool = True,
+) -> dict[str, Any]:
+    """Convert a single JSON or columnar episode to LeRobot format.
+
+    State and action arrays are built for the whole episode at once from the
+    compiled column layout; images are decoded into a preallocated array.
+    Missing frames are found from one listing of the images/ directory before
+    decoding (and reported with report_missing), then replaced with noise, dropped,
+    or rejected per missing_frames. The episode is parsed only once for both.
+    With config.resample_fps set, the episode is first resampled to that rate from
+    its timestamps. With config.prune set, idle stretches are pruned before decoding and
+    the statistics are returned under "prune_stats" (not a dataset feature).
+    """
+    layout = config.compile()
+    with profile_stage(profiler, "load_episode") as span:
+        columns, image_paths, prompt, embedded = load_episode(
+            episode_path, images_base_dir, config, profiler=profiler
+        )
+        if profiler is not None:
+            span.bytes = source_bytes(episode_path)
     
-    episode_name = data['episode_name']
-    prompt = data.get('prompt', 'manipulation task')
-    frames = data['frames']
+    with profile_stage(profiler, "check_images"):
+        present = images_present(image_paths, embedded)
+    if not present.all():
+        if report_missing:
+            print_missing_images(episode_path.name, image_paths, present, missing_frames)
+        if missing_frames == "error":
+            raise FileNotFoundError(
+                f"{episode_path.name}: {int((~present).sum())} images missing, e.g. {image_paths[int(np.argmin(present))]}"
+            )
+        if missing_frames == "drop":
+            columns = columns.select(present)
+            image_paths = [p for p, ok in zip(image_paths, present) if ok]
+            present = np.ones(len(image_paths), dtype=bool)
     
-    # Filter by robot_mode if configured
-    if config.filter_robot_mode is not None:
-        original_count = len(frames)
-        frames = [f for f in frames if f.get('robot_mode') == config.filter_robot_mode]
-        print(f"  Filtered: {original_count} → {len(frames)} frames (mode=={config.filter_robot_mode})")
+    if len(columns) == 0:
+        return None
     
-    # Extract gripper values
-    for frame in frames:
-        gripper_value = None
-        if config.gripper is not None:
-            # Try to get gripper from configured field
-            if config.gripper.field_name in frame:
-                gripper_value = frame[config.gripper.field_name]
-            else:
-                # Try source fields
-                for source_field in config.gripper.source_fields:
-                    if source_field in frame:
-                        raw_value = frame[source_field]
-                        # Apply extraction method
-                        if config.gripper.extraction_method == "threshold":
-                            gripper_value = 1.0 if float(raw_value) > config.gripper.threshold else 0.0
-                        elif config.gripper.extraction_method == "direct":
-                            gripper_value = float(raw_value)
-                        elif config.gripper.extraction_method == "max":
-                            gripper_value = max([float(frame.get(f, 0)) for f in config.gripper.source_fields])
-                        break
-        
-        frame['_gripper'] = gripper_value
-        
-        # Add image path
-        episode_dir = images_base_dir / episode_name
-        image_path = episode_dir / "images" / frame.get('image_path', f"frame_{frame['frame_id']:06d}.jpg")
-        frame['_image_path'] = image_path
+    if config.resample_fps is not None:
+        with profile_stage(profiler, "resample"):
+            columns, image_paths, present = resample_episode(columns, image_paths, present, config)
     
-    return frames, prompt
+    prune_stats = None
+    if config.prune is not None:
+        with profile_stage(profiler, "prune"):
+            keep, prune_stats = prune_episode(columns, image_paths, present, config, embedded)
+            columns = columns.select(keep)
+            image_paths = [p for p, k in zip(image_paths, keep) if k]
+            present = present[keep]
+    
+    # State/action arrays
+    with profile_stage(profiler, "build_arrays") as span:
+        states, actions = layout.episode_arrays(columns)
+        span.bytes = states.nbytes + actions.nbytes
+    
+    # Images
+    width, height = config.image_size
+    images = np.empty((len(columns), height, width, 3), dtype=np.uint8)
+    for i, image_path in enumerate(image_paths):
+        if not present[i]:
+            images[i] = dummy_image(config.image_size)
+            continue
+        if image_path in embedded:
+            images[i] = embedded[image_path]
+            continue
+        images[i] = load_image(
+            image_path, config.image_size, config.image_resize_filter, config.image_fast_decode, cache, profiler
+        )
+    if cache is not None:
+        cache.flush()
+    tasks = [prompt] * len(columns)
+    
+    episode_data = {
+        "image": images,
+        "state": states,
+        "action": actions,
+        "task": tasks,
+    }
+    if prune_stats is not None:
+        episode_data["prune_stats"] = prune_stats
+    return episode_data
 
 
 def convert_episode(
-    json_path: pathlib.Path,
+    episode_path: pathlib.Path,
     images_base_dir: pathlib.Path,
     config: RobotConfig,
+    cache: FrameCache | None = None,
+    missing_frames: Literal["noise", "drop", "error"] = "noise",
+    profile: bool = False,
+    report_missing: bool = True,
 ) -> dict[str, Any]:
-    """Convert a single JSON episode to LeRobot format."""
-    frames, prompt = load_json_episode(json_path, images_base_dir, config)
-    
-    if len(frames) == 0:
-        return None
-    
-    # Prepare data arrays
-    images = []
-    states = []
-    actions = []
-    tasks = []
-    
-    prev_gripper = None
-    for i, frame in enumerate(frames):
-        # Load image
-        img = load_image(frame['_image_path'], config.image_size)
-        images.append(img)
-        
-        # Extract joint angles
-        joint_angles = frame.get('joint_angles', [])
-        if len(joint_angles) < config.num_joints:
-            print(f"  Warning: Frame {i} has {len(joint_angles)} joints, expected {config.num_joints}")
-            joint_angles.extend([0.0] * (config.num_joints - len(joint_angles)))
-        
-        # Extract gripper
-        gripper = frame.get('_gripper')
-        if gripper is None and config.gripper is not None:
-            gripper = 0.0
-        
-        # Pad state
-        state = pad_state(joint_angles, gripper, config)
-        states.append(state)
-        
-        # Extract actions
-        frame_actions = frame.get('actions', [])
-        if len(frame_actions) == 0:
-            # Calculate delta from previous frame
-            if i > 0:
-                prev_joints = frames[i-1].get('joint_angles', [])
-                frame_actions = [joint_angles[j] - prev_joints[j] if j < len(prev_joints) else 0.0 
-                                for j in range(config.num_joints)]
-                if config.gripper is not None:
-                    prev_gripper_val = frames[i-1].get('_gripper', 0.0) or 0.0
-                    gripper_delta = (gripper or 0.0) - prev_gripper_val
-                    frame_actions.append(gripper_delta)
-            else:
-                frame_actions = [0.0] * config.num_joints
-                if config.gripper is not None:
-                    frame_actions.append(0.0)
-        
-        # Pad actions
-        action = pad_actions(frame_actions, config)
-        actions.append(action)
-        
-        tasks.append(prompt)
-        prev_gripper = gripper
+    """build_episode(), optionally profiled.
+
+    With profile set, the episode's stage timings and peak RSS are returned under
+    "profile" (a Profiler, not a dataset feature), also from worker processes.
+    """
+    if not profile:
+        return build_episode(episode_path, images_base_dir, config, cache, missing_frames, None, report_missing)
     
+    profiler = Profiler()
+    with profiler.episode(episode_path.name, "convert") as record:
+        episode_data = build_episode(
+            episode_path, images_base_dir, config, cache, missing_frames, profiler, report_missing
+        )
+        record["frames"] = 0 if episode_data is None else len(episode_data["task"])
+    if episode_data is not None:
+        episode_data["profile"] = profiler
+    return episode_data
+
+
+def find_episodes(json_path: pathlib.Path) -> tuple[list[pathlib.Path], str]:
+    """Episode sources in json_path: columnar episode directories if any, else JSON files."""
+    columnar = sorted(p for p in json_path.glob(f"*{EPISODE_SUFFIX}") if is_columnar_episode(p))
+    if columnar:
+        return columnar, "columnar"
+    return sorted(json_path.glob("*.json")), "JSON"
+
+
+def episode_name(episode_path: pathlib.Path, cache: SourceFingerprintCache | None = None) -> str:
+    """episode_name of a JSON or columnar episode (its directory under images_base_dir).
+
+    With a cache, the name is only read again when the file holding it changed.
+    """
+    if is_columnar_episode(episode_path):
+        if cache is not None:
+            return cache.value(episode_path / "meta.json", "episode_name", lambda: episode_name(episode_path))
+        return ColumnarEpisode.load(episode_path).episode_name
+    if cache is not None:
+        return cache.value(episode_path, "episode_name", lambda: episode_name(episode_path))
+    reader = JsonEpisodeReader(episode_path)
+    # Written before the frames by convert_to_json.py; otherwise known once the file is read
+    for _ in reader:
+        if 'episode_name' in reader.meta:
+            break
+    return reader.meta['episode_name']
+
+
+def episode_fingerprint(
+    episode_path: pathlib.Path,
+    images_base_dir: pathlib.Path,
+    cache: SourceFingerprintCache | None = None,
+) -> str:
+    """Source fingerprint of a JSON file or columnar episode directory and its images/ directory."""
+    sources = sorted(episode_path.iterdir()) if episode_path.is_dir() else [episode_path]
+    images_dir = images_base_dir / episode_name(episode_path, cache) / "images"
+    return source_fingerprint(*sources, images_dir, cache=cache)
+
+
+def iter_converted_episodes(
+    json_files: list[pathlib.Path],
+    images_base_dir: pathlib.Path,
+    config: RobotConfig,
+    workers: int = 1,
+    cache: FrameCache | None = None,
+    missing_frames: Literal["noise", "drop", "error"] = "noise",
+    profile: bool = False,
+    report_missing: bool = True,
+) -> Iterator[tuple[pathlib.Path, dict[str, Any] | None]]:
+    """Convert episodes, yielding results in the order of json_files.
+
+    With workers > 1 episodes are converted in a process pool, which sidesteps
+    the GIL for image decode/resize. Results are still yielded in input order,
+    so the written dataset is identical to the serial path. At most `workers`
+    episodes are in flight at once, so memory stays bounded when the consumer
+    (the dataset writer) is slower than conversion.
+    """
+    if workers <= 1:
+        for json_file in json_files:
+            print(f"Converting {json_file.name}...")
+            yield json_file, convert_episode(
+                json_file, images_base_dir, config, cache, missing_frames, profile, report_missing
+            )
+        return
+
+    remaining = iter(json_files)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque(
+            (json_file, executor.submit(
+                convert_episode, json_file, images_base_dir, config, cache, missing_frames, profile, report_missing
+            ))
+            for json_file in islice(remaining, workers)
+        )
+        while pending:
+            json_file, future = pending.popleft()
+            episode_data = future.result()
+            next_file = next(remaining, None)
+            if next_file is not None:
+                pending.append((
+                    next_file,
+                    executor.submit(
+                        convert_episode, next_file, images_base_dir, config, cache, missing_frames, profile,
+                        report_missing,
+                    ),
+                ))
+            print(f"Converted {json_file.name}")
+            yield json_file, episode_data
+
+
+def watch_collector(
+    watcher: CollectorWatcher,
+    poll_seconds: float,
+    convert: Callable[[bool], None],
+) -> None:
+    """Stage finished collector episodes and convert each batch, until interrupted.
+
+    convert(first) runs an incremental conversion of the staging directory. It also
+    runs once at startup, so episodes staged before a restart but not yet written are
+    converted; episodes that finish while a batch converts form the next batch.
+    """
+    print(f"Watching {watcher.data_dir} for finished episodes (marker: {watcher.marker}, "
+          f"settle: {watcher.settle_seconds:.0f}s, poll: {poll_seconds:.0f}s)")
+    print(f"  {len(watcher.staged)} episodes already staged in {watcher.staging_dir}")
+    first = True
+    try:
+        while True:
+            staged = watcher.poll()
+            if staged or first:
+                convert(first)
+                first = False
+                print(f"\nWaiting for episodes in {watcher.data_dir}...")
+            time.sleep(poll_seconds)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+
+def load_norm_stats_script():
+    """Import scripts/data/compute_norm_stats.py (needs openpi) as a module."""
+    sys.path.insert(0, str(Path(__file__).parent))
+    return importlib.import_module("compute_norm_stats")
+
+
+class FusedNormStats:
+    """Norm stats of a training config, accumulated from episodes as they are written.
+
+    Each episode's in-memory state/action arrays go through the config's repack and data
+    transforms like compute_norm_stats.py's parquet path (action chunks of the model's
+    action_horizon, padding to its action_dim, ...; on whole episodes if the transforms
+    accept batches), and the episode's stats are stored in the per-episode cache of
+    compute_norm_stats.py --incremental together with its fingerprint. The first episode
+    is checked against the data loader before anything is cached. finish() runs that
+    script, which then only merges cached episodes and reads those written by earlier runs.
+    """
+
+    def __init__(self, config_name: str, repo_id: str, fps: int):
+        # RoboVLA configs (e.g. pi0_e6_freeze_vlm) are registered into openpi's registry
+        try:
+            from config import register_config
+            register_config()
+        except Exception as e:
+            print(f"⚠️  Warning: Failed to register config: {e}")
+        self.script = load_norm_stats_script()
+        self.config_name = config_name
+        self.config = self.script._config.get_config(config_name)
+        self.data_config = self.config.data.create(self.config.assets_dirs, self.config.model)
+        if self.data_config.repo_id != repo_id:
+            raise ValueError(f"Config {config_name} trains on {self.data_config.repo_id}, not {repo_id}")
+        self.assets_path = self.config.assets_dirs / self.data_config.repo_id
+        self.fps = fps
+        self.transform_fns = self.script.fast_transforms(self.data_config)
+        self.cache = self.script.episode_stats_cache(
+            config_name, self.config, self.data_config, self.script.NORM_STATS_KEYS,
+            self.assets_path / "norm_stats.episodes",
+        )
+        # Fingerprints recorded by an interrupted run may not match the dataset any more
+        self.cache.forget_episodes()
+        self.batched = None  # Set by the loader check on the first episode
+
+    def add(self, episode_data: dict[str, Any], episode_index: int) -> None:
+        """Cache the stats of one written episode (as LeRobotDataset returns its frames)."""
+        num_frames = len(episode_data["task"])
+        frame_index = np.arange(num_frames)
+        first_frame = 0
+        if self.batched is None:
+            lengths = read_episode_lengths(lerobot_home() / self.data_config.repo_id)
+            first_frame = sum(length for episode, length in lengths.items() if episode < episode_index)
+        columns = {
+            name: value for name, value in episode_data.items()
+            if isinstance(value, np.ndarray) and name != "image"
+        }
+        columns.update(
+            timestamp=(frame_index / self.fps).astype(np.float32),
+            frame_index=frame_index,
+            episode_index=np.full(num_frames, episode_index, dtype=np.int64),
+            index=first_frame + frame_index,
+            task_index=np.zeros(num_frames, dtype=np.int64),
+        )
+        frames = FrameColumns(columns, ["image"], {0: episode_data["task"][0]}, self.fps)
+        if self.batched is None:
+            self.batched = self.script.prepare_fast_path(
+                frames, self.config, self.data_config, self.transform_fns, self.script.NORM_STATS_KEYS
+            )
+        fingerprint = stats_fingerprint(frames)
+        if fingerprint not in self.cache:
+            stats = self.script.frame_stats(
+                frames, frame_index, self.config, self.data_config, self.transform_fns,
+                self.script.NORM_STATS_KEYS, self.batched,
+            )
+            self.cache.save(fingerprint, stats)
+        self.cache.record_episode(episode_index, fingerprint, num_frames)
+
+    def finish(self, check: bool = False) -> None:
+        """Write norm_stats.json to the config's assets; with check, compare it with the script's default path."""
+        print(f"\nNorm stats ({self.config_name}):")
+        self.script.main(self.config_name, incremental=True, check=check)
+
+
+def dataset_features(config: RobotConfig, video: bool = False) -> dict[str, dict[str, Any]]:
+    """LeRobot feature spec of the episodes produced by convert_episode."""
+    width, height = config.image_size
     return {
-        "image": np.array(images),
-        "state": np.array(states),
-        "action": np.array(actions),
-        "task": tasks,
+        "image": {
+            "dtype": "video" if video else "image",
+            "shape": (height, width, 3),
+            "names": ["height", "width", "channel"],
+        },
+        "state": {
+            "dtype": "float32",
+            "shape": (config.state_dim,),
+            "names": ["state"],
+        },
+        "action": {
+            "dtype": "float32",
+            "shape": (config.action_dim,),
+            "names": ["action"],
+        },
     }
 
 
-@tyro.cli
-def main(
-    json_dir: str,
-    images_base_dir: str,
-    output_repo_id: str,
-    robot_name: str = "dobot_e6",
-    fps: int = 10,
-    start_episode: int = 1,
-    end_episode: int = 138,
-):
+@dataclasses.dataclass
+class Args:
+    """Arguments for the universal JSON to LeRobot converter."""
+
+    # Directory of per-episode JSON files, or of columnar `<n>.episode` directories
+    # (see pipeline/columnar.py), which are preferred if present.
+    json_dir: str
+    # Directory of the per-episode image directories (<episode_name>/images).
+    images_base_dir: str
+    # LeRobot dataset written under <lerobot_home>.
+    output_repo_id: str
+    # Robot config name (see config/robot_config.py).
+    robot_name: str = "dobot_e6"
+    # Dataset frame rate.
+    fps: int = 10
+    # First and last episode number (file stem) to convert, inclusive.
+    start_episode: int = 1
+    end_episode: int = 138
+    # Number of processes used to convert episodes (1 = serial).
+    workers: int = 1
+    # Override the robot config's image resize filter.
+    resize_filter: Literal["nearest", "box", "bilinear", "hamming", "bicubic", "lanczos"] | None = None
+    # Use JPEG DCT-domain downscaling before the final resize.
+    fast_decode: bool = False
+    # Directory of a persistent resized-frame cache shared across runs.
+    cache_dir: str | None = None
+    # Size cap of the frame cache; least recently used shards are evicted.
+    cache_max_gb: float = 50.0
+    # Episode manifest used to skip already converted episodes
+    # (default: <lerobot_home>/<output_repo_id>.manifest.json).
+    manifest_path: str | None = None
+    # Delete the existing dataset and manifest and convert from scratch.
+    rebuild: bool = False
+    # What to do with frames whose image file is missing: "noise" (random-noise image),
+    # "drop" (remove the frame) or "error" (abort).
+    missing_frames: Literal["noise", "drop", "error"] = "noise"
+    # Print a line for each episode with missing images as it is converted (found from
+    # the same listing that decides missing_frames; no extra pass).
+    check_images: bool = True
+    # Prune idle/duplicate stretches (robot config's PruneConfig, or defaults).
+    prune: bool = False
+    # Override the pruning mode: "drop" or "subsample".
+    prune_mode: Literal["drop", "subsample"] | None = None
+    # Per-episode pruning report (JSON), updated across runs
+    # (default: <lerobot_home>/<output_repo_id>.prune_report.json).
+    prune_report: str | None = None
+    # Store each episode's frames as one compressed video stream instead of per-frame
+    # images. The dataset is created with a "video" image feature; LeRobotDataset decodes
+    # frames by timestamp for training and eval.
+    video: bool = False
+    # Resample episodes recorded faster than `fps` down to `fps` using the per-frame
+    # timestamps (joint states interpolated, delta actions recomputed).
+    resample: bool = False
+    # Record wall time, call counts and bytes per stage (episode load, image
+    # decode/resize, array building, dataset writes, ...) and peak RSS per episode.
+    profile: bool = False
+    # Path of the profiling report (JSON); the Chrome trace is written next to it with a
+    # .trace.json suffix (default: <lerobot_home>/<output_repo_id>.profile.json).
+    profile_report: str | None = None
+    # Append-only progress log (JSON lines: phase, episodes/frames done, throughput, ETA)
+    # read by check_lerobot_conversion_status.py
+    # (default: <lerobot_home>/<output_repo_id>.progress.jsonl).
+    progress_file: str | None = None
+    # "i/N" (0 <= i < N): convert only the i-th of N contiguous ranges of the selected
+    # episodes into <output_repo_id>-shard-i-of-N, for multi-node conversion; combine the
+    # shards with merge_lerobot_datasets.py.
+    shard: str | None = None
+    # Collector data directory (vla_dataset) to watch. Runs until interrupted: every
+    # vla_auto_* episode that has its metadata.txt and has not changed for
+    # `settle_seconds` is staged as a columnar episode in json_dir and appended to the
+    # dataset. images_base_dir is normally the same directory; start/end_episode are
+    # ignored. Restart-safe (see pipeline/ingest.py).
+    watch_dir: str | None = None
+    # Interval between scans of watch_dir.
+    poll_seconds: float = 10.0
+    # How long a finished episode's files must be unchanged before it is staged.
+    settle_seconds: float = 30.0
+    # Prompt of episodes staged from watch_dir (default: 'manipulation task').
+    task_description: str | None = None
+    # Stage watched episodes from dataset.npy (False: robot_data.csv).
+    use_npy: bool = True
+    # Training config (needs openpi) whose norm stats are accumulated while converting:
+    # each written episode's state/action arrays go through the config's transforms
+    # (action_horizon chunks, padding to action_dim) and are cached per episode; at the
+    # end norm_stats.json is written to the config's assets directory (see
+    # compute_norm_stats.py --incremental).
+    norm_stats_config: str | None = None
+    # Also run compute_norm_stats.py's default computation and fail if mean/std deviate
+    # beyond its MATCH_TOLERANCE (q01/q99 are approximate and only checked against the
+    # looser QUANTILE_TOLERANCE).
+    check_norm_stats: bool = False
+
+
+def main(args: Args) -> None:
     """Convert JSON episodes to LeRobot format using robot configuration."""
-    json_path = Path(json_dir)
-    images_base = Path(images_base_dir)
+    if args.watch_dir is not None:
+        if args.shard is not None:
+            raise ValueError("--watch_dir cannot be combined with --shard")
+        # Every batch of newly staged episodes is an incremental run of main() on json_dir
+        run_args = dataclasses.replace(args, watch_dir=None, start_episode=1, end_episode=sys.maxsize)
+        watcher = CollectorWatcher(
+            Path(args.watch_dir), Path(args.json_dir), args.settle_seconds, args.use_npy, args.task_description
+        )
+        watch_collector(
+            watcher, args.poll_seconds,
+            lambda first: main(dataclasses.replace(run_args, rebuild=args.rebuild and first)),
+        )
+        return
+    
+    json_path = Path(args.json_dir)
+    images_base = Path(args.images_base_dir)
     
     # Get robot configuration
-    config = get_robot_config(robot_name)
+    config = get_robot_config(args.robot_name)
+    if args.resize_filter is not None:
+        config = dataclasses.replace(config, image_resize_filter=args.resize_filter)
+    if args.fast_decode:
+        config = dataclasses.replace(config, image_fast_decode=True)
+    if args.prune and config.prune is None:
+        config = dataclasses.replace(config, prune=PruneConfig())
+    if args.prune_mode is not None and config.prune is not None:
+        config = dataclasses.replace(config, prune=dataclasses.replace(config.prune, mode=args.prune_mode))
+    if args.resample:
+        config = dataclasses.replace(config, resample_fps=args.fps)
     print(f"Using robot config: {config.name}")
     print(f"  Joints: {config.num_joints}DOF")
     print(f"  State dim: {config.state_dim}")
     print(f"  Action dim: {config.action_dim}")
     print(f"  Gripper: {config.gripper.field_name if config.gripper else 'None'}")
+    print(f"  Image: {config.image_size} ({config.image_resize_filter}, fast_decode={config.image_fast_decode})")
+    if config.resample_fps is not None:
+        print(f"  Resample: {config.resample_fps} Hz from frame timestamps")
+    if config.prune is not None:
+        print(f"  Pruning: {config.prune}")
     
-    # Find JSON files
-    json_files = sorted(json_path.glob("*.json"))
-    if start_episode > 1 or end_episode < len(json_files):
+    # Find episode files (JSON or columnar)
+    all_json_files, input_format = find_episodes(json_path)
+    json_files = all_json_files
+    if args.start_episode > 1 or args.end_episode < len(json_files):
         json_files = [f for f in json_files 
-                     if start_episode <= int(f.stem) <= end_episode]
+                     if args.start_episode <= int(f.stem) <= args.end_episode]
     
-    print(f"Found {len(json_files)} JSON files")
+    print(f"Found {len(json_files)} {input_format} episodes")
     
-    # Convert episodes
-    episodes = []
-    for json_file in json_files:
-        print(f"Converting {json_file.name}...")
-        episode_data = convert_episode(json_file, images_base, config)
-        if episode_data is not None:
-            episodes.append(episode_data)
+    # Multi-node conversion: this node's contiguous range of episodes, written to its own dataset
+    output_repo_id = args.output_repo_id
+    if args.shard is not None:
+        shard_index, num_shards = parse_shard(args.shard)
+        json_files = select_shard(json_files, shard_index, num_shards)
+        output_repo_id = shard_repo_id(output_repo_id, shard_index, num_shards)
+        episode_range = f"{json_files[0].name}..{json_files[-1].name}" if json_files else "none"
+        print(f"Shard {shard_index}/{num_shards}: {len(json_files)} episodes ({episode_range}) → {output_repo_id}")
     
-    if len(episodes) == 0:
-        print("No episodes to convert!")
-        return
+    # Skip episodes already recorded in the manifest (incremental / resumed runs)
+    manifest_path = Path(args.manifest_path) if args.manifest_path else default_manifest_path(output_repo_id)
+    fingerprint_cache = SourceFingerprintCache(default_fingerprint_cache_path(manifest_path))
+    fingerprints = {f.name: episode_fingerprint(f, images_base, fingerprint_cache) for f in json_files}
+    fingerprint_cache.save()
+    options = {"fps": args.fps, "images_base_dir": str(images_base.resolve())}
+    if args.missing_frames != "noise":
+        options["missing_frames"] = args.missing_frames
+    if args.video:
+        options["video"] = True
+    manifest, pending = prepare_incremental_run(
+        manifest_path=manifest_path,
+        dataset_root=lerobot_home() / output_repo_id,
+        config_fp=config_fingerprint(config, options),
+        sources=list(fingerprints.items()),
+        available={f.name for f in all_json_files},
+        rebuild=args.rebuild,
+    )
+    pending = set(pending)
+    json_files = [f for f in json_files if f.name in pending]
+    if args.workers > 1:
+        print(f"Converting with {args.workers} worker processes")
+    
+    fused_stats = None
+    if args.norm_stats_config is not None:
+        if args.shard is not None:
+            raise ValueError("--norm_stats_config cannot be combined with --shard; compute the merged dataset's stats")
+        fused_stats = FusedNormStats(args.norm_stats_config, output_repo_id, args.fps)
+        print(f"Accumulating norm stats of {args.norm_stats_config} → {fused_stats.assets_path}")
     
-    # Create LeRobot dataset
-    print(f"\nCreating LeRobot dataset: {output_repo_id}")
-    dataset = LeRobotDataset(output_repo_id)
+    profiler = Profiler() if args.profile else None
     
-    # Add episodes
-    for i, episode_data in enumerate(episodes):
-        dataset.add_episode(episode_data)
-        if (i + 1) % 10 == 0:
-            print(f"  Added {i + 1}/{len(episodes)} episodes")
+    progress = ProgressWriter(
+        Path(args.progress_file) if args.progress_file else default_progress_path(output_repo_id),
+        job="conversion",
+        episodes_total=len(json_files),
+        repo_id=output_repo_id,
+    )
+    with progress:
+        cache = None
+        if args.cache_dir is not None:
+            cache = FrameCache(args.cache_dir, max_bytes=int(args.cache_max_gb * 1024 ** 3))
+            print(f"Frame cache: {args.cache_dir} ({cache.summary()['entries']} cached frames)")
+        
+        # Pruning report, keyed by episode source and kept across incremental runs
+        report_path = None
+        prune_records = {}
+        if config.prune is not None:
+            report_path = Path(args.prune_report) if args.prune_report else lerobot_home() / f"{output_repo_id}.prune_report.json"
+            if report_path.exists() and not args.rebuild:
+                with open(report_path, 'r', encoding='utf-8') as f:
+                    prune_records = json.load(f)["episodes"]
+        
+        # Convert and write episodes one at a time; nothing is buffered across episodes
+        progress.set_phase("converting")
+        start_time = time.perf_counter()
+        dataset = None
+        num_episodes = 0
+        total_frames = 0
+        run_prune_stats = []
+        for json_file, episode_data in iter_converted_episodes(
+            json_files, images_base, config, args.workers, cache, args.missing_frames, args.profile, args.check_images
+        ):
+            if episode_data is not None and "profile" in episode_data:
+                profiler.merge(episode_data.pop("profile"))
+            if episode_data is None:
+                manifest.record(json_file.name, fingerprints[json_file.name], 0)
+                progress.update(episodes=1)
+                continue
+        
+            if dataset is None:
+                print(f"\nCreating LeRobot dataset: {output_repo_id}")
+                with profile_stage(profiler, "dataset_open"):
+                    if args.video and not (lerobot_home() / output_repo_id).exists():
+                        dataset = LeRobotDataset.create(
+                            repo_id=output_repo_id,
+                            robot_type=config.name,
+                            fps=args.fps,
+                            features=dataset_features(config, video=True),
+                            use_videos=True,
+                        )
+                    else:
+                        dataset = LeRobotDataset(output_repo_id)
+                if dataset.num_episodes != manifest.num_written_episodes:
+                    raise ValueError(
+                        f"Dataset has {dataset.num_episodes} episodes but the manifest records "
+                        f"{manifest.num_written_episodes}; re-run with --rebuild"
+                    )
+        
+            prune_stats = episode_data.pop("prune_stats", None)
+            if prune_stats is not None:
+                run_prune_stats.append(prune_stats)
+                prune_records[json_file.name] = {
+                    **dataclasses.asdict(prune_stats), "frames_removed": prune_stats.frames_removed
+                }
+                report_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(report_path, 'w', encoding='utf-8') as f:
+                    json.dump({"prune": dataclasses.asdict(config.prune), "episodes": prune_records}, f, indent=2)
+                print(
+                    f"  Pruned {json_file.name}: {prune_stats.frames_before} → {prune_stats.frames_after} frames "
+                    f"({prune_stats.idle_stretches} idle stretches, {prune_stats.bytes_saved / 1024 ** 2:.1f} MB saved)"
+                )
+        
+            num_frames = len(episode_data["task"])
+            manifest.begin(json_file.name, fingerprints[json_file.name], num_frames)
+            with profile_episode(profiler, json_file.name, "write") as record:
+                with profile_stage(profiler, "dataset_write") as span:
+                    dataset.add_episode(episode_data)
+                    span.bytes = sum(v.nbytes for v in episode_data.values() if isinstance(v, np.ndarray))
+                record["frames"] = num_frames
+            if fused_stats is not None:
+                with profile_stage(profiler, "norm_stats"):
+                    fused_stats.add(episode_data, dataset.num_episodes - 1)
+            manifest.record(json_file.name, fingerprints[json_file.name], num_frames)
+            num_episodes += 1
+            total_frames += num_frames
+            progress.update(episodes=1, frames=num_frames)
+            del episode_data
+            if num_episodes % 10 == 0:
+                print(f"  Added {num_episodes}/{len(json_files)} episodes")
+        progress.finish(episodes_written=num_episodes)
+    
+    profile_path = None
+    if profiler is not None:
+        profile_path = Path(args.profile_report) if args.profile_report else lerobot_home() / f"{output_repo_id}.profile.json"
+        profiler.write(profile_path, profile_path.with_suffix(".trace.json"))
+        profiler.print_summary()
+    
+    if num_episodes == 0:
+        print("No episodes to convert!")
+        if fused_stats is not None and manifest.num_written_episodes > 0:
+            fused_stats.finish(args.check_norm_stats)
+        return
     
+    elapsed = time.perf_counter() - start_time
     print(f"\n✅ Conversion complete!")
-    print(f"  Total episodes: {len(episodes)}")
+    print(f"  Total episodes: {num_episodes} ({manifest.num_written_episodes} in dataset)")
+    print(f"  Total frames: {total_frames}")
+    print(f"  Throughput: {num_episodes / elapsed:.2f} episodes/s, {total_frames / elapsed:.1f} frames/s ({elapsed:.1f}s)")
+    if run_prune_stats:
+        removed = sum(p.frames_removed for p in run_prune_stats)
+        before = sum(p.frames_before for p in run_prune_stats)
+        saved = sum(p.bytes_saved for p in run_prune_stats)
+        print(f"  Pruned: {removed}/{before} frames ({saved / 1024 ** 3:.2f} GB uncompressed), report: {report_path}")
+    if cache is not None:
+        summary = cache.summary()
+        print(f"  Frame cache: {summary['entries']} frames, {summary['bytes'] / 1024 ** 3:.2f} GB")
+    if profile_path is not None:
+        print(f"  Profile: {profile_path} (trace: {profile_path.with_suffix('.trace.json')})")
     print(f"  Dataset: {output_repo_id}")
+    if fused_stats is not None:
+        fused_stats.finish(args.check_norm_stats)
 
 
 if __name__ == "__main__":
-    main()
+    main(tyro.cli(Args))
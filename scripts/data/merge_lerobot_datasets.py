@@ -0,0 +1,102 @@
+"""
+Merge partial LeRobot datasets (e.g. from `--shard i/N` conversions) into one dataset.
+
+Episodes are renumbered in shard order, frame indices and task indices are rewritten
+and the metadata is concatenated; images and videos are never decoded or re-encoded
+(see pipeline/sharding.py). Shards converted with --video merge at metadata cost;
+image shards embed their frames in the parquet files and need --rewrite_images. If every shard has an episode manifest with the same
+config fingerprint, a merged manifest is written too, so the merged dataset can be
+extended incrementally by convert_json_to_lerobot_universal.py.
+
+사용법:
+    # 노드 i (0..3)에서:
+    python scripts/data/convert_json_to_lerobot_universal.py ... \
+        --output_repo_id your_hf_username/dobot_e6_vla_dataset --shard i/4
+
+    # 모든 shard를 같은 <lerobot_home>으로 모은 뒤:
+    python scripts/data/merge_lerobot_datasets.py \
+        --output_repo_id your_hf_username/dobot_e6_vla_dataset --num_shards 4
+
+    # 임의의 데이터셋 병합 (순서대로)
+    python scripts/data/merge_lerobot_datasets.py \
+        --output_repo_id your_hf_username/merged --input_repo_ids user/a user/b
+"""
+
+import pathlib
+import sys
+import time
+
+import tyro
+
+# Add RoboVLA root to path
+robo_vla_root = pathlib.Path(__file__).parent.parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from pipeline.manifest import EpisodeManifest, default_manifest_path, lerobot_home
+from pipeline.sharding import merge_datasets, shard_repo_id
+
+
+def merge_manifests(input_repo_ids: list[str], output_repo_id: str) -> EpisodeManifest | None:
+    """Concatenated episode manifest of the inputs, or None if any is missing or they disagree."""
+    manifests = [EpisodeManifest.load(default_manifest_path(repo_id)) for repo_id in input_repo_ids]
+    if any(m is None for m in manifests):
+        return None
+    if len({m.config_fingerprint for m in manifests}) > 1:
+        print("Warning: shard manifests have different config fingerprints; no merged manifest written")
+        return None
+    merged = EpisodeManifest(default_manifest_path(output_repo_id), manifests[0].config_fingerprint)
+    for manifest in manifests:
+        merged.episodes.extend(manifest.episodes)
+    return merged
+
+
+def main(
+    output_repo_id: str,
+    num_shards: int | None = None,
+    input_repo_ids: list[str] | None = None,
+    rewrite_images: bool = False,
+):
+    """Merge LeRobot datasets under <lerobot_home>.
+
+    Args:
+        output_repo_id: Repo ID of the merged dataset (must not exist yet).
+        num_shards: Merge the shards written by `--shard i/num_shards` conversions
+            of output_repo_id (<output_repo_id>-shard-i-of-N, i = 0..N-1).
+        input_repo_ids: Merge these datasets, in this order, instead.
+        rewrite_images: Allow merging image (non --video) datasets. Their frames are embedded
+            in the parquet files, so every episode after the first shard is rewritten with
+            all of its pixel data; without this flag such a merge is refused.
+    """
+    if (num_shards is None) == (input_repo_ids is None):
+        raise ValueError("Specify exactly one of --num_shards or --input_repo_ids")
+    if num_shards is not None:
+        input_repo_ids = [shard_repo_id(output_repo_id, i, num_shards) for i in range(num_shards)]
+
+    roots = [lerobot_home() / repo_id for repo_id in input_repo_ids]
+    missing = [str(root) for root in roots if not (root / "meta" / "info.json").exists()]
+    if missing:
+        raise FileNotFoundError(f"Input datasets not found: {missing}")
+
+    print(f"Merging {len(roots)} datasets into {output_repo_id}:")
+    for repo_id in input_repo_ids:
+        print(f"  {repo_id}")
+
+    start = time.perf_counter()
+    result = merge_datasets(roots, lerobot_home() / output_repo_id, rewrite_images=rewrite_images)
+    elapsed = time.perf_counter() - start
+
+    manifest = merge_manifests(input_repo_ids, output_repo_id)
+    if manifest is not None:
+        manifest.save()
+
+    print(f"\n✅ Merge complete!")
+    print(f"  Episodes: {result['episodes']}, frames: {result['frames']}, tasks: {result['tasks']}")
+    print(f"  Parquet files rewritten: {result['rewritten_parquet']}, files linked: {result['linked_files']}")
+    print(f"  Time: {elapsed:.1f}s")
+    if manifest is not None:
+        print(f"  Manifest: {manifest.path}")
+    print(f"  Dataset: {lerobot_home() / output_repo_id}")
+
+
+if __name__ == "__main__":
+    tyro.cli(main)
@@ -1,73 +1,147 @@
 """
-변환된 JSON 파일에서 그리퍼 값이 제대로 변환되었는지 확인하는 스크립트.
+변환된 JSON(또는 columnar) 에피소드를 검증하는 스크립트.
+
+RobotConfig에 따라 그리퍼 필드/추출 방식, 액션의 그리퍼 열(actions[num_joints]),
+그리퍼 값 범위(GripperConfig.value_range)와 관절 한계(RobotConfig.joint_limits)를 정하고,
+각 에피소드를 한 번만 파싱해 통계를 누적합니다 (pipeline/validation.py):
+그리퍼 값 분포, 그리퍼 전환 횟수, 관절 범위/한계 위반, 누락 관절/액션, robot_mode 분포,
+누락 이미지. 에피소드는 --workers 개의 프로세스에서 병렬로 검증되고 결과는 하나의
+JSON 리포트로 저장됩니다.
+
+사용법:
+    python scripts/data/verify_gripper_in_json.py --json_dir json_output
+
+    # 이미지 누락까지 확인, 8개 프로세스 사용
+    python scripts/data/verify_gripper_in_json.py \
+        --json_dir json_output \
+        --images_base_dir /path/to/VLA_DATASET \
+        --workers 8 \
+        --output_json json_output_validation.json
 """
 
 import json
 import pathlib
-from collections import Counter
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import tyro
+
+# Add RoboVLA root to path
+robo_vla_root = pathlib.Path(__file__).parent.parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from config.robot_config import get_robot_config
+from pipeline.columnar import EPISODE_SUFFIX, is_columnar_episode
+from pipeline.validation import ValidationStats, validate_episode
+
+
+def find_episodes(json_path: pathlib.Path) -> list[pathlib.Path]:
+    """columnar 에피소드 디렉토리가 있으면 그것을, 없으면 *.json 파일 목록"""
+    columnar = sorted(p for p in json_path.glob(f"*{EPISODE_SUFFIX}") if is_columnar_episode(p))
+    return columnar or sorted(json_path.glob("*.json"))
+
+
+def print_report(report: dict, num_samples: int) -> None:
+    """리포트 요약 출력"""
+    print(f"\n[샘플 {num_samples}개 에피소드]")
+    for episode in report["per_episode"][:num_samples]:
+        line = f"  {episode['source']}: {episode['frames']} 프레임"
+        if "gripper_transitions" in episode:
+            line += f", 그리퍼 전환 {episode['gripper_transitions']}회"
+        line += f", 관절 한계 위반 {episode['joint_violations']} 프레임"
+        if "missing_images" in episode:
+            line += f", 누락 이미지 {episode['missing_images']}개"
+        print(line)
 
-def check_gripper_values(json_dir: str, num_samples: int = 5):
-    """JSON 파일들에서 그리퍼 값 확인"""
-    json_path = pathlib.Path(json_dir)
-    
-    json_files = sorted(json_path.glob("*.json"))
-    print(f"Found {len(json_files)} JSON files")
-    
-    # 샘플 몇 개 확인
-    print(f"\n[샘플 {num_samples}개 파일 확인]")
-    for json_file in json_files[:num_samples]:
-        with open(json_file, 'r') as f:
-            data = json.load(f)
-        
-        frames = data['frames']
-        
-        # 그리퍼 값 통계
-        gripper_values = [f['gripper'] for f in frames]
-        gripper_tooldo1_values = [f['gripper_tooldo1'] for f in frames]
-        actions_gripper = [f['actions'][6] for f in frames]
-        
-        print(f"\n{json_file.name}:")
-        print(f"  총 프레임: {len(frames)}")
-        print(f"  gripper 값: min={min(gripper_values)}, max={max(gripper_values)}, "
-              f"unique={sorted(set(gripper_values))}")
-        print(f"  gripper_tooldo1 값: min={min(gripper_tooldo1_values)}, max={max(gripper_tooldo1_values)}, "
-              f"unique={sorted(set(gripper_tooldo1_values))}")
-        print(f"  actions[6] (그리퍼 델타): min={min(actions_gripper):.6f}, max={max(actions_gripper):.6f}, "
-              f"unique={sorted(set([round(x, 6) for x in actions_gripper]))}")
-        
-        # 그리퍼 상태 변경 확인
-        gripper_changes = []
-        prev_g = None
-        for i, f in enumerate(frames):
-            g = f['gripper']
-            if g != prev_g:
-                gripper_changes.append((i, f['gripper_tooldo1'], f['gripper_tooldo2'], g))
-                prev_g = g
-        
-        if gripper_changes:
-            print(f"  그리퍼 상태 변경: {len(gripper_changes)}회")
-            print(f"    처음 5개: {gripper_changes[:5]}")
-        else:
-            print(f"  그리퍼 상태 변경: 없음 (모두 동일)")
-    
-    # 전체 통계
     print(f"\n[전체 통계]")
-    all_gripper_values = []
-    all_actions_gripper = []
-    for json_file in json_files:
-        with open(json_file, 'r') as f:
-            data = json.load(f)
-        for frame in data['frames']:
-            all_gripper_values.append(frame['gripper'])
-            all_actions_gripper.append(frame['actions'][6])
-    
-    print(f"전체 프레임 수: {len(all_gripper_values)}")
-    print(f"gripper 값 분포: {Counter(all_gripper_values)}")
-    print(f"actions[6] 값 범위: min={min(all_actions_gripper):.6f}, max={max(all_actions_gripper):.6f}")
-    print(f"actions[6] != 0인 프레임: {sum(1 for x in all_actions_gripper if abs(x) > 1e-6)}개")
+    print(f"에피소드: {report['episodes']}개 (실패 {report['failed_episodes']}개)")
+    print(f"전체 프레임 수: {report['frames_total']} (robot_mode 필터 후 {report['frames']})")
+    print(f"robot_mode 분포: {report['robot_mode']['values']} (없음 {report['robot_mode']['missing']})")
+
+    joints = report["joints"]
+    print(f"관절 범위 ({joints['units']}):")
+    for i, (low, high) in enumerate(joints["limits"]):
+        if joints["count"][i] == 0:
+            continue
+        print(f"  joint[{i}]: min={joints['min'][i]:.3f}, max={joints['max'][i]:.3f} "
+              f"(한계 [{low:g}, {high:g}], 위반 {joints['violations'][i]} 프레임)")
+    print(f"관절 수 부족 프레임: {joints['short_frames']}개, actions 없는 프레임: {report['missing_action_frames']}개")
+
+    gripper = report["gripper"]
+    if gripper is not None:
+        print(f"{gripper['field']} 값 분포: {gripper['values']['values']} (없음 {gripper['values']['missing']})")
+        for name, histogram in gripper["sources"].items():
+            if name != gripper["field"]:
+                print(f"{name} 값 분포: {histogram['values']} (없음 {histogram['missing']})")
+        print(f"범위 {gripper['value_range']} 밖의 그리퍼 값: {gripper['out_of_range']}개")
+        transitions = gripper["transitions"]
+        print(f"그리퍼 전환: 증가 {transitions['rising']}회, 감소 {transitions['falling']}회, "
+              f"전환 없는 에피소드 {transitions['episodes_without_transitions']}개")
+        action = gripper["action"]
+        column = gripper["action_column"]
+        if action["count"]:
+            print(f"actions[{column}] (그리퍼) 값 범위: min={action['min']:.6f}, max={action['max']:.6f}")
+        print(f"actions[{column}] != 0인 프레임: {action['nonzero']}개")
+
+    images = report["images"]
+    if images["checked"]:
+        print(f"누락 이미지: {images['missing']}개 ({images['episodes_with_missing']}개 에피소드)")
+
+    for error in report["errors"]:
+        print(f"  ❌ {error['episode']}: {error['error']}")
+
+
+def validate_dataset(
+    json_dir: str = "json_output",
+    robot_name: str = "dobot_e6",
+    images_base_dir: str | None = None,
+    workers: int = 1,
+    output_json: str | None = None,
+    num_samples: int = 5,
+):
+    """
+    JSON/columnar 에피소드 검증
+
+    Args:
+        json_dir: 에피소드 디렉토리 (*.json 또는 *.episode)
+        robot_name: 로봇 설정 이름 (config/robot_config.py)
+        images_base_dir: VLA_DATASET 경로 (지정하면 누락 이미지 확인)
+        workers: 검증 프로세스 수
+        output_json: 리포트 경로 (기본값: <json_dir>_validation.json)
+        num_samples: 출력할 샘플 에피소드 수
+    """
+    config = get_robot_config(robot_name)
+    json_path = pathlib.Path(json_dir)
+    images_path = pathlib.Path(images_base_dir) if images_base_dir else None
+    report_path = pathlib.Path(output_json) if output_json else json_path.parent / f"{json_path.name}_validation.json"
+
+    episodes = find_episodes(json_path)
+    print(f"Found {len(episodes)} episodes in {json_path} (robot: {config.name})")
+
+    stats = ValidationStats.for_config(config)
+    if workers <= 1:
+        for episode in episodes:
+            stats.merge(validate_episode(episode, config, images_path))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                validate_episode,
+                episodes,
+                [config] * len(episodes),
+                [images_path] * len(episodes),
+                chunksize=max(1, len(episodes) // (workers * 8)),
+            )
+            for result in results:
+                stats.merge(result)
+
+    report = {"json_dir": str(json_path), **stats.report(config)}
+    print_report(report, num_samples)
+
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n리포트 저장: {report_path}")
 
 
 if __name__ == "__main__":
-    import sys
-    json_dir = sys.argv[1] if len(sys.argv) > 1 else "json_output"
-    check_gripper_values(json_dir)
+    tyro.cli(validate_dataset)
@@ -0,0 +1,73 @@
+"""
+Dobot-Arm-DataCollect loaders: robot_data.csv and pickled / migrated dataset.npy.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add RoboVLA root to path
+robo_vla_root = Path(__file__).parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from pipeline.dobot_data import load_dobot_csv, load_dobot_npy, migrate_dobot_npy
+
+HEADER = "frame_id,timestamp,image_path,j1,j2,j3,j4,j5,j6,x,y,z,rx,ry,rz,gripper_tooldo1,gripper_tooldo2,robot_mode"
+
+
+def image_paths(count: int) -> list[str]:
+    """Absolute paths well past 256 characters, as on deeply nested collection drives."""
+    directory = "/data/" + "/".join(f"collection_session_{i:02d}" for i in range(16))
+    return [f"{directory}/images/frame_{i:06d}.png" for i in range(count)]
+
+
+def test_csv_keeps_long_image_paths(tmp_path):
+    paths = image_paths(3)
+    assert len(paths[0]) > 256
+    rows = [f"{i},{i / 10},{path},{','.join(['1.5'] * 12)},0,{i % 2},7" for i, path in enumerate(paths)]
+    csv_path = tmp_path / "robot_data.csv"
+    csv_path.write_text("\n".join([HEADER, *rows]) + "\n")
+
+    episode = load_dobot_csv(csv_path)
+    assert episode.image_path.tolist() == paths
+    assert episode.image_path.dtype == np.dtype(f"U{len(paths[0])}")
+    assert episode.gripper.tolist() == [0.0, 1.0, 0.0]
+    assert np.array_equal(episode.frame_id, [0, 1, 2])
+
+
+def test_csv_without_optional_columns_or_rows(tmp_path):
+    csv_path = tmp_path / "robot_data.csv"
+    csv_path.write_text("frame_id,timestamp,image_path,j1,j2,j3,j4,j5,j6\n0,0.0,a.png,1,2,3,4,5,6\n")
+    episode = load_dobot_csv(csv_path)
+    assert episode.robot_mode.tolist() == [-1] and not episode.tcp_pose.any()
+
+    csv_path.write_text(HEADER + "\n")
+    assert len(load_dobot_csv(csv_path)) == 0
+
+
+def test_migrated_npy_matches_pickled(tmp_path):
+    paths = image_paths(4)
+    frames = [
+        {
+            "frame_id": i,
+            "timestamp": i / 10,
+            "image_path": path,
+            "joint_angles": [float(i)] * 6,
+            "tcp_pose": [0.0] * 6,
+            "gripper_tooldo2": float(i > 1),
+            "robot_mode": 7,
+        }
+        for i, path in enumerate(paths)
+    ]
+    npy_path = tmp_path / "dataset.npy"
+    np.save(npy_path, np.array(frames, dtype=object), allow_pickle=True)
+    legacy = load_dobot_npy(npy_path)
+
+    assert migrate_dobot_npy(npy_path)
+    assert not migrate_dobot_npy(npy_path)
+    migrated = load_dobot_npy(npy_path)
+
+    assert migrated.image_path.tolist() == paths
+    assert np.array_equal(migrated.states, legacy.states)
+    assert (tmp_path / "dataset.npy.pickle.bak").exists()
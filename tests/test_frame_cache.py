@@ -0,0 +1,110 @@
+"""
+FrameCache keys, LRU eviction and sharing between threads / processes.
+"""
+
+import os
+import pickle
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+# Add RoboVLA root to path
+robo_vla_root = Path(__file__).parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from pipeline.frame_cache import FrameCache
+
+SIZE = (16, 16)
+FRAME_BYTES = SIZE[0] * SIZE[1] * 3
+
+
+@pytest.fixture
+def images(tmp_path) -> list[Path]:
+    directory = tmp_path / "episode" / "images"
+    directory.mkdir(parents=True)
+    paths = []
+    for i in range(8):
+        path = directory / f"{i:04d}.png"
+        Image.fromarray(np.full((32, 32, 3), i * 30, dtype=np.uint8)).save(path)
+        paths.append(path)
+    return paths
+
+
+def test_round_trip_and_counters(tmp_path, images):
+    cache = FrameCache(tmp_path / "cache")
+    first = [cache.get_or_decode(p, SIZE, "bilinear") for p in images]
+    cache.flush()
+    second = [cache.get_or_decode(p, SIZE, "bilinear") for p in images]
+
+    assert (cache.hits, cache.misses) == (len(images), len(images))
+    assert all(np.array_equal(a, b) for a, b in zip(first, second))
+    assert cache.summary()["entries"] == len(images)
+
+
+def test_key_depends_on_source_and_settings(tmp_path, images):
+    cache = FrameCache(tmp_path / "cache")
+    key = cache.make_key(images[0], SIZE, "bilinear", False)
+    assert cache.make_key(images[0], SIZE, "lanczos", False) != key
+    assert cache.make_key(images[0], SIZE, "bilinear", True) != key
+    assert cache.make_key(images[0], (8, 8), "bilinear", False) != key
+
+    # Same file reached through a different (unresolved) directory path
+    alias = images[0].parent / ".." / "images" / images[0].name
+    cache.flush()
+    assert cache.make_key(alias, SIZE, "bilinear", False) == key
+
+    # Listings are per episode: after flush() a rewritten file gets a new key
+    Image.fromarray(np.zeros((33, 33, 3), dtype=np.uint8)).save(images[0])
+    os.utime(images[0], ns=(1, 1))
+    cache.flush()
+    assert cache.make_key(images[0], SIZE, "bilinear", False) != key
+
+    with pytest.raises(FileNotFoundError):
+        cache.make_key(images[0].with_name("missing.png"), SIZE, "bilinear", False)
+
+
+def test_lru_eviction_counts_unflushed_reads(tmp_path, images):
+    # One frame per shard, room for two shards
+    cache = FrameCache(tmp_path / "cache", max_bytes=2 * FRAME_BYTES, slots_per_shard=1)
+    cache.get_or_decode(images[0], SIZE, "bilinear")
+    cache.get_or_decode(images[1], SIZE, "bilinear")
+    cache.flush()
+
+    # Read the older shard without flushing, then store a third frame
+    cache.get_or_decode(images[0], SIZE, "bilinear")
+    cache.get_or_decode(images[2], SIZE, "bilinear")
+
+    assert cache.summary()["shards"] == 2
+    hits = cache.hits
+    cache.get_or_decode(images[0], SIZE, "bilinear")
+    assert cache.hits == hits + 1
+    cache.get_or_decode(images[1], SIZE, "bilinear")
+    assert cache.hits == hits + 1  # evicted as least recently used
+
+
+def test_shared_between_threads(tmp_path, images):
+    cache = FrameCache(tmp_path / "cache", slots_per_shard=3)
+    paths = images * 4
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        first = list(pool.map(lambda p: cache.get_or_decode(p, SIZE, "bilinear"), paths))
+    cache.flush()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        second = list(pool.map(lambda p: cache.get_or_decode(p, SIZE, "bilinear"), paths))
+
+    assert cache.hits + cache.misses == 2 * len(paths)
+    assert cache.hits >= len(paths)
+    assert all(np.array_equal(a, b) for a, b in zip(first, second))
+
+
+def test_pickled_cache_reopens(tmp_path, images):
+    cache = FrameCache(tmp_path / "cache")
+    expected = cache.get_or_decode(images[0], SIZE, "bilinear")
+    cache.flush()
+
+    clone = pickle.loads(pickle.dumps(cache))
+    assert np.array_equal(clone.get_or_decode(images[0], SIZE, "bilinear"), expected)
+    assert clone.hits == cache.hits + 1
@@ -0,0 +1,101 @@
+"""
+JsonEpisodeReader against json.load(), with read buffers small enough to split every value.
+"""
+
+import base64
+import io
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+# Add RoboVLA root to path
+robo_vla_root = Path(__file__).parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from pipeline.json_stream import (
+    JsonEpisodeReader,
+    decode_embedded_image,
+    load_json_without_images,
+    pop_embedded_image,
+)
+
+
+def jpeg_payload(value: int) -> str:
+    buffer = io.BytesIO()
+    Image.fromarray(np.full((32, 32, 3), value, dtype=np.uint8)).save(buffer, format="JPEG", quality=95)
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+EPISODE = {
+    "episode_name": "vla_auto_0001",
+    "prompt": "pick up the \"red\" cube → bin",
+    "frames": [
+        {
+            "frame_id": i,
+            "timestamp": 1712345678.125 + i * 0.1,
+            "joint_angles": [-12.5e-3 * i, 90, 1e10, -0.0, 3.25, 123456789],
+            "gripper": i % 2,
+            "nested": {"empty": [], "none": None, "flag": True},
+            "image": jpeg_payload(40 * i),
+        }
+        for i in range(4)
+    ],
+    "total_frames": 4,
+}
+
+
+def write_json(path: Path, data: dict, indent: int | None = None) -> Path:
+    path.write_text(json.dumps(data, indent=indent, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_frames_and_meta_match_json_load(tmp_path, chunk_size, indent):
+    path = write_json(tmp_path / "episode.json", EPISODE, indent)
+    reader = JsonEpisodeReader(path, chunk_size=chunk_size)
+
+    assert list(reader) == EPISODE["frames"]
+    # Fields written after "frames" are collected once iteration finishes
+    assert reader.meta == {k: v for k, v in EPISODE.items() if k != "frames"}
+
+
+@pytest.mark.parametrize("data", [{}, {"episode_name": "x", "frames": []}, {"frames": [], "prompt": ""}])
+def test_empty_episodes(tmp_path, data):
+    reader = JsonEpisodeReader(write_json(tmp_path / "episode.json", data), chunk_size=2)
+    assert list(reader) == []
+    assert reader.meta == {k: v for k, v in data.items() if k != "frames"}
+
+
+@pytest.mark.parametrize("text", ['[1, 2]', '{"frames": [{"a": 1} {"a": 2}]}', '{"frames": [{"a": 1},', ''])
+def test_malformed_input_raises(tmp_path, text):
+    path = tmp_path / "episode.json"
+    path.write_text(text)
+    with pytest.raises(ValueError):
+        list(JsonEpisodeReader(path, chunk_size=4))
+
+
+def test_load_without_images_drops_payloads(tmp_path):
+    path = write_json(tmp_path / "episode.json", EPISODE)
+    data = load_json_without_images(path)
+    assert data["episode_name"] == EPISODE["episode_name"] and data["total_frames"] == 4
+    assert all("image" not in frame for frame in data["frames"])
+    assert [frame["joint_angles"] for frame in data["frames"]] == [f["joint_angles"] for f in EPISODE["frames"]]
+
+
+def test_embedded_image_round_trip():
+    frame = {"frame_id": 0, "image_base64": "data:image/jpeg;base64," + jpeg_payload(200)}
+    payload = pop_embedded_image(frame)
+    assert frame == {"frame_id": 0}
+    assert pop_embedded_image(frame) is None
+
+    image = decode_embedded_image(payload, (16, 16), "bilinear")
+    assert image.shape == (16, 16, 3) and image.dtype == np.uint8
+    assert np.abs(image.astype(int) - 200).max() <= 3
+
+    with pytest.raises(ValueError, match="embedded image"):
+        decode_embedded_image("not base64!", (16, 16))
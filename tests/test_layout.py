@@ -0,0 +1,253 @@
+"""
+ColumnLayout.episode_arrays() against the original per-frame conversion.
+
+The reference below is the per-frame pad_state/pad_actions loop the universal converter
+used before the compiled layout (minus image loading). The layout must reproduce it
+byte for byte, so outputs are compared with np.array_equal and dtype, not a tolerance.
+"""
+
+import copy
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add RoboVLA root to path
+robo_vla_root = Path(__file__).parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from config.robot_config import GripperConfig, RobotConfig
+
+
+# --- Reference: original per-frame conversion ------------------------------------
+
+def deg_to_rad(deg: float) -> float:
+    return deg * np.pi / 180.0
+
+
+def pad_state(joint_angles, gripper, config):
+    if config.joint_units == "deg" and config.joint_output_units == "rad":
+        joints = [deg_to_rad(j) for j in joint_angles]
+    else:
+        joints = joint_angles[:config.num_joints]
+
+    state = joints.copy()
+    if config.use_dummy_dim:
+        state.append(0.0)
+    if config.gripper is not None and gripper is not None:
+        state.append(float(gripper))
+    return np.array(state, dtype=np.float32)
+
+
+def pad_actions(actions, config):
+    joint_deltas = actions[:config.num_joints]
+    if config.joint_units == "deg" and config.joint_output_units == "rad":
+        joint_deltas = [deg_to_rad(d) for d in joint_deltas]
+
+    action = joint_deltas.copy()
+    if config.use_dummy_dim:
+        action.append(0.0)
+    if config.gripper is not None:
+        gripper_idx = config.num_joints
+        if len(actions) > gripper_idx:
+            gripper_delta = actions[gripper_idx]
+        else:
+            gripper_delta = 0.0
+        action.append(gripper_delta)
+    return np.array(action, dtype=np.float32)
+
+
+def extract_gripper(frames, config):
+    for frame in frames:
+        gripper_value = None
+        if config.gripper is not None:
+            if config.gripper.field_name in frame:
+                gripper_value = frame[config.gripper.field_name]
+            else:
+                for source_field in config.gripper.source_fields:
+                    if source_field in frame:
+                        raw_value = frame[source_field]
+                        if config.gripper.extraction_method == "threshold":
+                            gripper_value = 1.0 if float(raw_value) > config.gripper.threshold else 0.0
+                        elif config.gripper.extraction_method == "direct":
+                            gripper_value = float(raw_value)
+                        elif config.gripper.extraction_method == "max":
+                            gripper_value = max([float(frame.get(f, 0)) for f in config.gripper.source_fields])
+                        break
+        frame['_gripper'] = gripper_value
+
+
+def reference_arrays(frames, config):
+    """(states, actions) from the original per-frame loop."""
+    extract_gripper(frames, config)
+
+    states = []
+    actions = []
+    for i, frame in enumerate(frames):
+        joint_angles = frame.get('joint_angles', [])
+        if len(joint_angles) < config.num_joints:
+            joint_angles.extend([0.0] * (config.num_joints - len(joint_angles)))
+
+        gripper = frame.get('_gripper')
+        if gripper is None and config.gripper is not None:
+            gripper = 0.0
+
+        states.append(pad_state(joint_angles, gripper, config))
+
+        frame_actions = frame.get('actions', [])
+        if len(frame_actions) == 0:
+            if i > 0:
+                prev_joints = frames[i-1].get('joint_angles', [])
+                frame_actions = [joint_angles[j] - prev_joints[j] if j < len(prev_joints) else 0.0
+                                for j in range(config.num_joints)]
+                if config.gripper is not None:
+                    prev_gripper_val = frames[i-1].get('_gripper', 0.0) or 0.0
+                    gripper_delta = (gripper or 0.0) - prev_gripper_val
+                    frame_actions.append(gripper_delta)
+            else:
+                frame_actions = [0.0] * config.num_joints
+                if config.gripper is not None:
+                    frame_actions.append(0.0)
+
+        actions.append(pad_actions(frame_actions, config))
+
+    return np.array(states), np.array(actions)
+
+
+def filter_frames(frames, config):
+    if config.filter_robot_mode is None:
+        return frames
+    return [f for f in frames if f.get('robot_mode') == config.filter_robot_mode]
+
+
+# --- Synthetic episodes ----------------------------------------------------------
+
+def gripper_config(method: str, threshold: float = 0.5, num_sources: int = 2) -> GripperConfig:
+    return GripperConfig(
+        field_name="gripper",
+        source_fields=[f"gripper_src{k}" for k in range(num_sources)],
+        extraction_method=method,
+        threshold=threshold,
+    )
+
+
+CONFIGS = {
+    "dobot_threshold": RobotConfig(
+        name="dobot_threshold",
+        num_joints=6,
+        gripper=gripper_config("threshold", 0.5, num_sources=1),
+        filter_robot_mode=7,
+    ),
+    "threshold_high": RobotConfig(
+        name="threshold_high", num_joints=6, gripper=gripper_config("threshold", 0.8),
+    ),
+    "threshold_negative": RobotConfig(
+        name="threshold_negative", num_joints=6, gripper=gripper_config("threshold", -0.25),
+    ),
+    "direct": RobotConfig(name="direct", num_joints=7, gripper=gripper_config("direct")),
+    "max": RobotConfig(name="max", num_joints=6, gripper=gripper_config("max", num_sources=3)),
+    "no_gripper": RobotConfig(name="no_gripper", num_joints=6, gripper=None),
+    "no_dummy": RobotConfig(
+        name="no_dummy", num_joints=5, gripper=gripper_config("direct"), use_dummy_dim=False,
+    ),
+    "rad_input": RobotConfig(
+        name="rad_input", num_joints=6, gripper=gripper_config("threshold"),
+        joint_units="rad", joint_output_units="rad",
+    ),
+    "deg_output": RobotConfig(
+        name="deg_output", num_joints=6, gripper=gripper_config("max"),
+        joint_units="deg", joint_output_units="deg", filter_robot_mode=3,
+    ),
+}
+
+
+def make_frames(config: RobotConfig, seed: int, num_frames: int = 40) -> list[dict]:
+    """Frames with short joint lists, missing/empty actions and partial gripper fields."""
+    rng = np.random.default_rng(seed)
+    n = config.num_joints
+    action_width = n + int(config.gripper is not None)
+    mode = config.filter_robot_mode if config.filter_robot_mode is not None else 7
+
+    frames = []
+    for i in range(num_frames):
+        frame = {'frame_id': i}
+
+        # First frame always survives the robot_mode filter
+        frame['robot_mode'] = mode if i == 0 or rng.random() < 0.7 else mode + 1
+
+        num_recorded = n if rng.random() < 0.8 else int(rng.integers(0, n))
+        frame['joint_angles'] = [float(v) for v in rng.uniform(-180.0, 180.0, num_recorded)]
+
+        r = rng.random()
+        if r < 0.2:
+            pass  # no 'actions' key
+        elif r < 0.4:
+            frame['actions'] = []
+        else:
+            width = action_width + int(rng.integers(0, 2))
+            frame['actions'] = [float(v) for v in rng.uniform(-5.0, 5.0, width)]
+
+        if config.gripper is not None:
+            if rng.random() < 0.3:
+                frame[config.gripper.field_name] = float(rng.uniform(0.0, 1.0))
+            for source_field in config.gripper.source_fields:
+                if rng.random() < 0.6:
+                    # Exact threshold values exercise the strict '>' comparison
+                    frame[source_field] = (
+                        config.gripper.threshold if rng.random() < 0.2 else float(rng.uniform(-1.0, 1.0))
+                    )
+
+        frames.append(frame)
+    return frames
+
+
+def layout_arrays(frames, config):
+    layout = config.compile()
+    return layout.episode_arrays(layout.columns(frames))
+
+
+# --- Tests -----------------------------------------------------------------------
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("config_name", sorted(CONFIGS))
+def test_episode_arrays_match_per_frame_loop(config_name, seed):
+    config = CONFIGS[config_name]
+    frames = filter_frames(make_frames(config, seed), config)
+
+    expected_states, expected_actions = reference_arrays(copy.deepcopy(frames), config)
+    states, actions = layout_arrays(copy.deepcopy(frames), config)
+
+    assert states.dtype == expected_states.dtype == np.float32
+    assert actions.dtype == expected_actions.dtype == np.float32
+    assert states.shape == (len(frames), config.state_dim)
+    assert actions.shape == (len(frames), config.action_dim)
+    assert np.array_equal(states, expected_states)
+    assert np.array_equal(actions, expected_actions)
+
+
+@pytest.mark.parametrize("config_name", sorted(CONFIGS))
+def test_all_actions_missing_uses_frame_deltas(config_name):
+    config = CONFIGS[config_name]
+    frames = filter_frames(make_frames(config, seed=100), config)
+    for frame in frames:
+        frame.pop('actions', None)
+
+    expected_states, expected_actions = reference_arrays(copy.deepcopy(frames), config)
+    states, actions = layout_arrays(copy.deepcopy(frames), config)
+
+    assert np.array_equal(states, expected_states)
+    assert np.array_equal(actions, expected_actions)
+    assert not actions[0].any()
+
+
+@pytest.mark.parametrize("config_name", sorted(CONFIGS))
+def test_single_frame_episode(config_name):
+    config = CONFIGS[config_name]
+    frames = filter_frames(make_frames(config, seed=7, num_frames=1), config)
+
+    expected_states, expected_actions = reference_arrays(copy.deepcopy(frames), config)
+    states, actions = layout_arrays(copy.deepcopy(frames), config)
+
+    assert np.array_equal(states, expected_states)
+    assert np.array_equal(actions, expected_actions)
@@ -0,0 +1,186 @@
+"""
+Episode manifest: source fingerprints, run planning and crash recovery.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add RoboVLA root to path
+robo_vla_root = Path(__file__).parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+import pipeline.manifest as manifest_module
+from pipeline.manifest import (
+    EpisodeManifest,
+    SourceFingerprintCache,
+    config_fingerprint,
+    prepare_incremental_run,
+    source_fingerprint,
+)
+
+
+def write_dataset(root: Path, lengths: list[int]) -> None:
+    """Just the meta/episodes.jsonl of a LeRobot v2 dataset."""
+    (root / "meta").mkdir(parents=True, exist_ok=True)
+    (root / "meta" / "episodes.jsonl").write_text(
+        "".join(json.dumps({"episode_index": i, "length": n}) + "\n" for i, n in enumerate(lengths))
+    )
+
+
+def touch(path: Path, content: str) -> None:
+    """Rewrite path with a new mtime even within the file system's timestamp resolution."""
+    mtime_ns = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(content)
+    os.utime(path, ns=(mtime_ns + 10 ** 9, mtime_ns + 10 ** 9))
+
+
+# --- Fingerprints ----------------------------------------------------------------
+
+def test_source_fingerprint_tracks_content_and_images(tmp_path):
+    episode = tmp_path / "0.json"
+    images = tmp_path / "images"
+    touch(episode, '{"frames": []}')
+    fingerprint = source_fingerprint(episode, images)
+
+    images.mkdir()
+    with_images = source_fingerprint(episode, images)
+    assert with_images != fingerprint
+
+    touch(episode, '{"frames": [{}]}')
+    assert source_fingerprint(episode, images) != with_images
+
+
+def test_fingerprint_cache_rereads_only_changed_sources(tmp_path, monkeypatch):
+    episode = tmp_path / "0.json"
+    touch(episode, '{"frames": []}')
+    expected = source_fingerprint(episode)
+
+    calls = []
+    original = manifest_module.source_fingerprint
+    monkeypatch.setattr(manifest_module, "source_fingerprint", lambda *p, **kw: calls.append(p) or original(*p, **kw))
+
+    cache_path = tmp_path / "fingerprints.json"
+    cache = SourceFingerprintCache(cache_path)
+    assert cache.fingerprint(episode) == expected
+    assert cache.value(episode, "episode_name", lambda: "ep0") == "ep0"
+    cache.save()
+
+    cache = SourceFingerprintCache(cache_path)
+    assert cache.fingerprint(episode) == expected
+    assert cache.value(episode, "episode_name", lambda: pytest.fail("name read again")) == "ep0"
+    assert len(calls) == 1
+
+    touch(episode, '{"frames": [{}]}')
+    assert cache.fingerprint(episode) != expected
+    assert cache.value(episode, "episode_name", lambda: "ep0-renamed") == "ep0-renamed"
+    assert len(calls) == 2
+
+
+def test_fingerprint_cache_drops_unused_entries(tmp_path):
+    a, b = tmp_path / "a.json", tmp_path / "b.json"
+    touch(a, "a")
+    touch(b, "b")
+    cache = SourceFingerprintCache(tmp_path / "fingerprints.json")
+    cache.fingerprint(a)
+    cache.fingerprint(b)
+    cache.save()
+
+    cache = SourceFingerprintCache(tmp_path / "fingerprints.json")
+    cache.fingerprint(a)
+    cache.save()
+    assert list(json.loads((tmp_path / "fingerprints.json").read_text())) == [str(a)]
+
+
+def test_config_fingerprint_is_stable():
+    assert config_fingerprint({"fps": 10, "video": False}) == config_fingerprint({"video": False, "fps": 10})
+    assert config_fingerprint({"fps": 10}) != config_fingerprint({"fps": 15})
+
+
+def test_config_fingerprint_names_functions_and_rejects_addresses():
+    def transform(x):
+        return x
+
+    assert config_fingerprint({"fn": transform}) == config_fingerprint({"fn": transform})
+    assert config_fingerprint({"fn": transform}) != config_fingerprint({"fn": json.dumps})
+    with pytest.raises(TypeError, match="0x"):
+        config_fingerprint({"obj": object()})
+
+
+# --- Planning --------------------------------------------------------------------
+
+def test_plan_classifies_sources(tmp_path):
+    manifest = EpisodeManifest(tmp_path / "m.json", "cfg")
+    manifest.record("0.json", "fp0", 10)
+    manifest.record("1.json", "fp1", 0)
+    manifest.record("2.json", "fp2", 12)
+
+    plan = manifest.plan([("0.json", "fp0"), ("2.json", "fp2-new"), ("3.json", "fp3")], "cfg")
+    assert plan.pending == ["3.json"]
+    assert plan.changed == ["2.json"]
+    assert plan.removed == ["1.json"]
+    assert not plan.config_changed and plan.needs_rebuild
+
+    # A sub-range run only reports removals from the full list of available sources
+    plan = manifest.plan([("3.json", "fp3")], "cfg", available={"0.json", "1.json", "2.json", "3.json"})
+    assert plan.pending == ["3.json"] and not plan.needs_rebuild
+    assert manifest.plan([], "other-cfg", available={"0.json", "1.json", "2.json"}).config_changed
+    assert manifest.num_written_episodes == 2
+
+
+def test_prepare_incremental_run_resumes_and_refuses_stale(tmp_path):
+    manifest_path = tmp_path / "m.json"
+    dataset = tmp_path / "dataset"
+    write_dataset(dataset, [10])
+
+    manifest, pending = prepare_incremental_run(manifest_path, dataset, "cfg", [("0.json", "fp0"), ("1.json", "fp1")])
+    assert pending == ["0.json", "1.json"]
+    manifest.record("0.json", "fp0", 10)
+
+    manifest, pending = prepare_incremental_run(manifest_path, dataset, "cfg", [("0.json", "fp0"), ("1.json", "fp1")])
+    assert pending == ["1.json"]
+
+    with pytest.raises(ValueError, match="source changed"):
+        prepare_incremental_run(manifest_path, dataset, "cfg", [("0.json", "fp0-new")])
+    with pytest.raises(ValueError, match="options changed"):
+        prepare_incremental_run(manifest_path, dataset, "cfg-new", [("0.json", "fp0")])
+
+    manifest, pending = prepare_incremental_run(manifest_path, dataset, "cfg", [("0.json", "fp0-new")], rebuild=True)
+    assert pending == ["0.json"] and not dataset.exists()
+
+
+# --- Crash recovery --------------------------------------------------------------
+
+def test_reconcile_records_episode_written_before_crash(tmp_path):
+    dataset = tmp_path / "dataset"
+    manifest = EpisodeManifest(tmp_path / "m.json", "cfg")
+    manifest.record("0.json", "fp0", 10)
+    manifest.record("1.json", "fp1", 0)  # empty: recorded, never written
+
+    # Crash between dataset.add_episode() and manifest.record()
+    manifest.begin("2.json", "fp2", 7)
+    write_dataset(dataset, [10, 7])
+
+    reloaded = EpisodeManifest.load(manifest.path)
+    assert reloaded.writing.source == "2.json"
+    reloaded.reconcile(dataset)
+    assert [e.source for e in reloaded.episodes] == ["0.json", "1.json", "2.json"]
+    assert reloaded.writing is None
+    assert EpisodeManifest.load(manifest.path).episodes == reloaded.episodes
+
+
+@pytest.mark.parametrize("lengths", [[10], [10, 8], [10, 7, 7]])
+def test_reconcile_drops_note_when_write_did_not_complete(tmp_path, lengths):
+    dataset = tmp_path / "dataset"
+    manifest = EpisodeManifest(tmp_path / "m.json", "cfg")
+    manifest.record("0.json", "fp0", 10)
+    manifest.begin("1.json", "fp1", 7)
+    write_dataset(dataset, lengths)
+
+    reloaded = EpisodeManifest.load(manifest.path)
+    reloaded.reconcile(dataset)
+    assert [e.source for e in reloaded.episodes] == ["0.json"]
+    assert EpisodeManifest.load(manifest.path).writing is None
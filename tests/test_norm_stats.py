@@ -0,0 +1,165 @@
+"""
+VectorStats merging and histogram re-binning, and the per-episode stats cache.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add RoboVLA root to path
+robo_vla_root = Path(__file__).parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from pipeline.norm_stats import (
+    NUM_QUANTILE_BINS,
+    EpisodeStatsCache,
+    VectorStats,
+    _rebin,
+    action_chunk_indices,
+    episode_stats_key,
+)
+
+
+def sample(seed: int = 0, count: int = 3000, width: int = 4) -> np.ndarray:
+    """Dimensions with different scales and offsets, one of them constant."""
+    rng = np.random.default_rng(seed)
+    values = rng.normal(size=(count, width)) * [1.0, 50.0, 1e-3, 0.0] + [0.0, -20.0, 3.0, 1.5]
+    return values
+
+
+def single_pass(values: np.ndarray, bins: int = 500) -> VectorStats:
+    stats = VectorStats(values.shape[-1], bins)
+    stats.add(values)
+    return stats
+
+
+def bin_width(stats: VectorStats) -> np.ndarray:
+    return (stats.max - stats.min) / stats.bins
+
+
+# --- VectorStats -----------------------------------------------------------------
+
+def test_single_pass_matches_numpy():
+    values = sample()
+    stats = single_pass(values)
+    result = stats.statistics()
+
+    assert stats.count == len(values)
+    assert np.allclose(result["mean"], values.mean(axis=0), rtol=1e-12, atol=1e-12)
+    assert np.allclose(result["std"], values.std(axis=0), rtol=1e-12, atol=1e-12)
+    assert np.array_equal(stats.min, values.min(axis=0)) and np.array_equal(stats.max, values.max(axis=0))
+    # Quantiles are the left edge of the bin holding the first value with q * count values at or below it
+    for q, name in ((0.01, "q01"), (0.99, "q99")):
+        exact = np.quantile(values, q, axis=0, method="inverted_cdf")
+        assert np.all(result[name] <= exact + 1e-12)
+        assert np.all(exact - result[name] <= bin_width(stats) + 1e-12)
+
+
+@pytest.mark.parametrize("splits", [2, 3, 7])
+def test_merged_splits_match_single_pass(splits):
+    values = sample(seed=splits)
+    expected = single_pass(values)
+
+    parts = [single_pass(part) for part in np.array_split(values, splits)]
+    merged = VectorStats(values.shape[-1], 500)
+    merged.merge(*parts)
+
+    assert merged.count == expected.count
+    assert np.allclose(merged.mean, expected.mean, rtol=1e-12, atol=1e-12)
+    assert np.allclose(merged.m2, expected.m2, rtol=1e-10, atol=1e-12)
+    assert np.array_equal(merged.min, expected.min) and np.array_equal(merged.max, expected.max)
+    assert merged.histogram.sum(axis=1) == pytest.approx(np.full(values.shape[-1], len(values)))
+    # Re-binning moves a count by at most one bin
+    for got, want in zip(merged.quantiles([0.01, 0.99]), expected.quantiles([0.01, 0.99])):
+        assert np.all(np.abs(got - want) <= 2 * bin_width(expected) + 1e-12)
+
+
+def test_merge_is_exact_when_splits_share_the_range():
+    values = sample(seed=3)
+    low, high = values.argmin(axis=0), values.argmax(axis=0)
+    rest = np.setdiff1d(np.arange(len(values)), np.concatenate([low, high]))
+    # Every split holds the global min and max, so no histogram is re-binned
+    extremes = values[np.concatenate([low, high])]
+    parts = [np.concatenate([extremes, values[chunk]]) for chunk in np.array_split(rest, 4)]
+
+    merged = VectorStats(values.shape[-1], 500)
+    merged.merge(*(single_pass(part) for part in parts))
+    expected = single_pass(np.concatenate(parts))
+
+    assert np.array_equal(merged.histogram, expected.histogram)
+    for got, want in zip(merged.quantiles([0.01, 0.99]), expected.quantiles([0.01, 0.99])):
+        assert np.array_equal(got, want)
+
+
+def test_incremental_adds_match_one_add():
+    values = sample(seed=5)
+    stats = VectorStats(values.shape[-1], 500)
+    for batch in np.array_split(values, 10):
+        stats.add(batch)
+    expected = single_pass(values)
+    assert np.allclose(stats.mean, expected.mean, rtol=1e-12, atol=1e-12)
+    assert np.allclose(stats.m2, expected.m2, rtol=1e-10, atol=1e-12)
+
+
+def test_rebin_preserves_counts():
+    rng = np.random.default_rng(0)
+    histogram = rng.integers(0, 10, size=(2, 50)).astype(np.float64)
+    low, high = np.array([0.0, -1.0]), np.array([1.0, 1.0])
+    rebinned = _rebin(histogram, low, high, np.array([-2.0, -1.0]), np.array([3.0, 2.0]))
+    assert np.array_equal(rebinned.sum(axis=1), histogram.sum(axis=1))
+    assert _rebin(histogram, low, high, low, high) is histogram
+
+
+def test_statistics_need_two_vectors():
+    stats = single_pass(np.ones((1, 3)))
+    with pytest.raises(ValueError):
+        stats.statistics()
+
+
+def test_action_chunks_stay_in_their_episode():
+    rows, is_pad = action_chunk_indices(np.array([0, 0, 0, 1, 1]), horizon=3)
+    assert rows.tolist() == [[0, 1, 2], [1, 2, 2], [2, 2, 2], [3, 4, 4], [4, 4, 4]]
+    assert is_pad.tolist() == [
+        [False, False, False], [False, False, True], [False, True, True],
+        [False, False, True], [False, True, True],
+    ]
+
+
+# --- Per-episode cache -----------------------------------------------------------
+
+def test_cache_merge_equals_in_memory_merge(tmp_path):
+    cache = EpisodeStatsCache(tmp_path / "episodes", "cfg")
+    episodes = [sample(seed=i, count=100 + 10 * i) for i in range(4)]
+    for i, values in enumerate(episodes):
+        cache.save(f"ep{i}", {"state": single_pass(values, bins=NUM_QUANTILE_BINS)})
+
+    merged = cache.merge([f"ep{i}" for i in range(4)], "state")
+    expected = VectorStats(4)
+    expected.merge(*(single_pass(values, bins=NUM_QUANTILE_BINS) for values in episodes))
+
+    assert merged.count == expected.count
+    assert np.array_equal(merged.mean, expected.mean) and np.array_equal(merged.m2, expected.m2)
+    assert np.array_equal(merged.histogram, expected.histogram)
+
+
+def test_cache_removes_stale_episodes_and_clears_on_config_change(tmp_path):
+    directory = tmp_path / "episodes"
+    cache = EpisodeStatsCache(directory, "cfg")
+    for name in ("a", "b", "c"):
+        cache.save(name, {"state": single_pass(sample(count=10), bins=20)})
+    assert cache.remove_except({"a", "c"}) == 1
+    assert cache.fingerprints() == {"a", "c"} and "b" not in cache
+
+    cache.record_episode(0, "a", 10)
+    assert EpisodeStatsCache(directory, "cfg").recorded_episodes() == {0: ("a", 10)}
+    cache.forget_episodes()
+    assert EpisodeStatsCache(directory, "cfg").recorded_episodes() == {}
+
+    assert EpisodeStatsCache(directory, "other-cfg").fingerprints() == set()
+
+
+def test_episode_stats_key_marks_truncated_episodes():
+    assert episode_stats_key("abc", 10, 10) == "abc"
+    assert episode_stats_key("abc", 4, 10) == "abc-4"
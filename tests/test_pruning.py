@@ -0,0 +1,100 @@
+"""
+find_kept_frames() on synthetic joint / gripper / image-hash sequences.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+# Add RoboVLA root to path
+robo_vla_root = Path(__file__).parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from config.robot_config import PruneConfig
+from pipeline.pruning import array_hash, find_kept_frames, hash_distance, image_hash
+
+
+def moving_then_still(moving: int = 5, still: int = 20, after: int = 5) -> np.ndarray:
+    """(T, 6) joints: a ramp, a stop of `still` extra frames at its end, then another ramp."""
+    ramp = np.arange(moving, dtype=float)
+    joints = np.concatenate([ramp, np.full(still, ramp[-1]), ramp[-1] + 1 + np.arange(after)])
+    return np.repeat(joints[:, None], 6, axis=1)
+
+
+def same_image(i: int) -> int:
+    return 0
+
+
+def test_drop_keeps_last_frame_of_idle_stretch():
+    joints = moving_then_still()
+    keep, stretches = find_kept_frames(joints, None, None, same_image, PruneConfig())
+    assert stretches == 1
+    # Frames 5..24 repeat frame 4; only the last of them is kept
+    assert np.flatnonzero(~keep).tolist() == list(range(5, 24))
+
+
+def test_subsample_keeps_every_nth_and_last():
+    joints = moving_then_still()
+    keep, _ = find_kept_frames(joints, None, None, same_image, PruneConfig(mode="subsample", keep_every=5))
+    assert np.flatnonzero(keep[5:25]).tolist() == [0, 5, 10, 15, 19]
+
+
+def test_short_pauses_and_small_motion_are_kept():
+    keep, stretches = find_kept_frames(moving_then_still(still=5), None, None, same_image, PruneConfig())
+    assert stretches == 0 and keep.all()
+
+    # Joints creep past joint_threshold relative to the stretch's first frame
+    joints = moving_then_still()
+    joints[5:25] += np.linspace(0, 0.2, 20)[:, None]
+    keep, _ = find_kept_frames(joints, None, None, same_image, PruneConfig(joint_threshold=0.05))
+    assert keep[5:25].sum() > 1
+
+
+def test_changed_image_or_mode_breaks_stretch():
+    # A change at frame 15 splits the 20 still frames into runs of 10 and 9
+    joints = moving_then_still()
+    config = PruneConfig(min_idle_frames=11)
+    assert find_kept_frames(joints, None, None, same_image, config)[1] == 1
+
+    keep, stretches = find_kept_frames(joints, None, None, lambda i: 0 if i < 15 else (1 << 64) - 1, config)
+    assert stretches == 0 and keep.all()
+
+    robot_mode = np.full(len(joints), 7.0)
+    robot_mode[15:] = 5.0
+    keep, stretches = find_kept_frames(joints, None, robot_mode, same_image, config)
+    assert stretches == 0 and keep.all()
+
+    # Missing images never count as still
+    keep, stretches = find_kept_frames(joints, None, None, lambda i: None, config)
+    assert stretches == 0 and keep.all()
+
+
+def test_frames_around_gripper_transition_are_kept():
+    joints = moving_then_still(still=30)
+    gripper = np.zeros(len(joints))
+    gripper[20:] = 1.0
+    config = PruneConfig(transition_margin=2)
+    keep, stretches = find_kept_frames(joints, gripper, None, same_image, config)
+
+    # The gripper change splits the stop into two idle stretches, [5, 20) and [21, 35)
+    assert stretches == 2
+    assert keep[17:23].all()
+    assert not keep[5:17].any() and not keep[23:34].any()
+
+
+@pytest.mark.parametrize("num_frames", [0, 1])
+def test_too_short_to_prune(num_frames):
+    keep, stretches = find_kept_frames(np.zeros((num_frames, 6)), None, None, same_image, PruneConfig())
+    assert keep.tolist() == [True] * num_frames and stretches == 0
+
+
+def test_image_hash_matches_decoded_frame(tmp_path):
+    gradient = np.tile(np.linspace(0, 255, 64, dtype=np.uint8)[None, :, None], (48, 1, 3))
+    path = tmp_path / "frame.jpg"
+    Image.fromarray(gradient).save(path, quality=95)
+
+    assert hash_distance(image_hash(path), array_hash(gradient)) <= 4
+    assert hash_distance(array_hash(gradient), array_hash(gradient[:, ::-1])) > 32
@@ -0,0 +1,81 @@
+"""
+resample_grid() / resample_columns() on synthetic trajectories, with and without holes.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add RoboVLA root to path
+robo_vla_root = Path(__file__).parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from config.layout import EpisodeColumns
+from config.robot_config import RobotConfig
+from pipeline.resample import resample_columns, resample_grid
+
+
+def ramp_columns(timestamps: np.ndarray, num_joints: int = 6) -> EpisodeColumns:
+    """Every joint at 10 * t degrees, so interpolated values are known exactly."""
+    joints = np.repeat((10.0 * timestamps)[:, None], num_joints, axis=1)
+    return EpisodeColumns(
+        joint_angles=joints,
+        joint_counts=np.full(len(timestamps), num_joints, dtype=np.int64),
+        actions=np.zeros((len(timestamps), 0)),
+        action_counts=np.zeros(len(timestamps), dtype=np.int64),
+        fields={"timestamp": timestamps, "robot_mode": np.full(len(timestamps), 7.0)},
+    )
+
+
+def test_uniform_grid_without_holes():
+    timestamps = np.arange(31) / 30.0
+    grid = resample_grid(timestamps, 10)
+
+    assert np.allclose(grid.times, np.arange(11) / 10.0)
+    assert grid.segment_start.tolist() == [True] + [False] * 10
+    assert np.array_equal(grid.nearest, np.arange(0, 31, 3))
+
+    columns = resample_columns(ramp_columns(timestamps), grid)
+    assert np.allclose(columns.joint_angles[:, 0], 10.0 * grid.times)
+    assert not columns.action_counts.any()
+
+
+def test_grid_splits_at_hole():
+    # 30 Hz over [0, 1] and [3, 4]; frames in between were filtered out
+    timestamps = np.concatenate([np.arange(31), np.arange(90, 121)]) / 30.0
+    grid = resample_grid(timestamps, 10)
+
+    assert np.allclose(grid.times, np.concatenate([np.arange(11), np.arange(30, 41)]) / 10.0)
+    assert np.flatnonzero(grid.segment_start).tolist() == [0, 11]
+    # Nothing falls inside the hole, and images come from frames on the right side of it
+    assert not ((grid.times > 1.0 + 1e-9) & (grid.times < 3.0 - 1e-9)).any()
+    assert grid.nearest[10] == 30 and grid.nearest[11] == 31
+
+    columns = resample_columns(ramp_columns(timestamps), grid)
+    assert np.allclose(columns.joint_angles[:, 0], 10.0 * grid.times)
+    assert columns.action_counts.tolist() == [0] * 11 + [1] + [0] * 10
+
+    layout = RobotConfig(name="ramp", num_joints=6, gripper=None).compile()
+    states, actions = layout.episode_arrays(columns)
+    step = np.float32(np.deg2rad(1.0))
+    # One grid step of 0.1 s is 1 degree; the first frame after the hole restarts at zero
+    assert np.allclose(actions[1:11, 0], step) and np.allclose(actions[12:, 0], step)
+    assert not actions[0].any() and not actions[11].any()
+    assert np.allclose(states[11, 0], np.deg2rad(30.0))
+
+
+def test_small_jitter_does_not_split():
+    rng = np.random.default_rng(0)
+    timestamps = np.cumsum(rng.uniform(0.9, 1.1, 90)) / 30.0
+    grid = resample_grid(timestamps, 10)
+    assert grid.segment_start.sum() == 1
+
+
+@pytest.mark.parametrize(
+    "timestamps",
+    [np.arange(11) / 10.0, np.array([0.0, np.nan, 0.2]), np.array([0.0, 0.1, 0.05]), np.array([0.0])],
+)
+def test_no_grid_when_not_downsampling(timestamps):
+    assert resample_grid(timestamps, 10) is None
@@ -0,0 +1,158 @@
+"""
+merge_datasets() on tiny hand-written LeRobot v2 shards.
+
+The shards hold a state column and either no frames, video frames (a placeholder mp4
+per episode) or embedded image bytes, which is all the merge looks at.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add RoboVLA root to path
+robo_vla_root = Path(__file__).parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from pipeline.sharding import merge_datasets, parse_shard, select_shard
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+DATA_PATH = "data/chunk-{episode_chunk:03d}/episode_{episode_index:06d}.parquet"
+VIDEO_PATH = "videos/chunk-{episode_chunk:03d}/{video_key}/episode_{episode_index:06d}.mp4"
+
+
+def write_shard(root: Path, episodes: list[tuple[int, str]], frames: str | None = None) -> None:
+    """Shard with one episode per (length, task); frames is None, "video" or "image"."""
+    features = {
+        "state": {"dtype": "float32", "shape": [2], "names": None},
+        "episode_index": {"dtype": "int64", "shape": [1], "names": None},
+        "index": {"dtype": "int64", "shape": [1], "names": None},
+        "task_index": {"dtype": "int64", "shape": [1], "names": None},
+    }
+    if frames is not None:
+        features["image"] = {"dtype": frames, "shape": [4, 4, 3], "names": None}
+
+    tasks = list(dict.fromkeys(task for _, task in episodes))
+    frame_index = 0
+    for episode_index, (length, task) in enumerate(episodes):
+        columns = {
+            "state": pa.array([[float(episode_index), float(i)] for i in range(length)], type=pa.list_(pa.float32())),
+            "episode_index": pa.array([episode_index] * length, type=pa.int64()),
+            "index": pa.array(range(frame_index, frame_index + length), type=pa.int64()),
+            "task_index": pa.array([tasks.index(task)] * length, type=pa.int64()),
+        }
+        if frames == "image":
+            columns["image"] = pa.array([bytes([episode_index, i]) * 8 for i in range(length)], type=pa.binary())
+        path = root / DATA_PATH.format(episode_chunk=0, episode_index=episode_index)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(pa.table(columns), path)
+        if frames == "video":
+            video = root / VIDEO_PATH.format(episode_chunk=0, video_key="image", episode_index=episode_index)
+            video.parent.mkdir(parents=True, exist_ok=True)
+            video.write_bytes(b"mp4")
+        frame_index += length
+
+    meta = root / "meta"
+    meta.mkdir(parents=True, exist_ok=True)
+    info = {
+        "codebase_version": "v2.1",
+        "robot_type": "dobot_e6",
+        "fps": 10,
+        "features": features,
+        "chunks_size": 1000,
+        "data_path": DATA_PATH,
+        "video_path": VIDEO_PATH,
+        "total_episodes": len(episodes),
+        "total_frames": frame_index,
+    }
+    (meta / "info.json").write_text(json.dumps(info))
+    (meta / "tasks.jsonl").write_text(
+        "".join(json.dumps({"task_index": i, "task": task}) + "\n" for i, task in enumerate(tasks))
+    )
+    (meta / "episodes.jsonl").write_text(
+        "".join(
+            json.dumps({"episode_index": i, "tasks": [task], "length": length}) + "\n"
+            for i, (length, task) in enumerate(episodes)
+        )
+    )
+
+
+def read_jsonl(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+
+
+def merged_column(root: Path, name: str) -> np.ndarray:
+    files = sorted((root / "data").rglob("*.parquet"))
+    return np.concatenate([pq.read_table(f, columns=[name]).column(name).to_numpy() for f in files])
+
+
+# --- Tests -----------------------------------------------------------------------
+
+def test_select_shard_covers_items_in_order():
+    items = list(range(10))
+    assert sum((select_shard(items, i, 3) for i in range(3)), []) == items
+    assert parse_shard("2/4") == (2, 4)
+    with pytest.raises(ValueError):
+        parse_shard("4/4")
+
+
+@pytest.mark.parametrize("frames", [None, "video"])
+def test_merge_renumbers_episodes_frames_and_tasks(tmp_path, frames):
+    write_shard(tmp_path / "a", [(3, "pick"), (2, "place")], frames)
+    write_shard(tmp_path / "b", [(4, "place"), (1, "stack")], frames)
+
+    result = merge_datasets([tmp_path / "a", tmp_path / "b"], tmp_path / "merged")
+    merged = tmp_path / "merged"
+
+    assert result["episodes"] == 4 and result["frames"] == 10 and result["tasks"] == 3
+    # Shard a is already numbered correctly and is linked; shard b is renumbered
+    assert result["rewritten_parquet"] == 2
+
+    assert np.array_equal(merged_column(merged, "index"), np.arange(10))
+    assert np.array_equal(merged_column(merged, "episode_index"), np.repeat(np.arange(4), [3, 2, 4, 1]))
+    assert np.array_equal(merged_column(merged, "task_index"), np.repeat([0, 1, 1, 2], [3, 2, 4, 1]))
+
+    episodes = read_jsonl(merged / "meta" / "episodes.jsonl")
+    assert [e["episode_index"] for e in episodes] == [0, 1, 2, 3]
+    assert [e["length"] for e in episodes] == [3, 2, 4, 1]
+    tasks = read_jsonl(merged / "meta" / "tasks.jsonl")
+    assert tasks == [{"task_index": 0, "task": "pick"}, {"task_index": 1, "task": "place"},
+                     {"task_index": 2, "task": "stack"}]
+
+    info = json.loads((merged / "meta" / "info.json").read_text())
+    assert info["total_episodes"] == 4 and info["total_frames"] == 10 and info["total_tasks"] == 3
+    if frames == "video":
+        assert info["total_videos"] == 4
+        assert (merged / VIDEO_PATH.format(episode_chunk=0, video_key="image", episode_index=3)).exists()
+
+
+def test_merge_refuses_to_copy_embedded_images(tmp_path):
+    write_shard(tmp_path / "a", [(2, "pick")], "image")
+    write_shard(tmp_path / "b", [(2, "pick")], "image")
+
+    with pytest.raises(ValueError, match="embedded images"):
+        merge_datasets([tmp_path / "a", tmp_path / "b"], tmp_path / "merged")
+    assert not (tmp_path / "merged").exists()
+
+    result = merge_datasets([tmp_path / "a", tmp_path / "b"], tmp_path / "merged", rewrite_images=True)
+    assert result["rewritten_parquet"] == 1
+    assert np.array_equal(merged_column(tmp_path / "merged", "index"), np.arange(4))
+    images = pq.read_table(next((tmp_path / "merged" / "data").rglob("episode_000001.parquet"))).column("image")
+    assert images.to_pylist() == [bytes([0, i]) * 8 for i in range(2)]
+
+
+def test_merge_rejects_incompatible_shards(tmp_path):
+    write_shard(tmp_path / "a", [(2, "pick")])
+    write_shard(tmp_path / "b", [(2, "pick")])
+    info_path = tmp_path / "b" / "meta" / "info.json"
+    info = json.loads(info_path.read_text())
+    info["fps"] = 15
+    info_path.write_text(json.dumps(info))
+
+    with pytest.raises(ValueError, match="fps"):
+        merge_datasets([tmp_path / "a", tmp_path / "b"], tmp_path / "merged")
@@ -0,0 +1,57 @@
+"""
+validate_episode() gripper transition counting on hand-written JSON episodes.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add RoboVLA root to path
+robo_vla_root = Path(__file__).parent.parent
+sys.path.insert(0, str(robo_vla_root))
+
+from config.robot_config import GripperConfig, RobotConfig
+from pipeline.validation import ValidationStats, validate_episode
+
+
+def write_episode(path: Path, gripper: list[float]) -> Path:
+    frames = [
+        {"frame_id": i, "joint_angles": [0.0] * 6, "actions": [0.0] * 7, "gripper": value, "robot_mode": 7}
+        for i, value in enumerate(gripper)
+    ]
+    path.write_text(json.dumps({"episode_name": path.stem, "frames": frames}))
+    return path
+
+
+def continuous_gripper_config() -> RobotConfig:
+    gripper = GripperConfig(field_name="gripper", threshold=0.5, discrete=False)
+    return RobotConfig(name="continuous", num_joints=6, gripper=gripper)
+
+
+@pytest.mark.parametrize(
+    "gripper, rising, falling",
+    [
+        # Noise on either side of the threshold is not a transition
+        ([0.0, 0.02, 0.01, 0.03, 0.0], 0, 0),
+        ([0.9, 0.95, 0.92, 1.0], 0, 0),
+        # A gradual close and open each count once
+        ([0.0, 0.2, 0.4, 0.6, 0.8, 1.0, 0.7, 0.3, 0.1], 1, 1),
+        ([0.0, 1.0, 0.0, 1.0], 2, 1),
+    ],
+)
+def test_transitions_are_threshold_crossings(tmp_path, gripper, rising, falling):
+    stats = validate_episode(write_episode(tmp_path / "ep.json", gripper), continuous_gripper_config())
+    assert (stats.gripper_rising, stats.gripper_falling) == (rising, falling)
+    assert stats.episodes_without_transitions == int(rising + falling == 0)
+    assert stats.per_episode[0]["gripper_transitions"] == rising + falling
+
+
+def test_transition_counts_merge(tmp_path):
+    config = continuous_gripper_config()
+    total = ValidationStats.for_config(config)
+    total.merge(validate_episode(write_episode(tmp_path / "a.json", [0.0, 1.0]), config))
+    total.merge(validate_episode(write_episode(tmp_path / "b.json", [0.1, 0.2]), config))
+    report = total.report(config)["gripper"]["transitions"]
+    assert report == {"rising": 1, "falling": 0, "episodes_without_transitions": 1}